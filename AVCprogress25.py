@@ -24,7 +24,6 @@ https://github.com/ArduPilot/ardupilot/pull/2504 #Someone else did it their own
 """
 
 import sys
-import spidev
 import time
 import math
 import navio.util
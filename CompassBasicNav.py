@@ -50,7 +50,6 @@ https://github.com/ArduPilot/ardupilot/pull/2504 #Someone else did it their own
 
 import logging
 import sys
-import spidev
 import time
 import math
 import navio.util
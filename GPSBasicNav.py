@@ -37,7 +37,6 @@ Resources GPS:
 http://www.movable-type.co.uk/scripts/latlong.html
 """
 import sys
-import spidev
 import time
 import math
 import navio.util
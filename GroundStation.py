@@ -0,0 +1,62 @@
+"""
+Robotritons ground station for live telemetry.
+
+Purpose: Display the state the vehicle streams with VehicleUDPModule during a run: position, distance travelled, heading, relative bearing,
+	steer, throttle and loop time, plus the packet rate and lost packets.
+Requirements: A laptop on the same network as the vehicle (or the vehicle itself for testing). The python modules sys, time, math,
+	VehicleUDPModule and VehicleGeoModule.
+Use: Run "python GroundStation.py [port]" before or during a run. The vehicle scripts broadcast to port 14660 by default.
+	Every packet prints one line. Ctrl+C stops and prints the totals.
+	To test without the vehicle run "python VehicleUDPModule.py" in another terminal, it sends 50 packets to 127.0.0.1.
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/socket.html
+"""
+import sys
+import time
+import math
+import VehicleUDPModule
+import VehicleGeoModule
+
+port = int(sys.argv[1]) if len(sys.argv) > 1 else VehicleUDPModule.defaultPort
+receiver = VehicleUDPModule.udpReceiver(port)
+print('Listening for vehicle telemetry on UDP port %d' % port)
+
+frame = None #Tangent plane at the first position, for the distance travelled
+lastEast = 0.0
+lastNorth = 0.0
+travelled = 0.0
+rateCount = 0
+rateStart = time.time()
+rate = 0.0
+try:
+	while (True):
+		state = receiver.receive(2.0)
+		if (state == None):
+			print('No telemetry for 2 s (received %d, lost %d)' % (receiver.received, receiver.lost))
+			continue
+		# ---- Packet Rate ----
+		rateCount += 1
+		now = time.time()
+		if (now - rateStart >= 1.0):
+			rate = rateCount/(now - rateStart)
+			rateCount = 0
+			rateStart = now
+		# ---- Distance Travelled ----
+		if not math.isnan(state['lat']):
+			if (frame == None):
+				frame = VehicleGeoModule.enuFrame(state['lat'], state['lon'])
+			east, north = frame.toLocal(state['lat'], state['lon'])
+			travelled += math.sqrt((east - lastEast)**2 + (north - lastNorth)**2)
+			lastEast, lastNorth = east, north
+		print('#%-6d %s  %11.6f %12.6f  %6.1f m  head %7.1f  relBear %7.1f  steer %6.1f  throttle %4.0f  loop %5.1f ms  %4.1f Hz  lost %d' % (
+			state['seq'], receiver.sender[0], state['lat'], state['lon'], travelled, state['head'], state['relBear'],
+			state['steer'], state['throttle'], state['loopTime']*1000, rate, receiver.lost))
+except KeyboardInterrupt:
+	pass
+finally:
+	print('Received %d packets, lost %d, %d invalid' % (receiver.received, receiver.lost, receiver.invalid))
+	receiver.close()
@@ -0,0 +1,275 @@
+"""
+Robotritons vehicle entry point with lazy initialization.
+
+Purpose: One script for everything done on the car. It imports and initializes only the subsystems the chosen mode needs, on first use,
+	so boot to drive is as short as possible when we get limited minutes on the course. The import and initialization time of every
+	subsystem is reported once the mode is ready, so a slow step shows up right away.
+Requirements: Python 2.7, like the navio drivers that calibrate, drive and test import (they are not python 3 compatible).
+	The python modules importlib, logging, sys, time and traceback. The modes import the rest:
+	calibrate	VehiclePWMModule and navio.mpu9250_better
+	drive		VehiclePWMModule, navio.mpu9250_better, VehicleGPSModule, VehicleMissionModule, VehicleCommandModule, VehicleUDPModule
+				and VehicleLogWriterModule
+	replay		VehicleReplayModule (no hardware)
+	test		VehiclePWMModule, navio.mpu9250_better and VehicleGPSModule
+Use: python Vehicle.py mode [arguments]
+		python Vehicle.py calibrate						#Gyro/accelerometer offsets standing still, then the magnetometer sweep
+		python Vehicle.py drive [route file]			#Commanded runs, see VehicleDrive.py and VehicleCommandModule
+		python Vehicle.py replay log.bin [tuning=value ...]	#Replays a drive log leg by leg, see VehicleReplayModule
+		python Vehicle.py test							#Read every sensor once and wiggle the servo
+	Set NAVIO_HAL=fake to run a mode against the navio.fakes registers. Without numpy, keep a 'waypointData/imuOffsets.txt' cache,
+	measuring new offsets needs it.
+
+	Subsystems: vehicleParts.get(name) imports the module in subsystems[name] and calls its maker once, later calls return the same object.
+	drive doesn't wait for a GPS fix like GPSNavInit() of WaypointTest.py. NAV-POSLLH is enabled right away and vehicleNav holds still
+	until the first position accurate to minAcc meters, so the car listens for commands while the receiver is still getting its fix.
+
+Updates:
+- October 19, 2026. replay follows the legs and waypoints recorded in drive logs instead of the waypoint of WaypointTest.py.
+- October 19, 2026. Documented that the modes with hardware run under python 2.7 only.
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/importlib.html
+"""
+import importlib
+import logging
+import sys
+import time
+import traceback
+
+log_root = logging.getLogger('')
+
+imuOffsetsPath = 'waypointData/imuOffsets.txt'
+magMeansPath = 'waypointData/magnetometerMeans.txt'
+CFGmsg8_NAVstatus_no = [0xb5,0x62,0x06,0x01,0x08,0x00,0x01,0x03,0x00,0x00,0x00,0x00,0x00,0x00,0x13,0xc0]#Disable Ublox from publishing a NAVstatus
+CFGmsg8_NAVposllh_yes = [0xb5,0x62,0x06,0x01,0x08,0x00,0x01,0x02,0x00,0x00,0x00,0x00,0x01,0x00,0x13,0xbb]#Enable Ublox to publish a NAVposllh
+
+# ---- Boot Timing ----
+class bootTimer:
+	"""Seconds spent importing and initializing each subsystem"""
+
+	def __init__(self):
+		self.start = time.time()
+		self.rows = [] #[name, import seconds, init seconds]
+
+	def add(self, name, importTime, initTime):
+		self.rows.append([name, importTime, initTime])
+
+	def report(self):
+		lines = ['%-10s %10s %10s' % ('subsystem', 'import ms', 'init ms')]
+		for name, importTime, initTime in self.rows:
+			lines.append('%-10s %10.1f %10.1f' % (name, importTime*1000, initTime*1000))
+		lines.append('%-10s %21.1f' % ('ready', (time.time() - self.start)*1000))
+		return '\n'.join(lines)
+# ---- End Boot Timing ----
+
+# ---- Subsystems ----
+#Makers take the vehicleParts and the imported module, and return the initialized subsystem
+def makeEsc(parts, module):
+	esc = module.vehiclePWM("esc")
+	esc.stop()
+	esc.rest()
+	return esc
+
+def makeServo(parts, module):
+	servo = module.vehiclePWM("servo")
+	servo.rest()
+	return servo
+
+def makeIMU(parts, module):
+	imu = module.MPU9250()
+	imu.initialize()
+	#Remove gyro and accelerometer bias in the MPU9250 offset registers, from the cache unless recalibrating
+	offsets = imu.calib_offsets(cache_file=imuOffsetsPath, use_cache=parts.useCache)
+	log_root.warning('imu offsets gyro %s acc %s' % (offsets['gyro'], offsets['acc']))
+	return imu
+
+def makeGPS(parts, module):
+	ubl = module.U_blox()
+	for msg in (CFGmsg8_NAVstatus_no, CFGmsg8_NAVposllh_yes):
+		for x in range(0,10):
+			ubl.bus.xfer2(msg)
+	return ubl
+
+def readMagMeans(parts, module):
+	meansFile = open(magMeansPath,'r')
+	xMean = float(meansFile.readline().rstrip('\n'))
+	yMean = float(meansFile.readline().rstrip('\n'))
+	meansFile.close()
+	return {'x':xMean,'y':yMean}
+
+def makeLog(parts, module):
+	"""File logging through a writer thread, like the waypoint scripts"""
+	writer = module.logWriter('waypointData/vehicle.csv')
+	handler_file = module.queueHandler(writer)
+	handler_file.setFormatter(logging.Formatter('%(levelname)-8s,%(message)s'))
+	log_root.addHandler(handler_file)
+	return writer
+
+def makeCommands(parts, module):
+	return module.commandServer(module.defaultPort)
+
+def makeUDP(parts, module):
+	return module.udpTelemetry('255.255.255.255', module.defaultPort, rate=10)
+
+def importOnly(parts, module):
+	return module
+
+#name: [module imported first (None for none), maker]
+subsystems = {
+	'log':['VehicleLogWriterModule', makeLog],
+	'esc':['VehiclePWMModule', makeEsc],
+	'servo':['VehiclePWMModule', makeServo],
+	'imu':['navio.mpu9250_better', makeIMU],
+	'gps':['VehicleGPSModule', makeGPS],
+	'magMeans':[None, readMagMeans],
+	'commands':['VehicleCommandModule', makeCommands],
+	'udp':['VehicleUDPModule', makeUDP],
+	'mission':['VehicleMissionModule', importOnly],
+	'replay':['VehicleReplayModule', importOnly],
+}
+
+class vehicleParts:
+	"""The subsystems of one run of this script, made on first use"""
+
+	def __init__(self, timer):
+		self.timer = timer
+		self.parts = {}
+		self.useCache = True #False recalibrates the imu offsets instead of loading them
+
+	def get(self, name):
+		if (name not in self.parts):
+			moduleName, maker = subsystems[name]
+			importStart = time.time()
+			module = None if moduleName == None else importlib.import_module(moduleName)
+			initStart = time.time()
+			self.parts[name] = maker(self, module)
+			self.timer.add(name, initStart - importStart, time.time() - initStart)
+		return self.parts[name]
+
+	def stop(self):
+		"""Rests the actuators and closes the sockets and log made so far"""
+		if ('esc' in self.parts):
+			self.parts['esc'].stop()
+			self.parts['esc'].rest()
+		if ('servo' in self.parts):
+			self.parts['servo'].rest()
+		for name in ('commands', 'udp'):
+			if (name in self.parts):
+				self.parts[name].close()
+		if ('log' in self.parts):
+			log_root.warning('Log writer: %(written)d written, %(dropped)d dropped, %(late)d late, max latency %(maxLatency).3f s' % self.parts['log'].stats())
+			self.parts['log'].close()
+# ---- End Subsystems ----
+
+def wiggle(servo, num, direction): #used particularly for visual calibration cues
+	for times in range(num):
+		servo.steer(35*direction)
+		time.sleep(0.5)
+		servo.center()
+		time.sleep(0.5)
+
+# ---- Modes ----
+def calibrate(parts, arguments):
+	"""Imu offsets standing still, then the magnetometer sweep of calibrateMag() in WaypointTest.py"""
+	parts.useCache = False
+	servo = parts.get('servo')
+	imu = parts.get('imu')
+	print(parts.timer.report())
+	log_root.warning('begin calibrateMag, turn the vehicle through every heading')
+	wiggle(servo, 1, 1)
+	xSet = []
+	ySet = []
+	for x in range(600):
+		imu.read_mag()
+		xSet.append(imu.magnetometer_data[0])
+		ySet.append(imu.magnetometer_data[1])
+		if (x == 150):
+			wiggle(servo, 2, 1)
+		elif (x == 300):
+			wiggle(servo, 3, 1)
+		elif (x == 450):
+			wiggle(servo, 4, 1)
+		else:
+			time.sleep(0.05)
+	xMean = float(sum(xSet))/max(len(xSet),1)
+	yMean = float(sum(ySet))/max(len(ySet),1)
+	meansFile = open(magMeansPath,'w')
+	meansFile.write('%f\n%f\n' % (xMean,yMean))#First line is xMean, second line is yMean
+	meansFile.close()
+	log_root.warning('end calibrateMag %f,%f' % (xMean,yMean))
+	wiggle(servo, 1, -1)
+
+def drive(parts, arguments):
+	"""Commanded runs like VehicleDrive.py"""
+	parts.get('log')
+	esc = parts.get('esc')
+	servo = parts.get('servo')
+	magMeans = parts.get('magMeans') #Before the slow subsystems, a missing calibration fails fast
+	imu = parts.get('imu')
+	ubl = parts.get('gps')
+	route = parts.get('mission').loadRoute(arguments[0]) if arguments else None
+	server = parts.get('commands')
+	udp = parts.get('udp')
+	VehicleCommandModule = importlib.import_module('VehicleCommandModule') #Already imported by 'commands'
+	session = VehicleCommandModule.vehicleSession(esc, servo, ubl, imu, magMeans=magMeans, route=route)
+	print(parts.timer.report())
+	log_root.warning('Waiting for commands on UDP port %d' % VehicleCommandModule.defaultPort)
+	wiggle(servo, 1, 1) #Ready for commands
+	VehicleCommandModule.serve(session, server, udp, 'waypointData/drive%d.bin', log_root)
+
+def replay(parts, arguments):
+	"""Feeds a telemetry log through vehicleNav with other tuning, see VehicleReplayModule"""
+	if not arguments:
+		sys.exit('Usage: python Vehicle.py replay log.bin [tuning=value ...]')
+	VehicleReplayModule = parts.get('replay')
+	magMeans = parts.get('magMeans')
+	print(parts.timer.report())
+	names, records = importlib.import_module('VehicleTelemetryModule').readTelemetry(arguments[0])
+	tuning = VehicleReplayModule.parseTuning(arguments[1:])
+	#drive logs record their legs, latW and lonW only matter for logs of WaypointTest.py older than that
+	results = VehicleReplayModule.replay((names, records), tuning.pop('latW', VehicleReplayModule.latW), tuning.pop('lonW', VehicleReplayModule.lonW),
+		magMeans, **tuning)
+	stats = VehicleReplayModule.compare(names, records, results)
+	print('%d of %d ticks replayed, steer difference rms %.2f max %.2f, arrival %s' % (stats['ticks'], len(records), stats['rmsSteer'], stats['maxSteer'], stats['arrivalTime']))
+
+def test(parts, arguments):
+	"""Reads every sensor once, waits up to 2 seconds for a GPS message and wiggles the servo"""
+	parts.get('esc')
+	servo = parts.get('servo')
+	imu = parts.get('imu')
+	ubl = parts.get('gps')
+	print(parts.timer.report())
+	print('imu connection: %s' % imu.testConnection())
+	imu.read_mag()
+	imu.read_gyro()
+	print('magnetometer: %s' % imu.magnetometer_data)
+	print('gyroscope: %s' % imu.gyroscope_data)
+	fix = None
+	deadline = time.time() + 2.0
+	while (fix == None and time.time() < deadline):
+		fix = ubl.GPSfetch()
+	print('gps: %s' % fix)
+	wiggle(servo, 1, 1)
+
+modes = {'calibrate':calibrate, 'drive':drive, 'replay':replay, 'test':test}
+# ---- End Modes ----
+
+if __name__ == "__main__":
+	if (len(sys.argv) < 2 or sys.argv[1] not in modes):
+		sys.exit('Usage: python Vehicle.py %s [arguments]' % '|'.join(sorted(modes)))
+	log_root.setLevel(logging.DEBUG)
+	handler_console = logging.StreamHandler()
+	handler_console.setLevel(logging.WARNING)
+	handler_console.setFormatter(logging.Formatter('%(levelname)-6s %(name)-6s %(message)s'))
+	log_root.addHandler(handler_console)
+	parts = vehicleParts(bootTimer())
+	try:
+		modes[sys.argv[1]](parts, sys.argv[2:])
+	except KeyboardInterrupt:
+		log_root.warning('Abort: KeyboardInterrupt')
+	except:
+		log_root.warning('Abort@%s' % sys.argv[1])
+		log_root.warning(traceback.format_exc())
+	finally:
+		parts.stop()
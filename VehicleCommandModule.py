@@ -0,0 +1,415 @@
+"""
+Robotritons in-use module for commanding a running vehicle over UDP.
+
+Purpose: Start, stop and pause runs, upload missions and change tuning without restarting the vehicle script, so imu.initialize(),
+	GPSNavInit() and calibrateMag() happen once per session instead of once per run. Turnaround between runs drops from minutes to seconds.
+Requirements: The python modules json, logging, math, os, random, socket, sys, time, errno, VehicleNavModule, VehicleMissionModule
+	and VehicleTelemetryModule.
+Use: On the vehicle (see VehicleDrive.py) make a commandServer(port) and a vehicleSession(esc, servo, ubl, imu, magMeans), then between
+	control ticks apply every command poll() returns and reply with the result:
+		for command in server.poll():
+			ok, message = session.apply(command)
+			server.reply(command, ok, message, session.status())
+		session.tick()
+	serve(session, server, udp) is that loop with a telemetry log per run.
+	poll() never blocks, and apply() either applies a whole command or rejects it without changing anything, so a command can't land
+	in the middle of a tick or leave half a mission behind.
+	From a laptop: python VehicleCommandModule.py host command [arguments], for example
+		python VehicleCommandModule.py 192.168.1.5 mission waypointData/mission.csv
+		python VehicleCommandModule.py 192.168.1.5 set holdTime=0.25 speed=1
+		python VehicleCommandModule.py 192.168.1.5 start
+
+	Commands: one JSON object per datagram, {"cmd":name, "id":number, ...}. A plain text line works too (echo start | nc -u host 14661).
+		start				Drive the mission from its first waypoint with a fresh vehicleNav made from the current tuning.
+		stop				Stop the esc and center the servo. start begins the mission again.
+		pause, resume		Stop where the vehicle is, then continue the same leg.
+		mission				{"waypoints":[{"lat","lon","radius","name"}, ...]} or {"path":"route file on the vehicle"}. Text form:
+							"mission lat,lon[,radius[,name]] ..." or "mission path". Replaces the route, a running vehicle heads for its first waypoint.
+		set					{"params":{name:value, ...}} or "set name=value ...". Names are those of tunable, applied to the next tick.
+		status				Only replies.
+	Replies are JSON: {"id", "ok", "message", "state", "leg", "legs", "runs", "head", "relBear", "lat", "lon"}. The server remembers
+	the last reply to each sender, so a command resent after a lost reply gets the same reply and isn't applied twice.
+	A mission must fit in one datagram (about 1000 waypoints).
+
+Updates:
+- October 19, 2026. nextLeg() sets vehicleNav.leg, so the telemetry of a run records its legs for VehicleReplayModule.
+- October 19, 2026. Wrong-typed JSON commands are rejected instead of ending the process. set takes negative declinations, each tunable
+	has its own range. Regression checks in troubleshootUtest/TS_Commands.py.
+- October 19, 2026. serve() holds the command loop of VehicleDrive.py so Vehicle.py can run it too.
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/socket.html#socket.socket.setblocking
+https://docs.python.org/2.7/library/json.html
+"""
+
+import errno
+import json
+import logging
+import math
+import os
+import random
+import socket
+import sys
+import time
+
+import VehicleNavModule
+import VehicleMissionModule
+import VehicleTelemetryModule
+
+defaultPort = 14661
+maxDatagram = 65507
+commands = ('start', 'stop', 'pause', 'resume', 'mission', 'set', 'status')
+#vehicleNav attributes "set" may change, with their type and [min, max] (None for no limit). arriveDist is not here, it follows the
+#arrival radius of each leg. Declinations west of true north are negative.
+tunable = {'declination':[float, -180, 180], 'threshold':[float, 0, None], 'steerMax':[float, 0, None], 'holdTime':[float, 0, None],
+	'speed':[float, 0, None], 'gpsTimeout':[int, 0, None], 'minAcc':[float, 0, None], 'updateBearing':[bool, None, None]}
+
+# ---- Parsing ----
+def parseValue(kind, value, low=None, high=None):
+	"""Converts a "set" value to kind within [low, high]. Raises ValueError when it doesn't fit"""
+	if (kind == bool):
+		if (value in (True, False)):
+			return bool(value)
+		if (str(value).lower() in ('true', '1', 'yes', 'on')):
+			return True
+		if (str(value).lower() in ('false', '0', 'no', 'off')):
+			return False
+		raise ValueError('%r is not True or False' % (value,))
+	try:
+		number = float(value)
+	except TypeError:
+		raise ValueError('%r is not a number' % (value,))
+	if (math.isnan(number) or math.isinf(number)):
+		raise ValueError('%r is not a finite number' % (value,))
+	if (low != None and number < low):
+		raise ValueError('%r is below %s' % (value, low))
+	if (high != None and number > high):
+		raise ValueError('%r is above %s' % (value, high))
+	return kind(number)
+
+def parseText(text):
+	"""Command dictionary of a plain text command line"""
+	words = text.split()
+	if not words:
+		raise ValueError('empty command')
+	command = {'cmd':words[0].lower()}
+	arguments = words[1:]
+	if (command['cmd'] == 'set'):
+		command['params'] = {}
+		for argument in arguments:
+			if ('=' not in argument):
+				raise ValueError('expected name=value, got %r' % argument)
+			name, value = argument.split('=', 1)
+			command['params'][name] = value
+	elif (command['cmd'] == 'mission'):
+		if (len(arguments) == 1 and ',' not in arguments[0]):
+			command['path'] = arguments[0]
+		else:
+			command['waypoints'] = []
+			for argument in arguments:
+				fields = argument.split(',')
+				command['waypoints'].append({'lat':float(fields[0]), 'lon':float(fields[1]),
+					'radius':float(fields[2]) if len(fields) > 2 and fields[2] else None, 'name':fields[3] if len(fields) > 3 else ''})
+	return command
+
+def parseCommand(data):
+	"""Command dictionary of a datagram, JSON or plain text. Raises ValueError when it isn't a command"""
+	text = data.decode('utf-8', 'replace').strip()
+	if text.startswith('{'):
+		command = json.loads(text)
+		if not isinstance(command, dict):
+			raise ValueError('expected a JSON object')
+	else:
+		command = parseText(text)
+	if (command.get('cmd') not in commands):
+		raise ValueError('unknown command %r, use one of %s' % (command.get('cmd'), ', '.join(commands)))
+	return command
+# ---- End Parsing ----
+
+class commandServer:
+	"""Non-blocking UDP command socket, polled between control ticks"""
+
+	def __init__(self, port=defaultPort, host=''):
+		self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+		self.sock.bind((host, port))
+		self.sock.setblocking(False)
+		self.received = 0
+		self.invalid = 0
+		self.repeated = 0
+		self.lastReply = {} #sender -> [id, reply datagram]
+
+	def poll(self, maxCommands=8):
+		"""Returns up to maxCommands commands waiting on the socket, each with its 'sender'. Never blocks"""
+		pending = []
+		while (len(pending) < maxCommands):
+			try:
+				data, sender = self.sock.recvfrom(maxDatagram)
+			except socket.error as e:
+				if (e.errno in (errno.EAGAIN, errno.EWOULDBLOCK)):
+					break
+				raise
+			self.received += 1
+			try:
+				command = parseCommand(data)
+			except (ValueError, IndexError) as e:
+				self.invalid += 1
+				self.send({'id':None, 'ok':False, 'message':str(e)}, sender)
+				continue
+			command['sender'] = sender
+			last = self.lastReply.get(sender)
+			if (last != None and command.get('id') != None and last[0] == command['id']): #Resent after a lost reply
+				self.repeated += 1
+				self.sendData(last[1], sender)
+				continue
+			pending.append(command)
+		return pending
+
+	def reply(self, command, ok, message, state=None):
+		"""Answers command with ok, message and the session state"""
+		answer = dict(state or {})
+		answer.update({'id':command.get('id'), 'ok':ok, 'message':message})
+		data = self.send(answer, command['sender'])
+		if (command.get('id') != None):
+			self.lastReply[command['sender']] = [command['id'], data]
+
+	def send(self, answer, sender):
+		data = json.dumps(answer).encode('utf-8')
+		self.sendData(data, sender)
+		return data
+
+	def sendData(self, data, sender):
+		try:
+			self.sock.sendto(data, sender)
+		except socket.error as e:
+			if (e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS, errno.ENETUNREACH, errno.EHOSTUNREACH, errno.ECONNREFUSED)):
+				raise
+
+	def close(self):
+		self.sock.close()
+
+class vehicleSession:
+	"""
+	Runs missions one after another on hardware initialized once. State is 'idle', 'running' or 'paused'.
+	Commands only change the session inside apply(), so calling apply() between tick() calls applies them atomically.
+	"""
+
+	def __init__(self, esc, servo, ubl, imu, magMeans=None, route=None, **tuning):
+		self.esc = esc
+		self.servo = servo
+		self.ubl = ubl
+		self.imu = imu
+		self.magMeans = magMeans
+		self.tuning = {'updateBearing':True} #Each leg starts somewhere else, so keep the bearing up to date
+		self.tuning.update(tuning)
+		self.route = route
+		self.sequencer = None
+		self.nav = None
+		self.state = 'idle'
+		self.runs = 0
+		self.finished = False #True after the last waypoint of a run, until the next start
+
+	# ---- Commands ----
+	def apply(self, command):
+		"""Applies a command dictionary. Returns [ok, message]. Nothing changes when ok is False"""
+		name = command.get('cmd')
+		try:
+			if (name == 'start'):
+				return self.start()
+			elif (name == 'stop'):
+				self.halt('idle')
+				return [True, 'stopped']
+			elif (name == 'pause'):
+				if (self.state != 'running'):
+					return [False, 'not running']
+				self.halt('paused')
+				return [True, 'paused at leg %d' % self.sequencer.index]
+			elif (name == 'resume'):
+				if (self.state != 'paused'):
+					return [False, 'not paused']
+				self.nav.timeout = 0
+				self.nav.targetTime = 0
+				self.state = 'running'
+				return [True, 'resumed at leg %d' % self.sequencer.index]
+			elif (name == 'mission'):
+				return self.setMission(command)
+			elif (name == 'set'):
+				return self.setParams(command.get('params', {}))
+			elif (name == 'status'):
+				return [True, self.state]
+			return [False, 'unknown command %r' % name]
+		except (ValueError, TypeError, KeyError, IOError, OSError) as e:
+			return [False, str(e)]
+		except Exception as e: #Any other malformed command is rejected too, it must never end the vehicle process
+			return [False, '%s: %s' % (type(e).__name__, e)]
+
+	def start(self):
+		if (self.route == None):
+			return [False, 'no mission, send one first']
+		self.sequencer = VehicleMissionModule.missionSequencer(self.route)
+		leg = self.sequencer.leg
+		self.nav = VehicleNavModule.vehicleNav(self.esc, self.servo, self.ubl, self.imu, leg.lat, leg.lon, magMeans=self.magMeans, **self.tuning)
+		self.nav.arriveDist = leg.radius/1000.0
+		self.state = 'running'
+		self.finished = False
+		self.runs += 1
+		return [True, 'run %d started, %d waypoints' % (self.runs, len(self.route))]
+
+	def halt(self, state):
+		self.esc.stop()
+		self.esc.rest()
+		self.servo.center()
+		self.state = state
+
+	def setMission(self, command):
+		if ('path' in command):
+			route = VehicleMissionModule.loadRoute(command['path'])
+		else:
+			if not isinstance(command.get('waypoints'), list):
+				raise ValueError('mission waypoints must be a list of {"lat","lon","radius","name"} objects')
+			waypoints = []
+			for waypoint in command['waypoints']:
+				if not isinstance(waypoint, dict):
+					raise ValueError('mission waypoint %r is not a {"lat","lon","radius","name"} object' % (waypoint,))
+				radius = waypoint.get('radius')
+				waypoints.append({'lat':float(waypoint['lat']), 'lon':float(waypoint['lon']),
+					'radius':VehicleMissionModule.defaultRadius if radius == None else float(radius), 'name':str(waypoint.get('name') or '')})
+			VehicleMissionModule.validate(waypoints, 'mission')
+			route = VehicleMissionModule.compileRoute(waypoints)
+		#Everything is checked, swap the route in
+		self.route = route
+		if (self.state != 'idle'):
+			self.sequencer = VehicleMissionModule.missionSequencer(route)
+			self.nextLeg()
+		return [True, '%d waypoints, %.0f m' % (len(route), route.length())]
+
+	def setParams(self, params):
+		if not isinstance(params, dict):
+			raise ValueError('set params must be a {name:value} object')
+		values = {}
+		for name, value in params.items():
+			if (name not in tunable):
+				raise ValueError('%s is not tunable, use one of %s' % (name, ', '.join(sorted(tunable))))
+			kind, low, high = tunable[name]
+			try:
+				values[name] = parseValue(kind, value, low, high)
+			except ValueError as e:
+				raise ValueError('%s: %s' % (name, e))
+		#Everything is checked, change the tuning of later runs and of the current one
+		self.tuning.update(values)
+		if (self.nav != None):
+			for name, value in values.items():
+				setattr(self.nav, name, value)
+		return [True, ' '.join('%s=%s' % (name, values[name]) for name in sorted(values))]
+	# ---- End Commands ----
+
+	def nextLeg(self):
+		"""Points the controller at the sequencer's current leg"""
+		leg = self.sequencer.leg
+		self.nav.setWaypoint(leg.lat, leg.lon)
+		self.nav.leg = self.sequencer.index
+		self.nav.arriveDist = leg.radius/1000.0
+		self.nav.bearing = None #Recomputed from the next position
+		self.nav.arrived = False
+
+	def tick(self):
+		"""One control tick while running. Returns True when the tick ran"""
+		if (self.state != 'running'):
+			return False
+		arrived = self.nav.tick()
+		fix = self.nav.fix
+		advanced = False
+		if (fix != None and fix['hAcc'] <= self.nav.minAcc):
+			advanced = self.sequencer.update(fix['lat'], fix['lon'])
+		if (arrived and not advanced):
+			self.sequencer.advance()
+			advanced = True
+		if advanced:
+			if self.sequencer.done:
+				self.halt('idle')
+				self.finished = True
+			else:
+				self.nextLeg()
+		return True
+
+	def status(self):
+		"""Dictionary of the session state for replies"""
+		state = {'state':self.state, 'runs':self.runs, 'finished':self.finished, 'legs':0 if self.route == None else len(self.route),
+			'leg':None if self.sequencer == None else self.sequencer.index}
+		if (self.nav != None):
+			state['head'] = self.nav.head
+			state['relBear'] = self.nav.relBear
+			if (self.nav.pos != None):
+				state['lat'], state['lon'] = self.nav.pos[0], self.nav.pos[1]
+		return state
+
+def serve(session, server, udp=None, telemetryPath='waypointData/drive%d.bin', log=None, idleSleep=0.02):
+	"""
+	The control loop of a commanded vehicle: applies the commands waiting on server between ticks of session and logs each run
+	to telemetryPath % run number. udp is an optional VehicleUDPModule.udpTelemetry. Returns on KeyboardInterrupt, the caller stops the vehicle.
+	"""
+	if (log == None):
+		log = logging.getLogger('')
+	telemetry = None #Log of the current run
+	try:
+		while(True):
+			loopTime = time.time()
+			#Commands only take effect here, between two ticks
+			for command in server.poll():
+				ok, message = session.apply(command)
+				server.reply(command, ok, message, session.status())
+				log.warning('%s from %s: %s %s' % (command['cmd'], command['sender'][0], 'ok' if ok else 'rejected', message))
+				if (ok and command['cmd'] == 'start'):
+					if (telemetry != None):
+						telemetry.close()
+					telemetry = VehicleTelemetryModule.telemetryLogger(telemetryPath % session.runs, VehicleNavModule.navFields)
+			if session.tick():
+				telemetry.log(*session.nav.record(loopTime))
+				if (udp != None):
+					udp.sendNav(session.nav, time.time() - loopTime)
+				if session.finished:
+					log.warning('Mission complete, run %d' % session.runs)
+					telemetry.close()
+			else:
+				time.sleep(idleSleep) #Idle or paused, only listen
+	except KeyboardInterrupt:
+		log.warning('Abort@serve: KeyboardInterrupt')
+	finally:
+		if (telemetry != None):
+			telemetry.close()
+
+def sendCommand(host, command, port=defaultPort, timeout=1.0, retries=3):
+	"""Sends a command dictionary and returns the reply dictionary, resending up to retries times. Raises IOError without a reply"""
+	command = dict(command)
+	command.setdefault('id', random.randint(1, 0x7FFFFFFF))
+	data = json.dumps(command).encode('utf-8')
+	sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+	sock.settimeout(timeout)
+	try:
+		for attempt in range(retries):
+			sock.sendto(data, (host, port))
+			while True:
+				try:
+					answer = json.loads(sock.recv(maxDatagram).decode('utf-8'))
+				except socket.timeout:
+					break
+				if (answer.get('id') == command['id']):
+					return answer
+	finally:
+		sock.close()
+	raise IOError('no reply from %s:%d' % (host, port))
+
+if __name__ == "__main__":
+	if (len(sys.argv) < 3):
+		sys.exit('Usage: python VehicleCommandModule.py host command [arguments]\n       commands: %s' % ', '.join(commands))
+	host = sys.argv[1]
+	command = parseText(' '.join(sys.argv[2:]))
+	if ('path' in command and command['cmd'] == 'mission' and os.path.exists(command['path'])):
+		#A route file on this machine is read here and uploaded, otherwise the vehicle loads the path from its own disk
+		waypoints = VehicleMissionModule.readRoute(command.pop('path'))
+		VehicleMissionModule.validate(waypoints, sys.argv[3])
+		command['waypoints'] = waypoints
+	answer = sendCommand(host, command)
+	print('%s: %s' % ('ok' if answer['ok'] else 'rejected', answer['message']))
+	print(', '.join('%s %s' % (name, answer[name]) for name in sorted(answer) if name not in ('id', 'ok', 'message')))
@@ -0,0 +1,266 @@
+"""
+Robotritons in-use module for a live web dashboard served from the vehicle.
+
+Purpose: Watch a run from any phone or laptop browser: a map trace of the GPS positions, a heading gauge with the relative bearing and steer,
+	and a plot of the loop time. The dashboard runs as its own low priority process and reads the UDP telemetry the navigation scripts
+	already send (VehicleUDPModule), so the control loop does no extra work and its timing doesn't depend on the browser.
+Requirements: python 3.7 or newer (asyncio). The python modules asyncio, base64, collections, hashlib, json, math, multiprocessing, os, struct, sys,
+	VehicleUDPModule and VehicleGeoModule. No web framework, the HTTP and WebSocket handling is the few lines below.
+Use: Start it next to a navigation script, on the vehicle or on a laptop on the same network:
+		python3 VehicleDashboardModule.py [httpPort] [udpPort]
+	then open http://<vehicle ip>:8080/ in a browser. From a python 3 program call start() instead, it returns the daemon Process.
+	GET /state returns the full state as JSON (handy with curl), /ws is the WebSocket the page listens on.
+
+	The server pushes state DIFFS: every 1/pushRate seconds each browser gets only the values that changed since its last push and the
+	trace points and loop times it hasn't seen. The server process lowers its priority with os.nice(niceness) and, where the kernel allows,
+	is pinned to "cpus" (for example {3} on the Pi's 4 cores) so it can't take CPU time from the navigation loop.
+
+	Test on one machine: run this module, then "python VehicleUDPModule.py" sends packets to 127.0.0.1:14660, open http://127.0.0.1:8080/.
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://tools.ietf.org/html/rfc6455
+https://docs.python.org/3/library/asyncio-stream.html
+https://docs.python.org/3/library/asyncio-protocol.html#datagram-protocols
+"""
+
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import struct
+import sys
+
+import VehicleUDPModule
+import VehicleGeoModule
+
+websocketGUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# ---- Page ----
+page = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width">
+<title>AVC dashboard</title>
+<style>body{font-family:sans-serif;margin:8px;background:#111;color:#ddd}canvas{background:#222;margin:4px}#s{font-family:monospace}</style>
+</head><body>
+<div id="s">connecting...</div>
+<canvas id="map" width="400" height="400"></canvas><canvas id="gauge" width="260" height="260"></canvas><br>
+<canvas id="loop" width="664" height="140"></canvas>
+<script>
+var state={}, trace=[], loops=[];
+function connect(){
+ var ws=new WebSocket('ws://'+location.host+'/ws');
+ ws.onmessage=function(e){
+  var m=JSON.parse(e.data);
+  for(var k in m.state){state[k]=m.state[k];}
+  trace=trace.concat(m.trace); if(trace.length>5000){trace=trace.slice(-5000);}
+  loops=loops.concat(m.loop); if(loops.length>600){loops=loops.slice(-600);}
+  draw();
+ };
+ ws.onclose=function(){document.getElementById('s').textContent='disconnected, retrying'; setTimeout(connect,1000);};
+}
+function f(v,d){return (v===null||v===undefined)?'--':v.toFixed(d);}
+function draw(){
+ document.getElementById('s').textContent='#'+state.seq+'  lat '+f(state.lat,6)+'  lon '+f(state.lon,6)+'  head '+f(state.head,1)+
+  '  relBear '+f(state.relBear,1)+'  steer '+f(state.steer,1)+'  throttle '+f(state.throttle,0)+'  loop '+f(state.loopTime*1000,1)+' ms'+
+  '  received '+state.received+'  lost '+state.lost;
+ var c=document.getElementById('map').getContext('2d'); c.clearRect(0,0,400,400);
+ if(trace.length){
+  var minE=1e9,maxE=-1e9,minN=1e9,maxN=-1e9;
+  trace.forEach(function(p){minE=Math.min(minE,p[0]);maxE=Math.max(maxE,p[0]);minN=Math.min(minN,p[1]);maxN=Math.max(maxN,p[1]);});
+  var s=380/Math.max(maxE-minE,maxN-minN,10);
+  c.strokeStyle='#4c4'; c.beginPath();
+  trace.forEach(function(p,i){var x=10+(p[0]-minE)*s, y=390-(p[1]-minN)*s; if(i){c.lineTo(x,y);}else{c.moveTo(x,y);}});
+  c.stroke(); c.fillStyle='#fff'; c.fillText((380/s).toFixed(0)+' m',10,12);
+ }
+ var g=document.getElementById('gauge').getContext('2d'); g.clearRect(0,0,260,260);
+ g.strokeStyle='#888'; g.beginPath(); g.arc(130,130,110,0,2*Math.PI); g.stroke(); g.fillStyle='#ddd'; g.fillText('N',126,14);
+ function needle(deg,color,len){var a=-deg*Math.PI/180; g.strokeStyle=color; g.lineWidth=3; g.beginPath(); g.moveTo(130,130);
+  g.lineTo(130-len*Math.sin(a),130-len*Math.cos(a)); g.stroke(); g.lineWidth=1;}
+ if(state.head!==null&&state.head!==undefined){needle(state.head,'#4cf',100);
+  if(state.relBear!==null){needle(state.head+state.relBear,'#fc4',80);}
+  if(state.steer!==null){needle(state.head+state.steer,'#f44',50);}}
+ var l=document.getElementById('loop').getContext('2d'); l.clearRect(0,0,664,140);
+ var top=Math.max.apply(null,loops.concat([1])); l.strokeStyle='#f84'; l.beginPath();
+ loops.forEach(function(v,i){var x=664-(loops.length-i), y=135-v/top*125; if(i){l.lineTo(x,y);}else{l.moveTo(x,y);}});
+ l.stroke(); l.fillStyle='#ddd'; l.fillText('loop time, max '+top.toFixed(1)+' ms',4,12);
+}
+connect();
+</script></body></html>
+'''
+# ---- End Page ----
+
+class dashboardServer:
+
+	def __init__(self, httpPort=8080, udpPort=VehicleUDPModule.defaultPort, host='0.0.0.0', pushRate=5.0, traceSpacing=0.5, history=600):
+		self.httpPort = httpPort
+		self.udpPort = udpPort
+		self.host = host
+		self.period = 1.0/pushRate #Seconds between pushes to each browser
+		self.traceSpacing = traceSpacing #m between trace points kept
+		self.state = {'received':0, 'lost':0}
+		self.trace = [] #Local [east,north] meters, one every traceSpacing
+		self.traceStart = 0 #Number of trace points dropped off the front
+		self.maxTrace = 20000
+		self.loops = collections.deque(maxlen=history) #[packet number, loop time in ms]
+		self.frame = None
+		self.lastSeq = None
+
+	# ---- Telemetry Input ----
+	def datagram(self, data):
+		state = VehicleUDPModule.decode(data)
+		if (state == None):
+			return
+		if (self.lastSeq != None):
+			gap = (state['seq'] - self.lastSeq - 1) & 0xFFFFFFFF
+			if (gap < 1000):
+				self.state['lost'] += gap
+		self.lastSeq = state['seq']
+		self.state['received'] += 1
+		for name in VehicleUDPModule.packetFields:
+			value = state[name]
+			self.state[name] = None if (isinstance(value, float) and math.isnan(value)) else value
+		self.loops.append((self.state['received'], round(state['loopTime']*1000, 2)))
+		if (self.state['lat'] != None):
+			if (self.frame == None):
+				self.frame = VehicleGeoModule.enuFrame(state['lat'], state['lon'])
+			east, north = self.frame.toLocal(state['lat'], state['lon'])
+			if (not self.trace or (east - self.trace[-1][0])**2 + (north - self.trace[-1][1])**2 >= self.traceSpacing**2):
+				self.trace.append([round(east, 2), round(north, 2)])
+				if (len(self.trace) > self.maxTrace):
+					dropped = len(self.trace)//2
+					del self.trace[:dropped]
+					self.traceStart += dropped
+
+	def makeProtocol(self):
+		server = self
+		class telemetryProtocol(asyncio.DatagramProtocol):
+			def datagram_received(self, data, address):
+				server.datagram(data)
+		return telemetryProtocol()
+	# ---- End Telemetry Input ----
+
+	# ---- HTTP And WebSocket ----
+	async def handle(self, reader, writer):
+		try:
+			request = await reader.readline()
+			headers = {}
+			while True:
+				line = await reader.readline()
+				if (line in (b'\r\n', b'\n', b'')):
+					break
+				name, _, value = line.decode('latin-1').partition(':')
+				headers[name.strip().lower()] = value.strip()
+			parts = request.decode('latin-1').split()
+			path = parts[1] if len(parts) > 1 else '/'
+			if (path == '/ws' and headers.get('upgrade', '').lower() == 'websocket'):
+				await self.websocket(reader, writer, headers)
+			elif (path == '/state'):
+				self.respond(writer, '200 OK', 'application/json', json.dumps(self.state).encode('utf-8'))
+			elif (path == '/'):
+				self.respond(writer, '200 OK', 'text/html; charset=utf-8', page.encode('utf-8'))
+			else:
+				self.respond(writer, '404 Not Found', 'text/plain', b'not found')
+			await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+	def respond(self, writer, status, contentType, body):
+		writer.write(('HTTP/1.1 %s\r\nContent-Type: %s\r\nContent-Length: %d\r\nConnection: close\r\n\r\n' % (status, contentType, len(body))).encode('latin-1') + body)
+
+	async def websocket(self, reader, writer, headers):
+		accept = base64.b64encode(hashlib.sha1(headers['sec-websocket-key'].encode('latin-1') + websocketGUID).digest()).decode('ascii')
+		writer.write(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Accept: %s\r\n\r\n' % accept).encode('latin-1'))
+		listener = asyncio.ensure_future(self.readFrames(reader, writer))
+		sent = {}
+		traceSent = 0
+		loopSent = 0
+		try:
+			while not listener.done():
+				diff = dict((name, value) for name, value in self.state.items() if name not in sent or sent[name] != value)
+				sent.update(diff)
+				first = max(traceSent - self.traceStart, 0)
+				trace = self.trace[first:]
+				traceSent = self.traceStart + len(self.trace)
+				loop = [ms for number, ms in self.loops if number > loopSent]
+				if self.loops:
+					loopSent = self.loops[-1][0]
+				if (diff or trace or loop):
+					writer.write(frame(json.dumps({'state':diff, 'trace':trace, 'loop':loop}).encode('utf-8')))
+					await writer.drain()
+				await asyncio.sleep(self.period)
+		finally:
+			listener.cancel()
+
+	async def readFrames(self, reader, writer):
+		"""Reads the browser's frames until it closes. Answers pings, ignores everything else"""
+		while True:
+			head = await reader.readexactly(2)
+			opcode = head[0] & 0x0F
+			length = head[1] & 0x7F
+			if (length == 126):
+				length = struct.unpack('>H', await reader.readexactly(2))[0]
+			elif (length == 127):
+				length = struct.unpack('>Q', await reader.readexactly(8))[0]
+			mask = await reader.readexactly(4) if (head[1] & 0x80) else b'\0\0\0\0'
+			payload = bytes(b ^ mask[i%4] for i, b in enumerate(await reader.readexactly(length)))
+			if (opcode == 0x8): #Close
+				writer.write(bytes([0x88, 0]))
+				return
+			if (opcode == 0x9): #Ping
+				writer.write(frame(payload, 0xA))
+	# ---- End HTTP And WebSocket ----
+
+	async def serve(self):
+		loop = asyncio.get_event_loop()
+		await loop.create_datagram_endpoint(self.makeProtocol, local_addr=('0.0.0.0', self.udpPort))
+		server = await asyncio.start_server(self.handle, self.host, self.httpPort)
+		async with server:
+			await server.serve_forever()
+
+	def run(self):
+		asyncio.run(self.serve())
+
+def frame(payload, opcode=0x1):
+	"""Unmasked server to browser WebSocket frame, text by default"""
+	length = len(payload)
+	if (length < 126):
+		head = struct.pack('>BB', 0x80 | opcode, length)
+	elif (length < 65536):
+		head = struct.pack('>BBH', 0x80 | opcode, 126, length)
+	else:
+		head = struct.pack('>BBQ', 0x80 | opcode, 127, length)
+	return head + payload
+
+def serve(httpPort=8080, udpPort=VehicleUDPModule.defaultPort, niceness=10, cpus=None, **options):
+	"""Lowers this process' priority, pins it to cpus when given, and runs a dashboardServer forever"""
+	os.nice(niceness)
+	if (cpus != None and hasattr(os, 'sched_setaffinity')):
+		try:
+			os.sched_setaffinity(0, cpus)
+		except OSError:
+			pass
+	dashboardServer(httpPort, udpPort, **options).run()
+
+def start(httpPort=8080, udpPort=VehicleUDPModule.defaultPort, niceness=10, cpus=None, **options):
+	"""Runs the dashboard in a daemon process and returns the Process"""
+	process = multiprocessing.Process(target=serve, args=(httpPort, udpPort, niceness, cpus), kwargs=options)
+	process.daemon = True
+	process.start()
+	return process
+
+if __name__ == "__main__":
+	httpPort = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+	udpPort = int(sys.argv[2]) if len(sys.argv) > 2 else VehicleUDPModule.defaultPort
+	print('Dashboard on http://0.0.0.0:%d/ reading telemetry from UDP port %d' % (httpPort, udpPort))
+	try:
+		serve(httpPort, udpPort)
+	except KeyboardInterrupt:
+		pass
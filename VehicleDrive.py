@@ -0,0 +1,140 @@
+"""
+Robotritons long-running vehicle process commanded over UDP.
+
+Purpose: Initialize and calibrate the vehicle once, then drive as many runs as needed without restarting. Missions, tuning and
+	start/stop/pause come from VehicleCommandModule commands between control ticks, so a new waypoint or a retry takes seconds.
+Requirements: A vehicle with speed a controller, a servo, one InvenSense MPU-9250, and one Ublox NEO-M8N Standard Precision GNSS Module.
+	The python modules logging, traceback, sys, time, navio.util, VehicleGPSModule, VehiclePWMModule, VehicleMissionModule,
+	VehicleCommandModule, VehicleLogWriterModule, VehicleUDPModule and navio.mpu9250_better.
+Use: Run "python VehicleDrive.py [route file]" on the vehicle, then from a laptop on the same network:
+		python VehicleCommandModule.py <vehicle ip> mission waypointData/mission.csv
+		python VehicleCommandModule.py <vehicle ip> start
+		python VehicleCommandModule.py <vehicle ip> set holdTime=0.25
+		python VehicleCommandModule.py <vehicle ip> stop
+	The magnetometer means are read from 'waypointData/magnetometerMeans.txt' like calibrateMag(auto=True) of WaypointTest.py.
+	Each run writes its own telemetry log 'waypointData/drive<run>.bin' and broadcasts live telemetry for GroundStation.py.
+	Ctrl+C stops the vehicle and ends the process.
+
+Updates:
+- October 19, 2026. The command loop moved to VehicleCommandModule.serve(). Vehicle.py drive does the same with lazy initialization.
+- October 19, 2026. Created the file from the initialization of WaypointTest.py.
+
+Resources:
+https://docs.emlid.com/navio/Navio-dev/read-gps-data/
+https://docs.emlid.com/navio/Navio-dev/mpu9250-imu/
+"""
+import logging
+import traceback
+import sys
+import time
+import navio.util
+import VehiclePWMModule
+import VehicleMissionModule
+import VehicleCommandModule
+import VehicleLogWriterModule
+import VehicleUDPModule
+from VehicleGPSModule import *
+from navio.mpu9250_better import MPU9250
+
+navio.util.check_apm()
+# ----- Logging Setup -----
+log_root = logging.getLogger('')
+log_root.setLevel(logging.DEBUG)
+logWriter = VehicleLogWriterModule.logWriter('waypointData/vehicleDrive.csv')
+handler_file = VehicleLogWriterModule.queueHandler(logWriter)
+handler_file.setFormatter(logging.Formatter('%(levelname)-8s,%(message)s'))
+log_root.addHandler(handler_file)
+handler_console = logging.StreamHandler()
+handler_console.setLevel(logging.WARNING)
+handler_console.setFormatter(logging.Formatter('%(levelname)-6s %(name)-6s %(message)s'))
+log_root.addHandler(handler_console)
+# ----- End Logging Setup -----
+
+# ---- Instantiate Critical Objects ----
+vehicle_esc = VehiclePWMModule.vehiclePWM("esc")
+vehicle_servo = VehiclePWMModule.vehiclePWM("servo")
+ubl = U_blox()
+imu = MPU9250()
+log_root.warning('Connection established: %s' % imu.testConnection())
+# ---- End Instantiate Critical Objects ----
+
+# ---- GPS Methods ----
+CFGmsg8_NAVposllh_no = [0xb5,0x62,0x06,0x01,0x08,0x00,0x01,0x02,0x00,0x00,0x00,0x00,0x00,0x00,0x12,0xb9]#Disable Ublox from publishing a NAVposllh
+CFGmsg8_NAVstatus_no = [0xb5,0x62,0x06,0x01,0x08,0x00,0x01,0x03,0x00,0x00,0x00,0x00,0x00,0x00,0x13,0xc0]#Disable Ublox from publishing a NAVstatus
+CFGmsg8_NAVstatus_yes = [0xb5,0x62,0x06,0x01,0x08,0x00,0x01,0x03,0x00,0x00,0x00,0x00,0x01,0x00,0x14,0xc2]#Enable Ublox to publish a NAVstatus
+CFGmsg8_NAVposllh_yes = [0xb5,0x62,0x06,0x01,0x08,0x00,0x01,0x02,0x00,0x00,0x00,0x00,0x01,0x00,0x13,0xbb]#Enable Ublox to publish a NAVposllh
+
+def commUblox(msg):
+	for x in range(0,10):
+		ubl.bus.xfer2(msg)
+
+def GPSNavInit():
+	#Wait for a confirmed fix with NAVstatus messages, then switch to NAVposllh positions
+	log_root.warning('GPSNavInit')
+	commUblox(CFGmsg8_NAVposllh_no)
+	commUblox(CFGmsg8_NAVstatus_no)
+	commUblox(CFGmsg8_NAVstatus_yes)
+	goodGPSfix = False
+	while not (goodGPSfix):
+		GPSfix = ubl.GPSfetch()
+		if (GPSfix):
+			if((GPSfix['fStatus'] == 2) or (GPSfix['fStatus'] == 3) or (GPSfix['fStatus'] == 4)):
+				goodGPSfix = True
+	commUblox(CFGmsg8_NAVstatus_no)
+	commUblox(CFGmsg8_NAVposllh_yes)
+	log_root.warning('goodFix and end GPSNavInit')
+# ---- End GPS Methods ----
+
+def readMagMeans():
+	meansFile = open('waypointData/magnetometerMeans.txt','r')
+	xMean = float(meansFile.readline().rstrip('\n'))
+	yMean = float(meansFile.readline().rstrip('\n'))
+	meansFile.close()
+	return {'x':xMean,'y':yMean}
+
+# ---- Initialize esc, servo, IMU & GPS (once per session) ----
+try:
+	vehicle_esc.stop()
+	vehicle_esc.rest()
+	vehicle_servo.rest()
+	imu.initialize()
+	imuOffsets = imu.calib_offsets(cache_file='waypointData/imuOffsets.txt')
+	log_root.warning('imu offsets gyro %s acc %s' % (imuOffsets['gyro'],imuOffsets['acc']))
+	magMeans = readMagMeans()
+	log_root.warning('magMeans %f,%f' % (magMeans['x'],magMeans['y']))
+	GPSNavInit()
+	#Wiggle wheels to indicate ready for commands
+	vehicle_servo.steer(-35)
+	time.sleep(0.5)
+	vehicle_servo.steer(35)
+	time.sleep(0.5)
+	vehicle_servo.center()
+except:
+	log_root.warning('Abort@Initialize')
+	log_root.warning(traceback.format_exc())
+	vehicle_esc.stop()
+	vehicle_esc.rest()
+	vehicle_servo.rest()
+	sys.exit()
+# ---- End Initialize ----
+
+route = VehicleMissionModule.loadRoute(sys.argv[1]) if len(sys.argv) > 1 else None
+session = VehicleCommandModule.vehicleSession(vehicle_esc, vehicle_servo, ubl, imu, magMeans=magMeans, route=route)
+server = VehicleCommandModule.commandServer(VehicleCommandModule.defaultPort)
+udp = VehicleUDPModule.udpTelemetry('255.255.255.255', VehicleUDPModule.defaultPort, rate=10)
+log_root.warning('Waiting for commands on UDP port %d' % VehicleCommandModule.defaultPort)
+
+try:
+	#Polls commands between control ticks until Ctrl+C, see VehicleCommandModule.serve()
+	VehicleCommandModule.serve(session, server, udp, 'waypointData/drive%d.bin', log_root)
+finally:
+	log_root.warning('Finally@serve')
+	log_root.warning(traceback.format_exc())
+	vehicle_esc.stop()
+	vehicle_esc.rest()
+	vehicle_servo.rest()
+	server.close()
+	udp.close()
+	log_root.warning('Log writer: %(written)d written, %(dropped)d dropped, %(late)d late, max latency %(maxLatency).3f s' % logWriter.stats())
+	logWriter.close()
+	sys.exit()
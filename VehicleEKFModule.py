@@ -0,0 +1,244 @@
+"""
+Robotritons in-use module for GPS/IMU dead reckoning between GPS fixes.
+
+Purpose: Fuse the 1Hz Ublox NAV-POSLLH positions with MPU9250 yaw rate and forward acceleration in an extended Kalman filter.
+	The navigation loop then has a position, speed and heading estimate at the control rate instead of driving blind between fixes.
+Requirements: The python modules math, numpy and VehicleGeoModule. Positions are the dictionaries returned by VehicleGPSModule's GPSfetch(), rates come
+	from navio.mpu9250_better's gyroscope_data and accelerometer_data lists.
+Use: Make an object of class vehicleEKF() using the first good GPS position as the local origin. On every control loop call predict(yawRate, accel, dt).
+	Whenever GPSfetch() returns a position call updateGPS(pos). Optionally call updateHeading(headDegSign) with the magnetometer heading.
+	Read the estimate from the "x" array, or call estimate() for a dictionary like the ones VehicleGPSModule returns.
+
+	The state vector is x = [east(m), north(m), speed(m/s), heading(rad), gyroBias(rad/s)].
+	Heading follows the navigation scripts: counterclockwise from NORTH, so N=0<->+pi is WEST and N=0<->-pi is EAST.
+	All matrices are allocated once in __init__ and every predict/update step writes into them in place.
+
+	Example for a logged or simulated run, where events are (kind, values) tuples:
+		ekf = vehicleEKF(lat0, lon0)
+		for est in ekf.runEvents(events):
+			...
+
+Updates:
+- October 19, 2026. Coordinate conversions use the WGS84 tangent plane of VehicleGeoModule.
+- October 19, 2026. Created the file.
+
+Resources:
+https://en.wikipedia.org/wiki/Extended_Kalman_filter
+http://www.movable-type.co.uk/scripts/latlong.html
+https://docs.scipy.org/doc/numpy/reference/generated/numpy.dot.html #The "out" argument lets products reuse preallocated arrays
+"""
+
+import math
+import numpy as np
+import VehicleGeoModule
+
+class vehicleEKF:
+
+	def __init__(self, lat0, lon0, head0=0.0, posStd=3.0, headStd=math.pi, speedStd=1.0):
+		#Local tangent plane centered on the origin fix. Scale factors are computed once so conversions are two multiplies.
+		self.lat0 = lat0
+		self.lon0 = lon0
+		self.frame = VehicleGeoModule.enuFrame(lat0, lon0)
+
+		#Process noise spectral densities. Units per second, scaled by dt in predict().
+		self.qPos = 0.05 #m^2/s, unmodelled slip of the kinematic model
+		self.qSpeed = 0.5 #(m/s)^2/s, accelerometer noise and throttle changes
+		self.qHead = 0.002 #rad^2/s, gyro noise
+		self.qBias = 1e-6 #(rad/s)^2/s, gyro bias random walk
+		self.minPosStd = 1.0 #m, never trust a fix more than this even if hAcc says otherwise
+		self.headStd = 0.15 #rad, magnetometer heading noise (about 8.6 degrees)
+
+		# ---- Preallocated State And Work Buffers ----
+		self.x = np.zeros(5)
+		self.x[3] = head0
+		self.P = np.zeros((5,5))
+		self.P[0,0] = posStd*posStd
+		self.P[1,1] = posStd*posStd
+		self.P[2,2] = speedStd*speedStd
+		self.P[3,3] = headStd*headStd
+		self.P[4,4] = 0.01*0.01
+		self.F = np.eye(5)
+		self.Q = np.zeros((5,5))
+		self.tmp55 = np.zeros((5,5))
+		self.tmp55b = np.zeros((5,5))
+		self.K2 = np.zeros((5,2)) #Gain for the two dimensional position update
+		self.S2 = np.zeros((2,2))
+		self.Sinv2 = np.zeros((2,2))
+		self.y2 = np.zeros(2)
+		self.K1 = np.zeros(5) #Gain for scalar updates (heading)
+		self.dx = np.zeros(5)
+		# ---- End Preallocated State And Work Buffers ----
+
+		self.time = 0.0 #Seconds of predict() integrated so far
+		self.fixes = 0 #Number of GPS updates accepted
+
+	# ---- Coordinate Conversions ----
+	def toLocal(self, lat, lon):
+		"""Converts degrees to [east,north] meters about the origin fix"""
+		return self.frame.toLocal(lat, lon)
+
+	def toLatLon(self, east, north):
+		"""Converts [east,north] meters about the origin fix back to degrees"""
+		return self.frame.toLatLon(east, north)
+	# ---- End Coordinate Conversions ----
+
+	def predict(self, yawRate, accel, dt):
+		"""
+		Propagate the state dt seconds with the gyro's yaw rate (rad/s, counterclockwise positive)
+		and the accelerometer's forward acceleration (m/s^2).
+		"""
+		x = self.x
+		F = self.F
+		v = x[2]
+		psi = x[3]
+		s = math.sin(psi)
+		c = math.cos(psi)
+
+		#Jacobian of the motion model evaluated at the prior state. Only the non-identity terms change.
+		F[0,2] = -s*dt
+		F[0,3] = -v*c*dt
+		F[1,2] = c*dt
+		F[1,3] = -v*s*dt
+		F[3,4] = -dt
+
+		#Nonlinear state propagation (unicycle model with a gyro bias state)
+		x[0] = x[0] - v*s*dt
+		x[1] = x[1] + v*c*dt
+		x[2] = v + accel*dt
+		if (x[2] < 0): #The vehicle never reverses while navigating
+			x[2] = 0.0
+		x[3] = wrapPi(psi + (yawRate - x[4])*dt)
+
+		#P = F*P*F' + Q*dt
+		np.dot(F, self.P, out=self.tmp55)
+		np.dot(self.tmp55, F.T, out=self.P)
+		Q = self.Q
+		Q[0,0] = self.qPos*dt
+		Q[1,1] = self.qPos*dt
+		Q[2,2] = self.qSpeed*dt
+		Q[3,3] = self.qHead*dt
+		Q[4,4] = self.qBias*dt
+		self.P += Q
+		self.time += dt
+
+	def updateGPS(self, pos):
+		"""
+		Correct the state with a VehicleGPSModule position dictionary {'hAcc','lat','lon','hEll'}.
+		Returns the innovation distance in meters.
+		"""
+		east, north = self.toLocal(pos['lat'], pos['lon'])
+		r = max(pos['hAcc'], self.minPosStd)
+		return self.updatePosition(east, north, r*r)
+
+	def updatePosition(self, east, north, var):
+		"""Correct the state with a local [east,north] position measured with variance var (m^2)"""
+		P = self.P
+		y = self.y2
+		y[0] = east - self.x[0]
+		y[1] = north - self.x[1]
+
+		#S = H*P*H' + R. H selects [east,north] so S is the top left block of P.
+		S = self.S2
+		S[0,0] = P[0,0] + var
+		S[0,1] = P[0,1]
+		S[1,0] = P[1,0]
+		S[1,1] = P[1,1] + var
+		det = S[0,0]*S[1,1] - S[0,1]*S[1,0]
+		Si = self.Sinv2
+		Si[0,0] = S[1,1]/det
+		Si[0,1] = -S[0,1]/det
+		Si[1,0] = -S[1,0]/det
+		Si[1,1] = S[0,0]/det
+
+		#K = P*H'*S^-1 then x = x + K*y and P = P - K*H*P
+		np.dot(P[:,0:2], Si, out=self.K2)
+		np.dot(self.K2, y, out=self.dx)
+		self.x += self.dx
+		self.x[3] = wrapPi(self.x[3])
+		np.dot(self.K2, P[0:2,:], out=self.tmp55)
+		P -= self.tmp55
+		self.symmetrize()
+		self.fixes += 1
+		return math.sqrt(y[0]*y[0] + y[1]*y[1])
+
+	def updateHeading(self, headDegSign, std=None):
+		"""Correct the state with a signed magnetometer heading in degrees (counterclockwise from NORTH)"""
+		if (std == None):
+			std = self.headStd
+		P = self.P
+		y = wrapPi(headDegSign*(math.pi/180) - self.x[3])
+		S = P[3,3] + std*std
+		np.divide(P[:,3], S, out=self.K1)
+		np.multiply(self.K1, y, out=self.dx)
+		self.x += self.dx
+		self.x[3] = wrapPi(self.x[3])
+		np.multiply(self.K1[:,None], P[3,:], out=self.tmp55) #Outer product K*H*P
+		P -= self.tmp55
+		self.symmetrize()
+		return y
+
+	def symmetrize(self):
+		"""Remove round-off asymmetry from P in place"""
+		np.add(self.P, self.P.T, out=self.tmp55b)
+		np.multiply(self.tmp55b, 0.5, out=self.P)
+
+	def estimate(self):
+		"""Prepares and returns a dictionary holding the estimated lat, lon, speed (m/s), headDegSign and position standard deviation (m)"""
+		lat, lon = self.toLatLon(self.x[0], self.x[1])
+		estimate = {'lat':0, 'lon':0, 'speed':0, 'headDegSign':0, 'posStd':0}
+		estimate['lat'] = lat
+		estimate['lon'] = lon
+		estimate['speed'] = self.x[2]
+		estimate['headDegSign'] = self.x[3]*(180/math.pi)
+		estimate['posStd'] = math.sqrt(max(self.P[0,0] + self.P[1,1], 0.0))
+		return estimate
+
+	def runEvents(self, events):
+		"""
+		Runs the filter over an iterable of (kind, values) events and yields estimate() after every predict.
+		kind 'imu' has values (yawRate, accel, dt), kind 'gps' a position dictionary, and kind 'head' a headDegSign.
+		Used to test the filter against logged runs and simulated vehicles.
+		"""
+		for kind, values in events:
+			if (kind == 'imu'):
+				self.predict(values[0], values[1], values[2])
+				yield self.estimate()
+			elif (kind == 'gps'):
+				self.updateGPS(values)
+			elif (kind == 'head'):
+				self.updateHeading(values)
+
+def wrapPi(angle):
+	"""Wraps an angle in radians to -pi<->+pi"""
+	return (angle + math.pi)%(2*math.pi) - math.pi
+
+if __name__ == "__main__":
+	#Simulated vehicle: drive a 20m radius circle at 3m/s with a biased gyro, 1Hz noisy GPS and 50Hz control loop.
+	import random
+	random.seed(1)
+	lat0 = 32.881373
+	lon0 = -117.235912
+	dt = 0.02
+	speed = 3.0
+	turnRate = speed/20.0
+	gyroBias = 0.02
+	ekf = vehicleEKF(lat0, lon0)
+	east = 0.0
+	north = 0.0
+	psi = 0.0
+	sumErr = 0.0
+	n = 0
+	for k in range(int(60/dt)):
+		psi = wrapPi(psi + turnRate*dt)
+		east = east - speed*math.sin(psi)*dt
+		north = north + speed*math.cos(psi)*dt
+		ekf.predict(turnRate + gyroBias + random.gauss(0, 0.01), random.gauss(0, 0.05), dt)
+		if (k%50 == 0):
+			lat, lon = ekf.toLatLon(east + random.gauss(0, 2.0), north + random.gauss(0, 2.0))
+			ekf.updateGPS({'hAcc':2.0, 'lat':lat, 'lon':lon, 'hEll':0})
+		if (k > 1500): #Ignore the convergence period
+			dE = ekf.x[0] - east
+			dN = ekf.x[1] - north
+			sumErr += dE*dE + dN*dN
+			n += 1
+	print('position rms error %.2f m, speed %.2f m/s, gyro bias %.4f rad/s' % (math.sqrt(sumErr/n), ekf.x[2], ekf.x[4]))
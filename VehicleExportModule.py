@@ -0,0 +1,191 @@
+"""
+Robotritons in-use module for exporting the track of a run to GeoJSON or KML.
+
+Purpose: Look at where the car went on a map (geojson.io, QGIS, Google Earth) instead of reading lat/lon pairs in a spreadsheet.
+	A run log is streamed through a generator pipeline, readPoints() -> decimate() -> writeGeoJSON()/writeKML(), so memory stays constant
+	no matter how long the run is and a session's worth of runs can be exported in one go.
+Requirements: The python modules collections, json, math, os, shutil, sys, tempfile, xml.sax.saxutils, VehicleGeoModule and VehicleTelemetryModule.
+Use: export('waypointData/waypointTest.bin') writes 'waypointData/waypointTest.geojson' and returns the number of points written.
+	Pass outPath ending in '.kml' for KML, and minDistance to set the decimation in meters.
+	From the shell: python VehicleExportModule.py [-kml] [-d meters] run.bin [run.csv ...]
+
+	Logs:
+		VehicleTelemetryModule logs with VehicleNavModule.navFields (WaypointTest.py): one point per GPS message, annotated with the
+		heading, relative bearing, steer angle and esc command of that tick.
+		logging files (waypointData/waypointBasic.csv): one point per "lat,lon" warning and the "%f,%f" debug row after it, annotated with
+		the last headDegSign and initRelBearSign/bearRel rows. These logs have no time, steer or command, those are null.
+	decimate() drops points closer than minDistance meters to the last point kept. The last point of the run is always kept.
+
+	Output:
+		GeoJSON: a FeatureCollection with the track as one LineString feature followed by one Point feature per point with the annotations
+		as properties. Unknown values are null.
+		KML: a LineString placemark for the track and a folder of point placemarks with the annotations as ExtendedData. Each point's icon
+		is rotated to the heading (KML headings are clockwise, the logs' are counterclockwise from NORTH).
+	Both are written in one pass: the track goes straight to the file while the points are spooled to a temporary file and appended.
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://tools.ietf.org/html/rfc7946
+https://developers.google.com/kml/documentation/kmlreference
+"""
+
+import collections
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+from xml.sax.saxutils import escape
+
+import VehicleGeoModule
+import VehicleTelemetryModule
+
+trackPoint = collections.namedtuple('trackPoint', 'time lat lon head relBear steer command')
+annotations = ('time', 'head', 'relBear', 'steer', 'command')
+nan = float('nan')
+
+# ---- Readers ----
+def telemetryPoints(path):
+	"""Points of a VehicleNavModule.navFields telemetry log, one per GPS message"""
+	names, records = VehicleTelemetryModule.iterTelemetry(path)
+	index = dict((name, i) for i, name in enumerate(names))
+	if ('fixLat' not in index):
+		records.close()
+		raise ValueError('%s: telemetry without GPS fields (fixLat, fixLon)' % path)
+	iTime, iLat, iLon = index['time'], index['fixLat'], index['fixLon']
+	iHead, iRel, iSteer, iCommand = [index.get(name) for name in ('head', 'relBear', 'steer', 'command')]
+	for values in records:
+		if not math.isnan(values[iLat]):
+			yield trackPoint(values[iTime], values[iLat], values[iLon],
+				nan if iHead == None else values[iHead], nan if iRel == None else values[iRel],
+				nan if iSteer == None else values[iSteer], nan if iCommand == None else values[iCommand])
+
+def loggingPoints(path):
+	"""Points of a "LEVEL   ,message" logging file: the "%f,%f" row after each "lat,lon" row"""
+	head = nan
+	relBear = nan
+	expectFix = False
+	with open(path, 'r') as logFile:
+		for line in logFile:
+			tokens = [token.strip() for token in line.rstrip('\r\n').split(',')[1:]]
+			if (len(tokens) == 1 and ':' in tokens[0]):
+				tokens = [token.strip() for token in tokens[0].rsplit(':', 1)]
+			if (tokens == ['lat', 'lon']):
+				expectFix = True
+			elif (len(tokens) == 2 and tokens[0] == 'headDegSign'):
+				head = float(tokens[1])
+			elif (len(tokens) == 2 and tokens[0] in ('initRelBearSign', 'bearRel')):
+				relBear = float(tokens[1])
+			elif (expectFix and len(tokens) == 2):
+				expectFix = False
+				try:
+					lat, lon = float(tokens[0]), float(tokens[1])
+				except ValueError:
+					continue
+				yield trackPoint(nan, lat, lon, head, relBear, nan, nan)
+
+def readPoints(path):
+	"""Generator of the trackPoints of a run log, telemetry or logging file"""
+	with open(path, 'rb') as logFile:
+		magic = logFile.read(len(VehicleTelemetryModule.telemetryMagic))
+	if (magic == VehicleTelemetryModule.telemetryMagic):
+		return telemetryPoints(path)
+	return loggingPoints(path)
+# ---- End Readers ----
+
+def decimate(points, minDistance=2.0):
+	"""Keeps the points at least minDistance meters from the last point kept, and the last point"""
+	frame = None
+	skipped = None
+	for point in points:
+		if (frame == None):
+			frame = VehicleGeoModule.enuFrame(point.lat, point.lon)
+			lastE, lastN = 0.0, 0.0
+			yield point
+			continue
+		east, north = frame.toLocal(point.lat, point.lon)
+		if ((east - lastE)**2 + (north - lastN)**2 >= minDistance*minDistance):
+			lastE, lastN = east, north
+			skipped = None
+			yield point
+		else:
+			skipped = point
+	if (skipped != None):
+		yield skipped
+
+# ---- Writers ----
+def jsonValue(value):
+	return 'null' if (value == None or math.isnan(value)) else repr(float(value))
+
+def writeGeoJSON(points, out, name='track'):
+	"""Streams points to the open file out as a GeoJSON FeatureCollection. Returns the number of points"""
+	count = 0
+	spool = tempfile.TemporaryFile('w+')
+	try:
+		out.write('{"type":"FeatureCollection","features":[\n{"type":"Feature","properties":{"name":%s},"geometry":{"type":"LineString","coordinates":[' % json.dumps(name))
+		for point in points:
+			coordinates = '[%.7f,%.7f]' % (point.lon, point.lat)
+			out.write((',' if count else '') + coordinates)
+			properties = ','.join('"%s":%s' % (field, jsonValue(getattr(point, field))) for field in annotations)
+			spool.write(',\n{"type":"Feature","properties":{%s},"geometry":{"type":"Point","coordinates":%s}}' % (properties, coordinates))
+			count += 1
+		out.write(']}}')
+		spool.seek(0)
+		shutil.copyfileobj(spool, out)
+		out.write('\n]}\n')
+	finally:
+		spool.close()
+	return count
+
+def writeKML(points, out, name='track'):
+	"""Streams points to the open file out as a KML document. Returns the number of points"""
+	count = 0
+	spool = tempfile.TemporaryFile('w+')
+	try:
+		out.write('<?xml version="1.0" encoding="UTF-8"?>\n<kml xmlns="http://www.opengis.net/kml/2.2">\n<Document>\n<name>%s</name>\n' % escape(name))
+		out.write('<Placemark>\n<name>%s</name>\n<LineString>\n<tessellate>1</tessellate>\n<coordinates>\n' % escape(name))
+		for point in points:
+			coordinates = '%.7f,%.7f,0' % (point.lon, point.lat)
+			out.write(coordinates + '\n')
+			data = ''.join('<Data name="%s"><value>%s</value></Data>' % (field, '' if math.isnan(getattr(point, field)) else repr(float(getattr(point, field))))
+				for field in annotations)
+			style = '' if math.isnan(point.head) else '<Style><IconStyle><heading>%.1f</heading></IconStyle></Style>' % ((-point.head)%360)
+			spool.write('<Placemark><name>%d</name>%s<ExtendedData>%s</ExtendedData><Point><coordinates>%s</coordinates></Point></Placemark>\n' % (count, style, data, coordinates))
+			count += 1
+		out.write('</coordinates>\n</LineString>\n</Placemark>\n<Folder>\n<name>points</name>\n')
+		spool.seek(0)
+		shutil.copyfileobj(spool, out)
+		out.write('</Folder>\n</Document>\n</kml>\n')
+	finally:
+		spool.close()
+	return count
+# ---- End Writers ----
+
+def export(path, outPath=None, minDistance=2.0):
+	"""Writes the decimated track of a run log as GeoJSON, or KML when outPath ends in '.kml'. Returns the number of points"""
+	if (outPath == None):
+		outPath = os.path.splitext(path)[0] + '.geojson'
+	name = os.path.basename(path)
+	writer = writeKML if outPath.lower().endswith('.kml') else writeGeoJSON
+	with open(outPath, 'w') as out:
+		return writer(decimate(readPoints(path), minDistance), out, name)
+
+if __name__ == "__main__":
+	arguments = sys.argv[1:]
+	extension = '.geojson'
+	minDistance = 2.0
+	if ('-kml' in arguments):
+		arguments.remove('-kml')
+		extension = '.kml'
+	if ('-d' in arguments):
+		i = arguments.index('-d')
+		minDistance = float(arguments[i+1])
+		del arguments[i:i+2]
+	if not arguments:
+		sys.exit('Usage: python VehicleExportModule.py [-kml] [-d meters] run.bin [run.csv ...]')
+	for path in arguments:
+		outPath = os.path.splitext(path)[0] + extension
+		print('%s: %d points -> %s' % (path, export(path, outPath, minDistance), outPath))
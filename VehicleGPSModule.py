@@ -8,6 +8,7 @@ Use: First make an object of class U_blox(). Initialize communication by sending
 	The remaining methods control the actual handling of a message and ultimately customize the functionality of GPSfetch().
 
 Updates:
+- October 19, 2026. navio.util.check_apm() runs when a U_blox is made instead of when the module is imported.
 - May 26, 2016. Added a debug object variable "self.debug" which, when True, makes GPSfetch() print strings instead of returning values.
 	Also defined new method "fetchSpecial" to test polling the GPS for more immediate message response.	It is accesible through GPSfetch()'s optional argument.
 - May 25, 2016. Modified GPSfetch() to print nothing and instead return a valued dictionary.
@@ -21,13 +22,11 @@ http://www.binaryhexconverter.com/decimal-to-hex-converter
 
 import copy
 import Queue
-import spidev
+import navio.hal
 import math
 import struct
 import navio.util
 
-navio.util.check_apm()
-
 waiting_header = 0
 msg_class = 1
 msg_id = 2
@@ -36,10 +35,12 @@ payload = 4
 checksum = 5
 
 class U_blox_message:
-	def __init__(self, msg_class = 0, msg_id = 0, msg_length = 0, msg_payload = []):
+	def __init__(self, msg_class = 0, msg_id = 0, msg_length = 0, msg_payload = None):
 		self.msg_class = msg_class
 		self.msg_id = msg_id 
 		self.msg_length = msg_length
+		if (msg_payload == None): #A [] default would be one list shared by every U_blox object
+			msg_payload = []
 		self.msg_payload = msg_payload
 	
 	def clear(self):
@@ -51,9 +52,10 @@ class U_blox_message:
 class U_blox:
 
 	def __init__(self):
+		navio.util.check_apm() #Here instead of at import, so importing the module has no side effects
 		self.mess_queue = Queue.Queue()
 		self.curr_mess = U_blox_message()
-		self.bus = spidev.SpiDev()
+		self.bus = navio.hal.SpiDev()
 		self.bus.open(0,0)
 		self.state=0
 		self.counter1=0
@@ -0,0 +1,106 @@
+"""
+Robotritons in-use module for local tangent plane (East-North-Up) geometry.
+
+Purpose: Convert GPS fixes to meters once per fix with two multiplies, instead of evaluating radians, cos((phi+phiW)/2), sqrt and atan2
+	on a spherical model against every waypoint. The origin is fixed once per mission and the WGS84 scale factors are precomputed there,
+	which keeps conversions within centimeters over the few hundred meters a mission covers, good enough for 1m arrival radii.
+Requirements: The python module math. numpy only for the batch conversions of logs and routes.
+Use: Make an object of class enuFrame(lat0, lon0) at the mission origin (the start or the first waypoint).
+	toLocal(lat, lon) returns [east, north] meters and toLatLon(east, north) converts back. distanceBearing() and bearing() work on
+	local coordinates, so the waypoints of a mission are converted once and every fix costs one toLocal().
+	toLocalArray(lats, lons) and toLatLonArray(easts, norths) convert whole numpy arrays (logs, routes) at once.
+
+	Bearings follow the navigation scripts: degrees counterclockwise from NORTH, so N=0<->+180 is WEST and N=0<->-180 is EAST.
+
+	Example:
+		frame = enuFrame(latStart, lonStart)
+		wpE, wpN = frame.toLocal(latW, lonW)
+		east, north = frame.toLocal(pos['lat'], pos['lon'])
+		d, bearing = distanceBearing(wpE - east, wpN - north)
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://en.wikipedia.org/wiki/Local_tangent_plane_coordinates
+https://en.wikipedia.org/wiki/Geographic_coordinate_system#Length_of_a_degree
+https://en.wikipedia.org/wiki/Earth_radius#Meridional #Radii of curvature M and N
+"""
+
+import math
+
+# ---- WGS84 ----
+a = 6378137.0 #m, semi-major axis
+f = 1/298.257223563 #Flattening
+e2 = f*(2 - f) #First eccentricity squared
+# ---- End WGS84 ----
+
+degToRad = math.pi/180
+radToDeg = 180/math.pi
+
+class enuFrame:
+
+	def __init__(self, lat0, lon0):
+		self.lat0 = lat0
+		self.lon0 = lon0
+		#Radii of curvature at the origin. Meridional (north-south) M and prime vertical (east-west) N.
+		s = math.sin(lat0*degToRad)
+		w = math.sqrt(1 - e2*s*s)
+		self.radiusM = a*(1 - e2)/(w*w*w)
+		self.radiusN = a/w
+		self.mPerDegLat = self.radiusM*degToRad
+		self.mPerDegLon = self.radiusN*math.cos(lat0*degToRad)*degToRad
+
+	# ---- Single Conversions ----
+	def toLocal(self, lat, lon):
+		"""Converts degrees to [east,north] meters about the origin"""
+		return ((lon-self.lon0)*self.mPerDegLon, (lat-self.lat0)*self.mPerDegLat)
+
+	def toLatLon(self, east, north):
+		"""Converts [east,north] meters about the origin back to degrees"""
+		return (self.lat0 + north/self.mPerDegLat, self.lon0 + east/self.mPerDegLon)
+
+	def distanceTo(self, lat, lon, east, north):
+		"""Meters from local [east,north] to lat, lon"""
+		wpE, wpN = self.toLocal(lat, lon)
+		return math.hypot(wpE - east, wpN - north)
+	# ---- End Single Conversions ----
+
+	# ---- Batch Conversions ----
+	def toLocalArray(self, lats, lons):
+		"""Converts arrays of degrees to a pair of [east, north] meter arrays"""
+		import numpy as np
+		lats = np.asarray(lats, dtype=np.float64)
+		lons = np.asarray(lons, dtype=np.float64)
+		return ((lons - self.lon0)*self.mPerDegLon, (lats - self.lat0)*self.mPerDegLat)
+
+	def toLatLonArray(self, easts, norths):
+		"""Converts arrays of [east, north] meters back to a pair of [lat, lon] degree arrays"""
+		import numpy as np
+		easts = np.asarray(easts, dtype=np.float64)
+		norths = np.asarray(norths, dtype=np.float64)
+		return (self.lat0 + norths/self.mPerDegLat, self.lon0 + easts/self.mPerDegLon)
+	# ---- End Batch Conversions ----
+
+def bearing(dE, dN):
+	"""Bearing in degrees counterclockwise from NORTH of the local vector [dE,dN]"""
+	return math.atan2(-dE, dN)*radToDeg
+
+def distanceBearing(dE, dN):
+	"""Returns [distance (m), bearing (degrees counterclockwise from NORTH)] of the local vector [dE,dN]"""
+	return [math.sqrt(dE*dE + dN*dN), math.atan2(-dE, dN)*radToDeg]
+
+def bearingArray(dE, dN):
+	"""Vectorized bearing() of numpy arrays"""
+	import numpy as np
+	return np.degrees(np.arctan2(-np.asarray(dE), np.asarray(dN)))
+
+def haversine(lat1, lon1, lat2, lon2):
+	"""Great circle distance in meters on the mean sphere. Slow, only for checking the tangent plane over long distances"""
+	rE = 6371008.8
+	phi1 = lat1*degToRad
+	phi2 = lat2*degToRad
+	dPhi = phi2 - phi1
+	dLam = (lon2 - lon1)*degToRad
+	h = math.sin(dPhi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dLam/2)**2
+	return 2*rE*math.asin(math.sqrt(h))
@@ -0,0 +1,296 @@
+"""
+Robotritons in-use module for loading run logs into numpy columns.
+
+Purpose: Analyze runs in python instead of pasting waypointBasic.csv or magnetometerData.csv into Excel. Every log format of this repo
+	is parsed in one streaming pass into typed numpy arrays, and the arrays are cached next to the log as memory mappable .npy files,
+	so opening a run of hundreds of thousands of rows a second time only maps the cache.
+Requirements: The python modules array, json, os, re, sys and numpy, and VehicleTelemetryModule. Runs off the vehicle, numpy isn't needed there.
+Use: run = loadLog('waypointData/waypointBasic.csv') returns a runLog. Its channels are numpy structured arrays, one per kind of row:
+		run.names()                               #['events', 'headDegSign', 'initRelBearSign', 'lat_lon', ...]
+		run['headDegSign']['headDegSign']          #Column of one channel
+		run.select('lat_lon', 'lat')              #Some fields of a channel
+		run.between('headDegSign', 1000, 2000)     #Rows with 1000 <= line < 2000 ('time' instead of 'line' when the channel has it)
+	Or from the shell: python VehicleLogLoaderModule.py waypointData/waypointBasic.csv [channel [field ...]]
+
+	Formats:
+		logging files "LEVEL   ,message" (waypointBasic.csv, magnetometerData.csv). Messages "label,value[,value]", "label: value" and
+		"label, value" go to the channel "label". Unlabeled "value,value" rows use the names of the last all-name row (the
+		"lat,lon" warning before the GPS values) when the count matches, otherwise the channel is named after the level.
+		Every channel has a 'line' field, the row number in the file, because these logs have no time stamps.
+		Rows that aren't numbers (warnings, "None", tracebacks) go to the channel "events" with their level and text.
+		Spreadsheet CSV (compassCheckData/CompassCapt*.csv): a header row of column names, optionally under a row of group names
+		("Test 1,,,,,Test 2"), then numeric rows. Loaded as the channel "table", empty cells are nan.
+		VehicleTelemetryModule binary logs: the channel "telemetry" maps the file itself, no cache needed.
+
+	The cache is the directory '<log>.cols' holding one .npy per channel and 'meta.json' with the log's size and mtime.
+	It is rebuilt whenever the log changes. Delete it at any time.
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.scipy.org/doc/numpy/reference/generated/numpy.load.html
+https://docs.scipy.org/doc/numpy/user/basics.rec.html
+"""
+
+import array
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+import VehicleTelemetryModule
+
+cacheVersion = 1 #Bump whenever the parsed channels change
+logLevels = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+telemetryDtypes = {'b':'i1', 'B':'u1', 'h':'<i2', 'H':'<u2', 'i':'<i4', 'I':'<u4', 'q':'<i8', 'Q':'<u8', 'f':'<f4', 'd':'<f8', '?':'?'}
+identifier = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+class runLog:
+
+	def __init__(self, path, channels):
+		self.path = path
+		self.channels = channels #{name:structured array}
+
+	def names(self):
+		return sorted(self.channels)
+
+	def __getitem__(self, name):
+		return self.channels[name]
+
+	def __contains__(self, name):
+		return name in self.channels
+
+	def fields(self, name):
+		return list(self.channels[name].dtype.names)
+
+	def select(self, name, *fields):
+		"""Structured array of only some fields of a channel"""
+		return self.channels[name][list(fields)]
+
+	def between(self, name, start=None, stop=None, key=None):
+		"""Rows of a channel with start <= key < stop. key defaults to 'time' when the channel has it, otherwise 'line'"""
+		channel = self.channels[name]
+		if (key == None):
+			key = 'time' if 'time' in channel.dtype.names else 'line'
+		column = channel[key]
+		first = 0 if start == None else np.searchsorted(column, start, 'left')
+		last = len(column) if stop == None else np.searchsorted(column, stop, 'left')
+		return channel[first:last]
+
+	def summary(self):
+		lines = [self.path]
+		for name in self.names():
+			lines.append('  %-34s %8d rows  %s' % (name, len(self.channels[name]), ','.join(self.fields(name))))
+		return '\n'.join(lines)
+
+def channelName(text):
+	"""Identifier made from a label: 'magnetic bearing signed to wp' -> 'magnetic_bearing_signed_to_wp'"""
+	name = re.sub(r'\W+', '_', text).strip('_')
+	return name or 'value'
+
+def parseNumbers(tokens):
+	"""Returns the floats of tokens, or None when any token isn't a number"""
+	try:
+		return [float(token) for token in tokens]
+	except ValueError:
+		return None
+
+def uniqueNames(names):
+	"""Suffixes repeated names with _2, _3, ..."""
+	seen = {}
+	unique = []
+	for name in names:
+		seen[name] = seen.get(name, 0) + 1
+		unique.append(name if seen[name] == 1 else '%s_%d' % (name, seen[name]))
+	return unique
+
+class columnBuilder:
+	"""Accumulates the rows of one channel in typed arrays while streaming"""
+
+	def __init__(self, fields):
+		self.fields = fields
+		self.line = array.array('l')
+		self.columns = [array.array('d') for field in fields]
+
+	def append(self, line, values):
+		self.line.append(line)
+		for column, value in zip(self.columns, values):
+			column.append(value)
+
+	def build(self):
+		data = np.empty(len(self.line), dtype=[('line', '<i8')] + [(str(field), '<f8') for field in self.fields])
+		data['line'] = np.frombuffer(self.line, dtype='i%d' % self.line.itemsize) if len(self.line) else []
+		for field, column in zip(self.fields, self.columns):
+			data[str(field)] = np.frombuffer(column, dtype='f8') if len(column) else []
+		return data
+
+def parseLogging(lines):
+	"""Channels of a "LEVEL   ,message" logging file"""
+	builders = {}
+	events = []
+	header = None
+	for number, line in enumerate(lines):
+		line = line.rstrip('\r\n')
+		if not line:
+			continue
+		level, _, message = line.partition(',')
+		level = level.strip()
+		tokens = [token.strip() for token in message.split(',')]
+		named = len(tokens) >= 2 and all(identifier.match(token) for token in tokens)
+		if (len(tokens) == 1 and ':' in tokens[0]):
+			tokens = [token.strip() for token in tokens[0].rsplit(':', 1)]
+		#Leading labels, then numbers
+		k = 0
+		while (k < len(tokens) and parseNumbers(tokens[k:k+1]) == None):
+			k += 1
+		values = parseNumbers(tokens[k:]) if k < len(tokens) else None
+		if (values == None):
+			if named:
+				header = [channelName(token) for token in tokens]
+			events.append((number, level, message))
+			continue
+		if (k > 0):
+			name = channelName(' '.join(tokens[:k]))
+			fields = [name] if len(values) == 1 else ['%s_%d' % (name, i) for i in range(len(values))]
+		elif (header != None and len(header) == len(values)):
+			name = '_'.join(header)
+			fields = uniqueNames(header)
+		else:
+			name = level.lower()
+			fields = ['v%d' % i for i in range(len(values))]
+		builder = builders.get(name)
+		if (builder != None and len(builder.fields) != len(values)):
+			name = '%s_%d' % (name, len(values))
+			builder = builders.get(name)
+		if (builder == None):
+			builder = builders[name] = columnBuilder(fields)
+		builder.append(number, values)
+
+	channels = dict((name, builder.build()) for name, builder in builders.items())
+	if events:
+		width = max(len(text) for number, level, text in events)
+		channels['events'] = np.array(events, dtype=[('line', '<i8'), ('level', 'U8'), ('text', 'U%d' % max(width, 1))])
+	return channels
+
+def parseTable(lines):
+	"""Channel "table" of a spreadsheet CSV with a header row (and an optional row of group names above it)"""
+	rows = []
+	builder = None
+	for number, line in enumerate(lines):
+		cells = [cell.strip() for cell in line.rstrip('\r\n').split(',')]
+		filled = [cell for cell in cells if cell]
+		if (builder == None):
+			if not filled:
+				continue
+			if (parseNumbers(filled) == None):
+				rows.append(cells)
+				continue
+			#First numeric row: the last text row names the columns, the one before it groups them
+			header = rows[-1] if rows else ['v%d' % i for i in range(len(cells))]
+			groups = rows[-2] if len(rows) > 1 else []
+			names = []
+			group = ''
+			for i in range(len(header)):
+				if (i < len(groups) and groups[i]):
+					group = groups[i]
+				names.append(channelName(group + ' ' + header[i]) if header[i] else None)
+			columns = [i for i in range(len(names)) if names[i] != None]
+			builder = columnBuilder(uniqueNames([names[i] for i in columns]))
+		values = parseNumbers([cells[i] if i < len(cells) and cells[i] else 'nan' for i in columns])
+		if (values != None and filled):
+			builder.append(number, values)
+	if (builder == None):
+		return {}
+	return {'table':builder.build()}
+
+def mapTelemetry(path):
+	"""Channel "telemetry" of a VehicleTelemetryModule log, memory mapped in place"""
+	with open(path, 'rb') as telemetryFile:
+		head = telemetryFile.read(VehicleTelemetryModule.telemetryHeader.size)
+		magic, version, size, schemaLength = VehicleTelemetryModule.telemetryHeader.unpack(head)
+		head += telemetryFile.read(schemaLength)
+	fields, record, start = VehicleTelemetryModule.readSchema(head, path)
+	dtype = np.dtype([(str(name), telemetryDtypes[code]) for name, code in fields])
+	count = (os.path.getsize(path) - start)//dtype.itemsize
+	return {'telemetry':np.memmap(path, dtype=dtype, mode='r', offset=start, shape=(count,))}
+
+def parseLog(path):
+	"""Channels of a log file, parsed in one pass"""
+	with open(path, 'rb') as logFile:
+		magic = logFile.read(len(VehicleTelemetryModule.telemetryMagic))
+	if (magic == VehicleTelemetryModule.telemetryMagic):
+		return mapTelemetry(path)
+	with open(path, 'r') as logFile:
+		first = ''
+		for first in logFile:
+			if first.strip():
+				break
+		logFile.seek(0)
+		if (first.partition(',')[0].strip() in logLevels):
+			return parseLogging(logFile)
+		return parseTable(logFile)
+
+def cachePath(path):
+	return path + '.cols'
+
+def writeCache(path, channels, size, mtime):
+	directory = cachePath(path)
+	if not os.path.isdir(directory):
+		os.mkdir(directory)
+	files = {}
+	for name in channels:
+		files[name] = name + '.npy'
+		temporary = os.path.join(directory, files[name] + '.tmp')
+		with open(temporary, 'wb') as channelFile:
+			np.save(channelFile, channels[name])
+		os.rename(temporary, os.path.join(directory, files[name]))
+	#meta.json goes last so a cache is only valid once every channel is written
+	temporary = os.path.join(directory, 'meta.json.tmp')
+	with open(temporary, 'w') as metaFile:
+		json.dump({'version':cacheVersion, 'size':size, 'mtime':mtime, 'files':files}, metaFile)
+	os.rename(temporary, os.path.join(directory, 'meta.json'))
+
+def readCache(path, size, mtime):
+	"""Returns the memory mapped channels of an up to date cache, or None"""
+	directory = cachePath(path)
+	try:
+		with open(os.path.join(directory, 'meta.json'), 'r') as metaFile:
+			meta = json.load(metaFile)
+		if (meta['version'] != cacheVersion or meta['size'] != size or meta['mtime'] != mtime):
+			return None
+		return dict((str(name), np.load(os.path.join(directory, fileName), mmap_mode='r')) for name, fileName in meta['files'].items())
+	except (IOError, OSError, ValueError, KeyError):
+		return None
+
+def loadLog(path, useCache=True):
+	"""Returns the runLog of a log file, mapped from its cache when the cache is up to date"""
+	status = os.stat(path)
+	channels = None
+	if useCache:
+		channels = readCache(path, status.st_size, status.st_mtime)
+	if (channels == None):
+		channels = parseLog(path)
+		if (useCache and 'telemetry' not in channels):
+			try:
+				writeCache(path, channels, status.st_size, status.st_mtime)
+			except (IOError, OSError):
+				pass #Read only media, parse every time
+	return runLog(path, channels)
+
+if __name__ == "__main__":
+	if (len(sys.argv) < 2):
+		sys.exit('Usage: python VehicleLogLoaderModule.py log [channel [field ...]]')
+	run = loadLog(sys.argv[1])
+	if (len(sys.argv) == 2):
+		print(run.summary())
+	else:
+		channel = run[sys.argv[2]]
+		for field in (sys.argv[3:] or run.fields(sys.argv[2])):
+			column = channel[field]
+			if (column.dtype.kind in 'iuf' and len(column)):
+				print('%-24s n %d  min %g  mean %g  max %g' % (field, len(column), column.min(), column.mean(), column.max()))
+			else:
+				print('%-24s n %d' % (field, len(column)))
@@ -0,0 +1,112 @@
+"""
+Robotritons in-use module for writing log files off the control thread.
+
+Purpose: logging.basicConfig(filename=...) writes the file inside every log call, so an SD card stall freezes the control loop and the
+	steering with it. Here the control thread only appends a formatted line to a bounded queue and a writer thread batches the lines
+	to disk. When the queue is full new lines are dropped and counted instead of blocking, so disk trouble never reaches the actuators.
+Requirements: The python modules atexit, collections, logging, threading and time.
+Use: Make an object of class logWriter(path) and attach a queueHandler(writer) to a logger in place of the basicConfig file handler.
+		logWriter = VehicleLogWriterModule.logWriter('waypointData/waypointBasic.csv')
+		handler_file = VehicleLogWriterModule.queueHandler(logWriter)
+		handler_file.setFormatter(logging.Formatter('%(levelname)-8s,%(message)s'))
+		log_root.addHandler(handler_file)
+	or put(text) lines directly. close() drains the queue and closes the file, it is also registered with atexit.
+	The counters written, dropped and late (lines that reached the file more than lateAfter seconds after put()), and maxLatency
+	tell whether the disk kept up. stats() returns them as a dictionary.
+
+	The queue is a collections.deque. append() and popleft() are atomic, so the control thread takes no lock and never waits
+	for the writer. The writer wakes every "interval" seconds and writes at most "batch" lines per write().
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/collections.html#collections.deque
+https://docs.python.org/3/library/logging.handlers.html#queuehandler
+"""
+
+import atexit
+import collections
+import logging
+import threading
+import time
+
+class logWriter:
+
+	def __init__(self, path, mode='w', maxRecords=4096, batch=256, interval=0.1, lateAfter=0.5):
+		self.path = path
+		self.maxRecords = maxRecords
+		self.batch = batch
+		self.interval = interval #Seconds the writer sleeps when the queue is empty
+		self.lateAfter = lateAfter
+		self.queue = collections.deque()
+		self.queued = 0
+		self.written = 0
+		self.dropped = 0
+		self.late = 0
+		self.maxLatency = 0.0
+		self.file = open(path, mode)
+		self.running = True
+		self.thread = threading.Thread(target = self.__writerLoop)
+		self.thread.daemon = True
+		self.thread.start()
+		atexit.register(self.close)
+
+	def put(self, text):
+		"""Queues one line (without the newline). Returns False when the queue was full and the line was dropped"""
+		if (len(self.queue) >= self.maxRecords):
+			self.dropped += 1
+			return False
+		self.queue.append((time.time(), text))
+		self.queued += 1
+		return True
+
+	def __writeBatch(self):
+		"""Writes up to "batch" queued lines in one write(). Returns the number written"""
+		lines = []
+		now = time.time()
+		while (len(lines) < self.batch and self.queue):
+			queuedTime, text = self.queue.popleft()
+			latency = now - queuedTime
+			if (latency > self.lateAfter):
+				self.late += 1
+			if (latency > self.maxLatency):
+				self.maxLatency = latency
+			lines.append(text)
+		if lines:
+			self.file.write('\n'.join(lines) + '\n')
+			self.file.flush()
+			self.written += len(lines)
+		return len(lines)
+
+	def __writerLoop(self):
+		while (self.running):
+			if (self.__writeBatch() < self.batch):
+				time.sleep(self.interval)
+
+	def close(self):
+		"""Stops the writer thread, writes what is still queued and closes the file"""
+		if not self.running:
+			return
+		self.running = False
+		self.thread.join()
+		while self.__writeBatch():
+			pass
+		self.file.close()
+
+	def stats(self):
+		return {'queued':self.queued, 'written':self.written, 'dropped':self.dropped, 'late':self.late,
+			'maxLatency':self.maxLatency, 'backlog':len(self.queue)}
+
+class queueHandler(logging.Handler):
+	"""logging handler that formats on the calling thread and hands the line to a logWriter"""
+
+	def __init__(self, writer, level=logging.NOTSET):
+		logging.Handler.__init__(self, level)
+		self.writer = writer
+
+	def emit(self, record):
+		try:
+			self.writer.put(self.format(record))
+		except Exception:
+			self.handleError(record)
@@ -0,0 +1,281 @@
+"""
+Robotritons in-use module for multi-waypoint missions.
+
+Purpose: Keep routes in files instead of latW/lonW literals. Routes are read from CSV, GPX or KML, validated, and compiled into
+	a binary cache of legs next to the route file so the navigation scripts load them in microseconds at boot.
+Requirements: The python modules math, os, struct, collections, xml.etree.ElementTree and VehicleGeoModule.
+Use: route = loadRoute('waypointData/mission.csv') returns a vehicleRoute. The first call (or any call after the route file changed)
+	parses and compiles the file and writes 'waypointData/mission.csv.route'. Later calls only unpack that cache.
+	Make a missionSequencer(route) and call update(lat, lon) with every GPS position. It advances to the next leg once the vehicle
+	is inside the leg's arrival radius or has passed the end of the leg, and returns True when it advanced.
+		seq = missionSequencer(loadRoute('waypointData/mission.csv'))
+		nav.setWaypoint(seq.leg.lat, seq.leg.lon)
+		...
+		if seq.update(pos['lat'], pos['lon']):
+			nav.setWaypoint(seq.leg.lat, seq.leg.lon)
+
+	Route files:
+		CSV: one waypoint per line "lat,lon[,radius[,name]]" in degrees and meters. Blank lines, lines starting with '#' and a header line are skipped.
+		GPX: <rtept>, then <wpt>, then <trkpt> elements, in file order. A <name> child names the waypoint.
+		KML: the "lon,lat[,alt]" tuples of every <coordinates> element, in file order.
+	Waypoints without a radius get defaultRadius.
+
+	Each compiled leg holds the waypoint (lat, lon), its local [east,north] meters about the first waypoint, the bearing of the leg
+	(degrees counterclockwise from NORTH like the navigation scripts), the leg length and the arrival radius in meters.
+	Leg 0 ends at the first waypoint and starts wherever the vehicle is, so its bearing and length are 0.
+
+Updates:
+- October 19, 2026. Local coordinates use the WGS84 tangent plane of VehicleGeoModule.
+- October 19, 2026. Created the file.
+
+Resources:
+https://www.topografix.com/GPX/1/1/
+https://developers.google.com/kml/documentation/kmlreference#coordinates
+https://docs.python.org/2.7/library/struct.html
+"""
+
+import collections
+import math
+import os
+import struct
+import xml.etree.ElementTree as ElementTree
+
+import VehicleGeoModule
+
+defaultRadius = 3.0 #m
+maxLegLength = 5000.0 #m, longer legs are almost certainly a typo in the route file
+
+# ---- Binary Route Cache ----
+#Header: magic, version, leg count, source file size and mtime, origin lat/lon. Then one record per leg.
+cacheMagic = b'AVCR'
+cacheVersion = 2 #Bump whenever the compiled values change
+cacheHeader = struct.Struct('<4sHHqddd')
+cacheLeg = struct.Struct('<7d24s')
+# ---- End Binary Route Cache ----
+
+routeLeg = collections.namedtuple('routeLeg', 'lat lon east north bearing length radius name')
+
+class vehicleRoute:
+	"""Compiled legs of a route about the origin (first waypoint)"""
+
+	def __init__(self, lat0, lon0, legs):
+		self.lat0 = lat0
+		self.lon0 = lon0
+		self.frame = VehicleGeoModule.enuFrame(lat0, lon0)
+		self.legs = legs
+
+	def __len__(self):
+		return len(self.legs)
+
+	def __getitem__(self, i):
+		return self.legs[i]
+
+	def toLocal(self, lat, lon):
+		"""Converts degrees to [east,north] meters about the origin"""
+		return self.frame.toLocal(lat, lon)
+
+	def length(self):
+		return sum(leg.length for leg in self.legs)
+
+# ---- Route File Readers ----
+def readCSV(path):
+	waypoints = []
+	header = True #Only the first line that isn't blank or a comment may be a header
+	with open(path, 'r') as routeFile:
+		for lineNumber, line in enumerate(routeFile):
+			line = line.strip()
+			if (not line or line.startswith('#')):
+				continue
+			fields = [field.strip() for field in line.split(',')]
+			try:
+				lat = float(fields[0])
+				lon = float(fields[1])
+			except (ValueError, IndexError):
+				if header:
+					header = False
+					continue
+				raise ValueError('%s line %d: expected "lat,lon[,radius[,name]]", got %r' % (path, lineNumber + 1, line))
+			header = False
+			radius = float(fields[2]) if (len(fields) > 2 and fields[2]) else None
+			name = fields[3] if len(fields) > 3 else ''
+			waypoints.append({'lat':lat, 'lon':lon, 'radius':radius, 'name':name})
+	return waypoints
+
+def localName(element):
+	"""Tag of an element without its xml namespace"""
+	return element.tag.rsplit('}', 1)[-1]
+
+def readGPX(path):
+	root = ElementTree.parse(path).getroot()
+	for tag in ('rtept', 'wpt', 'trkpt'):
+		points = [element for element in root.iter() if localName(element) == tag]
+		if points:
+			break
+	waypoints = []
+	for point in points:
+		name = ''
+		for child in point:
+			if (localName(child) == 'name' and child.text):
+				name = child.text.strip()
+		waypoints.append({'lat':float(point.get('lat')), 'lon':float(point.get('lon')), 'radius':None, 'name':name})
+	return waypoints
+
+def readKML(path):
+	root = ElementTree.parse(path).getroot()
+	waypoints = []
+	for element in root.iter():
+		if (localName(element) != 'coordinates' or not element.text):
+			continue
+		for coordinate in element.text.split():
+			fields = coordinate.split(',')
+			waypoints.append({'lat':float(fields[1]), 'lon':float(fields[0]), 'radius':None, 'name':''})
+	return waypoints
+
+readers = {'.csv':readCSV, '.txt':readCSV, '.gpx':readGPX, '.kml':readKML}
+
+def readRoute(path):
+	"""Returns the list of waypoint dictionaries {'lat','lon','radius','name'} in a CSV, GPX or KML file"""
+	extension = os.path.splitext(path)[1].lower()
+	if (extension not in readers):
+		raise ValueError('%s: unknown route format, use one of %s' % (path, ', '.join(sorted(readers))))
+	waypoints = readers[extension](path)
+	for waypoint in waypoints:
+		if (waypoint['radius'] == None):
+			waypoint['radius'] = defaultRadius
+	return waypoints
+# ---- End Route File Readers ----
+
+def validate(waypoints, source='route'):
+	"""Raises ValueError describing the first unusable waypoint"""
+	if not waypoints:
+		raise ValueError('%s: no waypoints' % source)
+	previous = None
+	for i, waypoint in enumerate(waypoints):
+		lat = waypoint['lat']
+		lon = waypoint['lon']
+		if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+			raise ValueError('%s waypoint %d: lat %f lon %f out of range (lat,lon order?)' % (source, i, lat, lon))
+		if not (waypoint['radius'] > 0):
+			raise ValueError('%s waypoint %d: arrival radius must be positive, not %r' % (source, i, waypoint['radius']))
+		if (previous != None):
+			dE, dN = VehicleGeoModule.enuFrame(previous['lat'], previous['lon']).toLocal(lat, lon)
+			d = math.sqrt(dE*dE + dN*dN)
+			if (d < 0.01):
+				raise ValueError('%s waypoint %d: repeats waypoint %d' % (source, i, i - 1))
+			if (d > maxLegLength):
+				raise ValueError('%s waypoint %d: %.0fm from the previous waypoint, more than %.0fm' % (source, i, d, maxLegLength))
+		previous = waypoint
+
+def compileRoute(waypoints):
+	"""Returns the vehicleRoute of validated waypoints, with the first waypoint as the origin"""
+	lat0 = waypoints[0]['lat']
+	lon0 = waypoints[0]['lon']
+	route = vehicleRoute(lat0, lon0, [])
+	lastE = None
+	lastN = None
+	for waypoint in waypoints:
+		east, north = route.toLocal(waypoint['lat'], waypoint['lon'])
+		if (lastE == None):
+			bearing = 0.0
+			length = 0.0
+		else:
+			length, bearing = VehicleGeoModule.distanceBearing(east - lastE, north - lastN)
+		route.legs.append(routeLeg(waypoint['lat'], waypoint['lon'], east, north, bearing, length, waypoint['radius'], waypoint['name'][:24]))
+		lastE = east
+		lastN = north
+	return route
+
+# ---- Cache Files ----
+def cachePath(path):
+	return path + '.route'
+
+def writeCache(path, route, size, mtime):
+	chunks = [cacheHeader.pack(cacheMagic, cacheVersion, len(route.legs), size, mtime, route.lat0, route.lon0)]
+	for leg in route.legs:
+		chunks.append(cacheLeg.pack(leg.lat, leg.lon, leg.east, leg.north, leg.bearing, leg.length, leg.radius, leg.name.encode('utf-8')[:24]))
+	temporary = path + '.tmp'
+	with open(temporary, 'wb') as cacheFile:
+		cacheFile.write(b''.join(chunks))
+	os.rename(temporary, path) #Never leave a half written cache behind
+
+def readCache(path, size=None, mtime=None):
+	"""Returns the vehicleRoute in a cache file, or None when it is missing, stale or from another version"""
+	try:
+		with open(path, 'rb') as cacheFile:
+			data = cacheFile.read()
+	except IOError:
+		return None
+	if (len(data) < cacheHeader.size):
+		return None
+	magic, version, count, cacheSize, cacheMtime, lat0, lon0 = cacheHeader.unpack_from(data, 0)
+	if (magic != cacheMagic or version != cacheVersion or len(data) != cacheHeader.size + count*cacheLeg.size):
+		return None
+	if (size != None and (cacheSize != size or cacheMtime != mtime)):
+		return None
+	legs = []
+	for offset in range(cacheHeader.size, len(data), cacheLeg.size):
+		values = cacheLeg.unpack_from(data, offset)
+		legs.append(routeLeg(*(values[:7] + (values[7].rstrip(b'\0').decode('utf-8'),))))
+	return vehicleRoute(lat0, lon0, legs)
+
+def loadRoute(path, useCache=True):
+	"""Returns the vehicleRoute of a route file, from its binary cache when the cache is up to date"""
+	status = os.stat(path)
+	if useCache:
+		route = readCache(cachePath(path), status.st_size, status.st_mtime)
+		if (route != None):
+			return route
+	waypoints = readRoute(path)
+	validate(waypoints, path)
+	route = compileRoute(waypoints)
+	if useCache:
+		try:
+			writeCache(cachePath(path), route, status.st_size, status.st_mtime)
+		except (IOError, OSError):
+			pass #Read only media, compile again next time
+	return route
+# ---- End Cache Files ----
+
+class missionSequencer:
+	"""Walks the legs of a vehicleRoute as GPS positions come in"""
+
+	def __init__(self, route, start=0):
+		self.route = route
+		self.index = start
+		self.done = False
+		self.leg = route[start]
+
+	def distance(self, east, north):
+		"""Meters from local [east,north] to the end of the current leg"""
+		return math.hypot(self.leg.east - east, self.leg.north - north)
+
+	def arrived(self, east, north):
+		"""Inside the arrival radius, or past the line through the waypoint perpendicular to the leg"""
+		leg = self.leg
+		dE = leg.east - east
+		dN = leg.north - north
+		if (dE*dE + dN*dN <= leg.radius*leg.radius):
+			return True
+		if (leg.length > 0):
+			#Remaining distance along the leg direction. Negative means the waypoint is behind the vehicle.
+			psi = leg.bearing*(math.pi/180)
+			return (-dE*math.sin(psi) + dN*math.cos(psi)) < 0
+		return False
+
+	def advance(self):
+		if (self.index + 1 < len(self.route)):
+			self.index += 1
+			self.leg = self.route[self.index]
+		else:
+			self.done = True
+
+	def update(self, lat, lon):
+		"""Advances past every leg already reached from lat, lon. Returns True when the current leg changed or the mission finished"""
+		if self.done:
+			return False
+		east, north = self.route.toLocal(lat, lon)
+		changed = False
+		while (not self.done and self.arrived(east, north)):
+			self.advance()
+			changed = True
+		return changed
@@ -0,0 +1,180 @@
+"""
+Robotritons in-use module for statistical evaluation of the navigation controller in simulation.
+
+Purpose: Run thousands of simulated single waypoint missions with randomized GPS noise, magnetometer bias, start heading and servo latency
+	on every CPU core, and summarize the arrival rate, time-to-waypoint and path length distributions of each controller variant.
+Requirements: The python modules math, random, time, multiprocessing, traceback, VehicleSimModule, VehicleNavModule, VehiclePWMModule,
+	VehicleGPSModule and navio.mpu9250_better.
+Use: Call evaluate(n, **tuning) where tuning holds vehicleNav() keyword arguments (threshold, steerMax, holdTime, ...).
+	It returns the summarize() dictionary. compare() runs several variants over the SAME randomized missions so their differences
+	come from the controller and not from the draw.
+
+	Example:
+		baseline = evaluate(2000)
+		for name, stats in compare(2000, {'hold0.25':{'holdTime':0.25}, 'thresh4':{'threshold':4}}):
+			print(name, stats['arrivalRate'], stats['time']['p50'])
+
+	Every mission runs in its own vehicleSim, which patches the time module of the worker process, so missions never share a process
+	at the same time. Workers are separate processes from multiprocessing.Pool, one per core by default.
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/multiprocessing.html#module-multiprocessing.pool
+"""
+
+import math
+import multiprocessing
+import random
+import time
+import traceback
+
+import VehicleSimModule
+
+#Default mission: EBU 1 Loading Dock street south end, from about 60m away
+missionStart = (32.881373, -117.235312)
+missionWaypoint = (32.881773, -117.235712)
+
+#Ranges the missions are drawn from
+defaultRanges = {
+	'gpsNoise':(0.5, 3.0), #m, standard deviation of each fix
+	'magBias':(0.0, 4.0), #uT, magnitude of the residual hard iron offset after calibration
+	'head0':(-180.0, 180.0), #Degrees, start heading
+	'servoLatency':(0.02, 0.15), #Seconds
+}
+
+def randomMissions(n, seed=0, ranges=None, start=missionStart, waypoint=missionWaypoint, timeLimit=180.0):
+	"""Returns a list of n mission dictionaries drawn reproducibly from seed"""
+	if (ranges == None):
+		ranges = defaultRanges
+	rng = random.Random(seed)
+	missions = []
+	for i in range(n):
+		biasAngle = rng.uniform(-math.pi, math.pi)
+		biasSize = rng.uniform(*ranges['magBias'])
+		missions.append({
+			'id':i,
+			'seed':rng.randint(0, 2**31 - 1),
+			'start':start,
+			'waypoint':waypoint,
+			'timeLimit':timeLimit,
+			'gpsNoise':rng.uniform(*ranges['gpsNoise']),
+			'magBias':(biasSize*math.cos(biasAngle), biasSize*math.sin(biasAngle)),
+			'head0':rng.uniform(*ranges['head0']),
+			'servoLatency':rng.uniform(*ranges['servoLatency']),
+			'tuning':{},
+		})
+	return missions
+
+def runMission(mission):
+	"""Simulates one mission dictionary. Runs inside the pool's worker processes so it must stay a module level function"""
+	result = {'id':mission['id'], 'arrived':False, 'time':None, 'path':None, 'miss':None, 'error':None}
+	sim = VehicleSimModule.vehicleSim(mission['start'][0], mission['start'][1], head0=mission['head0'], seed=mission['seed'],
+		gpsNoise=mission['gpsNoise'], magBias=mission['magBias'], servoLatency=mission['servoLatency'], timeLimit=mission['timeLimit'])
+	sim.start()
+	try:
+		import VehiclePWMModule
+		import VehicleNavModule
+		from VehicleGPSModule import U_blox
+		from navio.mpu9250_better import MPU9250
+		VehiclePWMModule.vehiclePWM.PreviousSpeed = 0 #Class attribute, would leak between missions in the same worker
+		esc = VehiclePWMModule.vehiclePWM("esc")
+		servo = VehiclePWMModule.vehiclePWM("servo")
+		ubl = U_blox()
+		imu = MPU9250()
+		imu.initialize()
+		ubl.enable_posllh()
+		nav = VehicleNavModule.vehicleNav(esc, servo, ubl, imu, mission['waypoint'][0], mission['waypoint'][1], **mission['tuning'])
+		startTime = sim.time()
+		startPath = sim.distance
+		nav.run()
+		result['arrived'] = True
+		result['time'] = sim.time() - startTime
+		result['path'] = sim.distance - startPath
+	except VehicleSimModule.SimTimeLimit:
+		pass
+	except Exception:
+		result['error'] = traceback.format_exc()
+	finally:
+		sim.stop()
+	result['miss'] = sim.distanceTo(mission['waypoint'][0], mission['waypoint'][1])
+	return result
+
+def percentiles(values):
+	"""Returns min, p10, p50, p90, max and mean of a list of numbers, or None for an empty list"""
+	if not values:
+		return None
+	values = sorted(values)
+	last = len(values) - 1
+	stats = {'mean':sum(values)/float(len(values)), 'min':values[0], 'max':values[-1]}
+	for p in (10, 50, 90):
+		stats['p%d' % p] = values[int(round(last*p/100.0))]
+	return stats
+
+def summarize(results):
+	"""Arrival rate and the distributions of time-to-waypoint, path length (arrived missions) and final miss distance (all missions)"""
+	arrived = [r for r in results if r['arrived']]
+	errors = [r for r in results if r['error'] != None]
+	return {
+		'missions':len(results),
+		'arrivalRate':len(arrived)/float(max(len(results), 1)),
+		'errors':len(errors),
+		'time':percentiles([r['time'] for r in arrived]),
+		'path':percentiles([r['path'] for r in arrived]),
+		'miss':percentiles([r['miss'] for r in results if r['miss'] != None]),
+	}
+
+def runMissions(missions, processes=None, chunksize=8):
+	"""Runs the missions on a pool of worker processes (one per core by default) and returns their results in mission order"""
+	pool = multiprocessing.Pool(processes)
+	try:
+		results = list(pool.imap_unordered(runMission, missions, chunksize))
+	finally:
+		pool.close()
+		pool.join()
+	results.sort(key=lambda r: r['id'])
+	return results
+
+def evaluate(n, seed=0, processes=None, ranges=None, **tuning):
+	"""Simulates n random missions with the vehicleNav tuning keyword arguments and returns summarize() of the results"""
+	missions = randomMissions(n, seed, ranges)
+	for mission in missions:
+		mission['tuning'] = tuning
+	return summarize(runMissions(missions, processes))
+
+def compare(n, variants, seed=0, processes=None, ranges=None):
+	"""Runs every {name:tuning} variant over the same n missions. Returns a list of (name, summarize()) sorted by name"""
+	missions = []
+	names = sorted(variants)
+	for name in names:
+		for mission in randomMissions(n, seed, ranges):
+			mission['tuning'] = variants[name]
+			mission['variant'] = name
+			mission['id'] = len(missions)
+			missions.append(mission)
+	results = runMissions(missions, processes)
+	return [(name, summarize([r for r, m in zip(results, missions) if m['variant'] == name])) for name in names]
+
+if __name__ == "__main__":
+	import sys
+	import VehiclePIDModule
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	variants = {
+		'baseline':{},
+		'threshold4':{'threshold':4},
+		'hold0.25':{'holdTime':0.25},
+		'firstBearing':{'updateBearing':False},
+		'pid':{'steerPID':VehiclePIDModule.vehiclePID(0.6, 0.02, 0.05, -35, 35)},
+		'pidRate':{'steerPID':VehiclePIDModule.vehiclePID(1.0, 0.0, 0.0, -90, 90), 'ratePID':VehiclePIDModule.vehiclePID(0.3, 0.2, 0.0, -35, 35)},
+	}
+	wallStart = time.time()
+	comparison = compare(n, variants)
+	print('%d missions per variant on %d cores in %.1f s' % (n, multiprocessing.cpu_count(), time.time() - wallStart))
+	for name, stats in comparison:
+		line = '%-14s arrived %5.1f%%' % (name, 100*stats['arrivalRate'])
+		if (stats['time'] != None):
+			line += '  time p10/p50/p90 %5.1f/%5.1f/%5.1f s  path p50 %5.1f m' % (stats['time']['p10'], stats['time']['p50'], stats['time']['p90'], stats['path']['p50'])
+		if (stats['errors']):
+			line += '  errors %d' % stats['errors']
+		print(line)
@@ -0,0 +1,229 @@
+"""
+Robotritons in-use module for single waypoint navigation using the magnetometer and GPS.
+
+Purpose: Hold the navigation logic of WaypointTest.py (bearing to the waypoint, magnetometer heading, continuous steering and
+	the approach/speed/timeout rules) in one place, so the same controller drives the real vehicle, the simulator and the Monte Carlo harness.
+Requirements: The python modules math, time and VehicleGeoModule. The esc and servo are VehiclePWMModule.vehiclePWM objects, ubl a VehicleGPSModule.U_blox and
+	imu a navio.mpu9250_better.MPU9250, already initialized, with the Ublox publishing NAV-POSLLH.
+Use: Make an object of class vehicleNav() with the esc, servo, ubl, imu objects and the waypoint. Call tick() once per control loop until it
+	returns True at the waypoint, or call run() to loop until arrival. The tuning of WaypointTest.py is the default and every threshold
+	is a constructor argument so controller variants can be compared.
+
+	Bearing and heading are counterclockwise from NORTH, so N=0<->+180 is WEST and N=0<->-180 is EAST. A positive relative bearing
+	means the waypoint is counterclockwise of the heading and the vehicle steers LEFT.
+
+	record(loopTime) returns the values of navFields for a VehicleTelemetryModule log: the raw magnetometer, gyro and GPS inputs of the
+	tick and what the controller made of them, so VehicleReplayModule can feed the inputs through other tuning offline. It also records
+	the target of the tick: the route leg (attribute leg, set by whoever sequences the waypoints), the waypoint, arriveDist and updateBearing.
+
+Updates:
+- October 19, 2026. navFields record the leg, waypoint, arriveDist and updateBearing of each tick, so multi leg runs replay leg by leg.
+- October 19, 2026. record() and navFields for telemetry logs that VehicleReplayModule can replay. WaypointTest.py now runs on this class.
+- October 19, 2026. Optional speedPlanner from VehicleSpeedModule slows the approach to the waypoint.
+- October 19, 2026. Optional PID steering (steerPID) and yaw rate loop (ratePID) from VehiclePIDModule.
+- October 19, 2026. Bearing and distance come from the WGS84 tangent plane of VehicleGeoModule instead of the spherical equirectangular model.
+- October 19, 2026. Created the file from the navigation loop of WaypointTest.py.
+
+Resources:
+http://www.movable-type.co.uk/scripts/latlong.html
+"""
+
+import math
+import time
+
+import VehicleGeoModule
+
+#Telemetry record of one tick, see record(). NaN marks inputs that weren't there (no GPS message, no bearing yet).
+#The last five fields are the target the tick steered to.
+navFields = [('time','d'), ('magX','f'), ('magY','f'), ('gyroZ','f'), ('fixLat','d'), ('fixLon','d'), ('hAcc','f'),
+	('head','f'), ('bearing','f'), ('relBear','f'), ('steer','f'), ('command','f'), ('timeout','i'), ('d','f'),
+	('leg','H'), ('latW','d'), ('lonW','d'), ('arriveDist','f'), ('updateBearing','?')]
+nan = float('nan')
+
+class vehicleNav:
+
+	def __init__(self, esc, servo, ubl, imu, latW, lonW, magMeans=None, declination=11.7, threshold=8, steerMax=35, holdTime=0.5, arriveDist=0.005, speed=1, gpsTimeout=150, minAcc=10, updateBearing=True, steerPID=None, ratePID=None, speedPlanner=None):
+		self.esc = esc
+		self.servo = servo
+		self.ubl = ubl
+		self.imu = imu
+		self.setWaypoint(latW, lonW)
+		if (magMeans == None):
+			magMeans = {'x':0,'y':0}
+		self.magMeans = magMeans
+
+		# ---- Controller Tuning ----
+		self.declination = declination #Degrees added to the magnetometer heading (SD=11.7, boulder=8.2, avg = 10)
+		self.threshold = threshold #Degrees of relative bearing ignored as noise
+		self.steerMax = steerMax #Steer angle held while the wheels need to turn further
+		self.holdTime = holdTime #Seconds to hold a steer angle before recomputing it
+		self.arriveDist = arriveDist #Kilometers from the waypoint that count as arrived
+		self.speed = speed #Argument of esc.accel() while driving
+		self.gpsTimeout = gpsTimeout #Loops without a GPS position before stopping
+		self.minAcc = minAcc #Largest usable GPS horizontal accuracy in meters
+		self.updateBearing = updateBearing #False steers towards the first bearing only, like WaypointTest.py
+		#Optional VehiclePIDModule.vehiclePID controllers replacing the threshold steering. steerPID alone maps relative bearing to steer angle.
+		#With ratePID too, steerPID outputs a yaw rate (deg/s) and ratePID steers the gyro's yaw rate onto it.
+		self.steerPID = steerPID
+		self.ratePID = ratePID
+		for pid in (steerPID, ratePID):
+			if (pid != None):
+				pid.reset()
+		#Optional VehicleSpeedModule.speedPlanner of a one leg route ending at the waypoint, replacing the constant speed
+		self.speedPlanner = speedPlanner
+		# ---- End Controller Tuning ----
+
+		self.leg = 0 #Route leg of the waypoint, only recorded. VehicleCommandModule sets it when a mission moves to the next leg
+		self.target = None #[leg, latW, lonW, arriveDist] of the last tick, the waypoint may change between the tick and record()
+		self.fix = None #Last GPSfetch() message, None on ticks without one
+		self.pos = None #Last [lat,lon,magBearWPSign,d] from gpsUpdate()
+		self.bearing = None #Bearing to the waypoint used for steering
+		self.head = 0.0
+		self.relBear = 0.0
+		self.steerAngle = 0
+		self.steerSign = 0
+		self.steer = 0 #Last commanded steer angle
+		self.targetTime = 0
+		self.timeout = 0
+		self.loops = 0
+		self.arrived = False
+		self.command = speed #Last esc.accel() argument
+
+	def setWaypoint(self, latW, lonW):
+		self.latW = latW
+		self.lonW = lonW
+		self.frame = VehicleGeoModule.enuFrame(latW, lonW) #Tangent plane at the waypoint, so the vehicle's local position points away from it
+
+	# ---- GPS ----
+	def bearingTo(self, lat, lon):
+		"""Returns [magBearWPSign, d] from lat, lon to the waypoint. d is in kilometers"""
+		east, north = self.frame.toLocal(lat, lon)
+		d, magBearWPSign = VehicleGeoModule.distanceBearing(-east, -north)
+		return [magBearWPSign, d/1000.0]
+
+	def gpsUpdate(self):
+		"""Returns [lat,lon,magBearWPSign,d] when the GPS has a new accurate position, otherwise None"""
+		pos = self.ubl.GPSfetch()
+		self.fix = pos
+		if (pos != None and pos['hAcc'] <= self.minAcc):
+			return [pos['lat'], pos['lon']] + self.bearingTo(pos['lat'], pos['lon'])
+		return None
+	# ---- End GPS ----
+
+	# ---- IMU ----
+	def magUpdate(self):
+		"""Returns the heading in degrees counterclockwise from NORTH, see updateMag() of WaypointTest.py"""
+		self.imu.read_mag()
+		yCtrd = self.imu.magnetometer_data[1]-self.magMeans['y']
+		xCtrd = self.imu.magnetometer_data[0]-self.magMeans['x']
+		return math.atan2(yCtrd,xCtrd)*(180/math.pi) + self.declination
+	# ---- End IMU ----
+
+	def relativeBearing(self, bearing, head):
+		"""Signed angle from the heading to the bearing, -180<->+180 with counterclockwise (LEFT) positive"""
+		circleAlign = (bearing - head)%360
+		if (circleAlign > 180):
+			return circleAlign - 360
+		return circleAlign
+
+	def steerUpdate(self, relBear):
+		"""
+		Continuous steering: steer proportionally to the relative bearing, but while the angle is growing hold full lock
+		for holdTime seconds so the wheels actually move. Returns the commanded steer angle.
+		"""
+		lastAngle = self.steerAngle
+		if (abs(relBear) > self.threshold):
+			if (relBear > 0): #If waypoint is counterclockwise then turn LEFT
+				self.steerSign = self.steerMax
+			else: #waypoint is clockwise turn RIGHT
+				self.steerSign = -self.steerMax
+			self.steerAngle = relBear*self.steerMax/180.0
+		else:
+			self.steerAngle = 0
+
+		if (abs(self.steerAngle) - abs(lastAngle) < 0): #Then lastAngle is bigger and we want to steer smaller
+			compSteer = 0
+		else:
+			compSteer = self.steerSign
+
+		if (time.time() < self.targetTime):
+			self.servo.steer(compSteer)
+			return compSteer
+		self.servo.steer(self.steerAngle)
+		self.targetTime = time.time() + self.holdTime
+		return self.steerAngle
+
+	def pidSteerUpdate(self, relBear):
+		"""PID steering of the relative bearing, through the yaw rate loop when ratePID is set. Returns the commanded steer angle"""
+		command = self.steerPID.update(relBear)
+		if (self.ratePID != None):
+			self.imu.read_gyro()
+			yawRate = self.imu.gyroscope_data[2]*(180/math.pi) #deg/s, counterclockwise positive
+			command = self.ratePID.update(command - yawRate)
+		self.steerAngle = command
+		self.servo.steer(command)
+		return command
+
+	def speedUpdate(self, curPos):
+		"""Drive while the waypoint is far and the GPS is alive. Returns True at the waypoint"""
+		if (curPos != None):
+			self.timeout = 0 #Reset GPS timeout since GPS received a usable message
+			if (curPos[3] <= self.arriveDist):
+				self.esc.stop()
+				self.esc.rest()
+				return True
+			if (self.speedPlanner != None):
+				self.command = self.speedPlanner.throttle(0, curPos[3]*1000)
+			else:
+				self.command = self.speed
+			self.esc.accel(self.command)
+		elif (self.timeout < self.gpsTimeout): #Otherwise check if GPS hasn't timed out, then GO
+			self.esc.accel(self.command)
+			self.timeout += 1
+		else: #But when GPS times out, STOP
+			self.esc.stop()
+			self.esc.rest()
+		return False
+
+	def tick(self):
+		"""One pass of the navigation loop. Returns True once the vehicle is at the waypoint"""
+		self.loops += 1
+		self.target = [self.leg, self.latW, self.lonW, self.arriveDist]
+		curPos = self.gpsUpdate()
+		self.head = self.magUpdate()
+		if (curPos != None):
+			self.pos = curPos
+			if (self.bearing == None or self.updateBearing):
+				self.bearing = curPos[2]
+		if (self.bearing == None): #No position yet, hold still
+			return False
+		self.relBear = self.relativeBearing(self.bearing, self.head)
+		if (self.steerPID != None):
+			self.steer = self.pidSteerUpdate(self.relBear)
+		else:
+			self.steer = self.steerUpdate(self.relBear)
+		self.arrived = self.speedUpdate(curPos)
+		return self.arrived
+
+	def record(self, loopTime):
+		"""Values of navFields for the last tick, which started at loopTime"""
+		fix = self.fix
+		if (fix == None):
+			fixLat, fixLon, hAcc = nan, nan, nan
+		else:
+			fixLat, fixLon, hAcc = fix['lat'], fix['lon'], fix['hAcc']
+		target = self.target or [self.leg, self.latW, self.lonW, self.arriveDist]
+		return (loopTime, self.imu.magnetometer_data[0], self.imu.magnetometer_data[1], self.imu.gyroscope_data[2], fixLat, fixLon, hAcc,
+			self.head, nan if self.bearing == None else self.bearing, self.relBear, self.steer, self.command, self.timeout,
+			nan if self.pos == None else self.pos[3], target[0], target[1], target[2], target[3], self.updateBearing)
+
+	def run(self, maxLoops=None):
+		"""Runs tick() until arrival (returns True) or maxLoops passes (returns False). The esc is stopped either way"""
+		try:
+			while not self.tick():
+				if (maxLoops != None and self.loops >= maxLoops):
+					return False
+			return True
+		finally:
+			self.esc.stop()
+			self.servo.center()
@@ -0,0 +1,114 @@
+"""
+Robotritons in-use module for PID control.
+
+Purpose: A continuous, tunable replacement for the steering threshold tables. One class serves the heading->steering loop and the
+	yaw rate loop (heading->yaw rate->steering cascade) of the navigation scripts.
+Requirements: The python module time.
+Use: Make an object of class vehiclePID(kp, ki, kd, outMin, outMax) and call update(error) once per control loop. The time step is measured
+	from the monotonic clock between calls (time.time() on python 2), or pass dt to run at a fixed step. Call reset() before reusing
+	the controller for a new run.
+		steerPID = vehiclePID(0.8, 0.05, 0.1, -35, 35)
+		vehicle_servo.steer(steerPID.update(relBearSign))
+
+	-The derivative acts on the error through a first order low pass filter with time constant "tau" seconds, so 1Hz GPS bearing steps
+	 and magnetometer noise don't slam the servo.
+	-The output is clamped to outMin<->outMax.
+	-Anti-windup: the integrator freezes while the output is saturated in the direction the error pushes, and the integral term is
+	 kept inside outMin<->outMax, so the controller recovers as soon as the error changes sign.
+	-update() allocates nothing: all state is in __slots__ attributes and only floats are computed.
+
+	Errors in degrees of heading should already be wrapped to -180<->+180 (see vehicleNav.relativeBearing()).
+
+Updates:
+- October 19, 2026. Created the file. Steering PID was attempted inside VehiclePWMModule.steer() in September 2016 (compassCheckData/oldPID),
+	this keeps the controller separate from the PWM output so it can be tuned in simulation.
+
+Resources:
+http://brettbeauregard.com/blog/2011/04/improving-the-beginners-pid-introduction/
+https://en.wikipedia.org/wiki/Integral_windup
+https://docs.python.org/3/library/time.html#time.monotonic
+"""
+
+import time
+
+def monotonic():
+	"""Seconds from a clock that never jumps backwards. Looked up on every call so a simulator can patch the time module"""
+	clock = getattr(time, 'monotonic', None)
+	if (clock == None):
+		return time.time()
+	return clock()
+
+class vehiclePID(object):
+	__slots__ = ('kp', 'ki', 'kd', 'outMin', 'outMax', 'tau', 'maxDt',
+		'integral', 'derivative', 'lastError', 'lastTime', 'output', 'dt')
+
+	def __init__(self, kp, ki=0.0, kd=0.0, outMin=-35.0, outMax=35.0, tau=0.1, maxDt=0.5):
+		self.kp = float(kp)
+		self.ki = float(ki)
+		self.kd = float(kd)
+		self.outMin = float(outMin)
+		self.outMax = float(outMax)
+		self.tau = float(tau) #Seconds, derivative low pass filter time constant
+		self.maxDt = float(maxDt) #Longer gaps between updates (stalls, pauses) are treated as one maxDt step
+		self.reset()
+
+	def reset(self):
+		self.integral = 0.0
+		self.derivative = 0.0
+		self.lastError = None
+		self.lastTime = None
+		self.output = 0.0
+		self.dt = 0.0
+
+	def update(self, error, dt=None):
+		"""Returns the clamped output for the error. dt=None measures the time since the last update"""
+		if (dt == None):
+			now = monotonic()
+			if (self.lastTime == None):
+				dt = 0.0
+			else:
+				dt = now - self.lastTime
+			self.lastTime = now
+		if (dt > self.maxDt):
+			dt = self.maxDt
+		self.dt = dt
+
+		if (dt > 0 and self.lastError != None):
+			#Filtered derivative: d += (raw - d)*dt/(tau + dt)
+			raw = (error - self.lastError)/dt
+			self.derivative += (raw - self.derivative)*(dt/(self.tau + dt))
+		self.lastError = error
+
+		proportional = self.kp*error
+		derivative = self.kd*self.derivative
+		output = proportional + self.ki*self.integral + derivative
+
+		#Conditional integration: skip while saturated and the error would push further into saturation
+		if (self.ki != 0 and dt > 0):
+			if not ((output >= self.outMax and error > 0) or (output <= self.outMin and error < 0)):
+				self.integral += error*dt
+				#The integral term alone never exceeds what the output can use
+				term = self.ki*self.integral
+				if (term > self.outMax):
+					self.integral = self.outMax/self.ki
+				elif (term < self.outMin):
+					self.integral = self.outMin/self.ki
+				output = proportional + self.ki*self.integral + derivative
+
+		if (output > self.outMax):
+			output = self.outMax
+		elif (output < self.outMin):
+			output = self.outMin
+		self.output = output
+		return output
+
+if __name__ == "__main__":
+	#Heading hold of a first order steering plant: yaw rate (deg/s) = 3*steer, starting 90 degrees off.
+	pid = vehiclePID(0.8, 0.1, 0.05, -35, 35)
+	heading = 90.0
+	dt = 0.02
+	for k in range(int(10/dt)):
+		error = (0.0 - heading + 180)%360 - 180
+		heading += 3*pid.update(error, dt)*dt
+		if (k%50 == 0):
+			print('t %4.1f heading %7.2f steer %6.2f' % (k*dt, heading, pid.output))
@@ -7,6 +7,7 @@ Requirements: Adafruit I2C and PCA9685 PWM generator drivers.
 Use: Connect the Savox Servo and Xerun Esc to the Navio+ servo rail. Include this module in any python script. Create an object from the "vehiclePWM" class. Control it using the available methods.
 
 Updates:
+- October 19, 2026. navio.util.check_apm() runs when a vehiclePWM is made instead of when the module is imported.
 - September 10, 2016. Attempted to add basic PID to steer() module, but removed it because the wheels' friction prevents precise movement.
 - September 9, 2016. Argument "deg" of steer() module now requires counterclockwise angles from +-35 corresponding with those used by navigation.
 	The incoming argument "deg" is now internally converted from ccw to cw units in order to work properly with the PWM module.
@@ -42,8 +43,6 @@ import signal
 
 import navio.gpio
 import navio.util
-
-navio.util.check_apm()
 # ---- End Includes ---- 
 
 class vehiclePWM:
@@ -53,6 +52,7 @@ class vehiclePWM:
 	
 	#Notice: the variables inside the __init__ method are created privately for each object.
 	def __init__(self,hdwr):
+		navio.util.check_apm() #Here instead of at import, so importing the module has no side effects
 # ---- Setup PWM Generator ----
 		self.pin = navio.gpio.Pin(27)#Enable OE pin output.
 		self.pin.write(0)#Drive the PCA9685BS model HVQFN28's OE pin #20 (27 RPI2) to "LOW"
@@ -0,0 +1,190 @@
+"""
+Robotritons in-use module for following the legs of a route.
+
+Purpose: Track the straight segments between consecutive waypoints instead of pointing at the next waypoint. Pointing at the waypoint
+	arcs slowly towards it (see waypointData/ReadMe.txt), while a path follower pulls the vehicle back onto the line using the
+	cross-track error and a lookahead point.
+Requirements: The python module math. Routes are VehicleMissionModule.vehicleRoute objects, positions are local [east,north] meters in
+	the route's frame (route.toLocal(), or the "x" of a VehicleEKFModule.vehicleEKF made with the route's origin).
+Use: Make an object of class pathFollower(route, start=(east,north)) where start is the vehicle's position when the mission begins.
+	On every control loop call steer = update(east, north, headDegSign, speed) and pass steer to vehiclePWM.steer().
+	update() returns the steer angle in vehiclePWM units (+-35, positive turns LEFT) and sets cte, segment, done and distanceToGo().
+		mode "purePursuit": steer along the arc through the point "lookahead" meters further along the path.
+		mode "stanley": steer by the heading error plus atan(gain*cte/speed).
+
+	The nearest segment search is incremental: it starts at the current segment and only looks "window" segments ahead,
+	so the cost of a tick doesn't grow with the route length and the follower never jumps back to an earlier leg.
+
+	Cross-track error is positive when the vehicle is LEFT of the path. Headings are degrees counterclockwise from NORTH.
+
+Updates:
+- October 19, 2026. A zero length first segment (vehicle started on the first waypoint) has a unit direction vector and is skipped
+	right away, instead of a 1e9 direction that broke along, distanceToGo() and the segment search.
+- October 19, 2026. Created the file.
+
+Resources:
+https://www.ri.cmu.edu/pub_files/2009/2/Automatic_Steering_Methods_for_Autonomous_Automobile_Path_Tracking.pdf
+http://ai.stanford.edu/~gabeh/papers/hoffmann_stanley_control07.pdf
+"""
+
+import math
+
+class pathFollower:
+
+	def __init__(self, route, start=(0.0, 0.0), mode='purePursuit', lookahead=4.0, gain=1.0, wheelBase=0.33, maxWheel=24.0, steerMax=35, window=2):
+		if (mode not in ('purePursuit', 'stanley')):
+			raise ValueError('pathFollower mode must be "purePursuit" or "stanley", not %r' % mode)
+		self.mode = mode
+		self.lookahead = lookahead #m
+		self.gain = gain #Stanley cross-track gain, 1/s
+		self.softSpeed = 1.0 #m/s added to the Stanley speed so the cross-track term stays bounded when slow
+		self.wheelBase = wheelBase #m
+		self.maxWheel = maxWheel #Degrees of front wheel angle at steer(+-steerMax)
+		self.steerMax = steerMax
+		self.window = window #Segments ahead of the current one searched every tick
+
+		# ---- Precomputed Segments ----
+		#Point 0 is the start, point k+1 the k-th waypoint. Segment k runs from point k to point k+1.
+		self.pointE = [start[0]] + [leg.east for leg in route.legs]
+		self.pointN = [start[1]] + [leg.north for leg in route.legs]
+		self.radius = [leg.radius for leg in route.legs]
+		self.unitE = []
+		self.unitN = []
+		self.length = []
+		self.bearing = [] #rad, counterclockwise from NORTH
+		for k in range(len(route.legs)):
+			dE = self.pointE[k+1] - self.pointE[k]
+			dN = self.pointN[k+1] - self.pointN[k]
+			length = math.sqrt(dE*dE + dN*dN)
+			if (length == 0): #Vehicle started on the waypoint, any unit vector will do. NORTH keeps along and cte in meters.
+				self.unitE.append(0.0)
+				self.unitN.append(1.0)
+			else:
+				self.unitE.append(dE/length)
+				self.unitN.append(dN/length)
+			self.length.append(length)
+			self.bearing.append(math.atan2(-dE, dN))
+		#Path length left after the end of each segment, so distanceToGo() is one addition
+		self.remaining = [0.0]*len(self.length)
+		for k in range(len(self.length) - 2, -1, -1):
+			self.remaining[k] = self.remaining[k+1] + self.length[k+1]
+		# ---- End Precomputed Segments ----
+
+		self.segment = 0
+		self.along = 0.0 #m travelled along the current segment
+		self.cte = 0.0 #m, positive LEFT of the path
+		self.headingError = 0.0 #rad, path bearing minus heading
+		self.done = False
+
+	def project(self, k, east, north):
+		"""Returns [along, cte] of local [east,north] on segment k"""
+		dE = east - self.pointE[k]
+		dN = north - self.pointN[k]
+		ue = self.unitE[k]
+		un = self.unitN[k]
+		return [dE*ue + dN*un, ue*dN - un*dE]
+
+	def findSegment(self, east, north):
+		"""Move forward to the nearest of the next "window" segments once the vehicle is past the end of the current one"""
+		last = len(self.length) - 1
+		along, cte = self.project(self.segment, east, north)
+		while (self.segment < last and (along >= self.length[self.segment] or self.length[self.segment] == 0)): #A zero length segment is always passed
+			best = self.segment + 1
+			bestAlong, bestCte = self.project(best, east, north)
+			for k in range(best + 1, min(best + self.window, last + 1)):
+				kAlong, kCte = self.project(k, east, north)
+				if (kAlong >= 0 and abs(kCte) < abs(bestCte)):
+					best, bestAlong, bestCte = k, kAlong, kCte
+			self.segment = best
+			along, cte = bestAlong, bestCte
+		self.along = along
+		self.cte = cte
+
+	def distanceToGo(self):
+		"""Meters along the path from the vehicle's projection to the last waypoint"""
+		return max(self.length[self.segment] - self.along, 0.0) + self.remaining[self.segment]
+
+	def lookaheadPoint(self, distance):
+		"""Local [east,north] of the point "distance" meters ahead of the vehicle's projection, clamped to the last waypoint"""
+		k = self.segment
+		s = self.along + distance
+		while (s > self.length[k] and k < len(self.length) - 1):
+			s -= self.length[k]
+			k += 1
+		s = min(s, self.length[k])
+		return [self.pointE[k] + s*self.unitE[k], self.pointN[k] + s*self.unitN[k]]
+
+	def update(self, east, north, headDegSign, speed=0.0):
+		"""Returns the steer angle (+-steerMax, positive LEFT) that follows the path from local [east,north] and the heading"""
+		self.findSegment(east, north)
+		last = len(self.length) - 1
+		if (self.segment == last):
+			dE = self.pointE[last+1] - east
+			dN = self.pointN[last+1] - north
+			if (dE*dE + dN*dN <= self.radius[last]*self.radius[last] or self.along >= self.length[last]):
+				self.done = True
+		head = headDegSign*(math.pi/180)
+		self.headingError = wrapPi(self.bearing[self.segment] - head)
+
+		if (self.mode == 'purePursuit'):
+			targetE, targetN = self.lookaheadPoint(self.lookahead)
+			dE = targetE - east
+			dN = targetN - north
+			distance = max(math.sqrt(dE*dE + dN*dN), 0.1)
+			alpha = wrapPi(math.atan2(-dE, dN) - head)
+			wheel = math.atan(2*self.wheelBase*math.sin(alpha)/distance)
+		else:
+			wheel = self.headingError - math.atan2(self.gain*self.cte, abs(speed) + self.softSpeed)
+
+		steer = wheel*(180/math.pi)*self.steerMax/self.maxWheel
+		return max(-self.steerMax, min(self.steerMax, steer))
+
+def wrapPi(angle):
+	"""Wraps an angle in radians to -pi<->+pi"""
+	return (angle + math.pi)%(2*math.pi) - math.pi
+
+if __name__ == "__main__":
+	#Simulated three waypoint mission comparing the followers. vehicleEKF fuses the 1Hz GPS fixes, gyro, accelerometer and magnetometer.
+	import time
+	import VehicleSimModule
+	import VehicleMissionModule
+	import VehicleEKFModule
+	waypoints = [{'lat':32.881573, 'lon':-117.235312, 'radius':2.0, 'name':''},
+		{'lat':32.881773, 'lon':-117.235612, 'radius':2.0, 'name':''},
+		{'lat':32.881573, 'lon':-117.235912, 'radius':2.0, 'name':''}]
+	route = VehicleMissionModule.compileRoute(waypoints)
+	for mode in ('purePursuit', 'stanley'):
+		sim = VehicleSimModule.vehicleSim(32.881373, -117.235312, head0=0, seed=2, timeLimit=200)
+		with sim:
+			import VehiclePWMModule
+			from VehicleGPSModule import U_blox
+			from navio.mpu9250_better import MPU9250
+			VehiclePWMModule.vehiclePWM.PreviousSpeed = 0
+			esc = VehiclePWMModule.vehiclePWM("esc")
+			servo = VehiclePWMModule.vehiclePWM("servo")
+			ubl = U_blox()
+			imu = MPU9250()
+			imu.initialize()
+			start = route.toLocal(*sim.position())
+			follower = pathFollower(route, start=start, mode=mode)
+			ekf = VehicleEKFModule.vehicleEKF(route.lat0, route.lon0, head0=0.0, posStd=2.0, headStd=0.2)
+			ekf.x[0], ekf.x[1] = start
+			sumCte = 0.0
+			n = 0
+			last = time.time()
+			while not follower.done:
+				pos = ubl.GPSfetch()
+				if (pos != None):
+					ekf.updateGPS(pos)
+				imu.read_all()
+				now = time.time()
+				ekf.predict(imu.gyroscope_data[2], imu.accelerometer_data[0], now - last)
+				ekf.updateHeading(math.atan2(imu.magnetometer_data[1], imu.magnetometer_data[0])*(180/math.pi) + VehicleSimModule.declination, std=0.3)
+				last = now
+				servo.steer(follower.update(ekf.x[0], ekf.x[1], ekf.x[3]*(180/math.pi), ekf.x[2]))
+				esc.accel(1)
+				trueE, trueN = route.toLocal(*sim.position())
+				sumCte += follower.project(follower.segment, trueE, trueN)[1]**2
+				n += 1
+			esc.stop()
+		print('%-12s finished in %.1f s, path %.1f m for %.1f m of legs, rms cross-track %.2f m' % (mode, sim.time(), sim.distance, sum(follower.length), math.sqrt(sumCte/n)))
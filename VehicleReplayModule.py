@@ -0,0 +1,222 @@
+"""
+Robotritons in-use module for replaying logged runs through the navigation logic.
+
+Purpose: Answer "what would a different controller have done on that run?" without a field day. The magnetometer, gyro, GPS and
+	loop timing recorded by WaypointTest.py are fed back through VehicleNavModule.vehicleNav with any tuning, as fast as python runs,
+	and the replayed steering and speed commands are compared with what the car actually commanded.
+Requirements: The python modules math, sys, VehicleNavModule, VehicleSimModule and VehicleTelemetryModule.
+Use: Call replay(path, latW, lonW, magMeans, **tuning) with a telemetry log written with VehicleNavModule.navFields. tuning holds
+	vehicleNav() keyword arguments (threshold, steerMax, holdTime, steerPID, ...). It returns a list of [time, head, relBear, steer,
+	command, arrived, record] per replayed tick, record is the position of the tick in the log. compare() summarizes how far the
+	replayed steering is from the recorded one.
+		names, records = VehicleTelemetryModule.readTelemetry('waypointData/drive1.bin')
+		base = replay((names, records), magMeans=magMeans)
+		hold = replay((names, records), magMeans=magMeans, holdTime=0.25)
+		print(compare(names, records, hold))
+	From the shell, with the magnetometerMeans of WaypointTest.py:
+		python VehicleReplayModule.py waypointData/drive1.bin [tuning=value ...]
+
+	Logs record the target of every tick (leg, latW, lonW, arriveDist, updateBearing), so a run of VehicleDrive.py or Vehicle.py drive
+	is replayed leg by leg with the waypoints, arrival radii and updateBearing it drove with. When the replayed controller arrives before
+	the recorded run left a leg, the rest of that leg is skipped. Tuning given to replay() wins over the recorded arriveDist and
+	updateBearing. Logs older than those fields are replayed against the latW, lonW arguments with updateBearing=False like
+	WaypointTest.py (on the shell, latW=... lonW=..., the waypoint of WaypointTest.py by default).
+
+	The replay is open loop: the recorded inputs don't change when the replayed controller steers differently, so it shows how the
+	controller reacts to the same data, not where the car would have gone. Use VehicleSimModule for closed loop comparisons.
+	time.time() is patched with a VehicleSimModule.virtualClock set to each recorded loop time, so holdTime and the PID time steps see the
+	recorded timing. The gyro is only fresh in logs of runs that read it (ratePID), otherwise gyroZ holds the last reading.
+
+Updates:
+- October 19, 2026. Replays follow the legs, waypoints, arrival radii and updateBearing recorded in the log. Results end with the record.
+- October 19, 2026. The waypoint and magnetometerMeans file of the command line are module constants, used by Vehicle.py replay too.
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/time.html#time.time
+"""
+
+import math
+import sys
+
+import VehicleNavModule
+import VehicleSimModule
+import VehicleTelemetryModule
+
+#Waypoint and calibration of WaypointTest.py, the defaults of the command line for logs that don't record their waypoint
+latW = 32.881373
+lonW = -117.235912
+magMeansPath = 'waypointData/magnetometerMeans.txt'
+
+# ---- Recorded Stand-ins ----
+#Objects with the methods vehicleNav calls on the real esc, servo, U_blox and MPU9250, fed from the log instead of the hardware
+class replayGPS:
+
+	def __init__(self):
+		self.message = None
+
+	def GPSfetch(self):
+		message = self.message
+		self.message = None
+		return message
+
+class replayIMU:
+
+	def __init__(self):
+		self.magnetometer_data = [0.0, 0.0, 0.0]
+		self.gyroscope_data = [0.0, 0.0, 0.0]
+
+	def read_mag(self):
+		pass
+
+	def read_gyro(self):
+		pass
+
+class replayPWM:
+	"""Remembers the last steer angle and esc command instead of writing pulse widths"""
+
+	def __init__(self):
+		self.angle = 0
+		self.speed = 0
+
+	def steer(self, angle):
+		self.angle = angle
+
+	def center(self):
+		self.angle = 0
+
+	def accel(self, speed):
+		self.speed = speed
+
+	def stop(self):
+		self.speed = 0
+
+	def rest(self):
+		pass
+# ---- End Recorded Stand-ins ----
+
+#navFields of the target of each tick, missing in logs written before they were added
+targetFields = ('leg', 'latW', 'lonW', 'arriveDist', 'updateBearing')
+
+def fieldIndex(names):
+	"""Dictionary of field name to position in a record. Raises ValueError when a navFields field other than targetFields is missing"""
+	index = dict((name, i) for i, name in enumerate(names))
+	for name, code in VehicleNavModule.navFields:
+		if (name not in index and name not in targetFields):
+			raise ValueError('not a VehicleNavModule.navFields log, field %s is missing' % name)
+	return index
+
+def recordsTarget(index):
+	"""True when the log records the target of each tick (targetFields)"""
+	return all(name in index for name in targetFields)
+
+def replay(log, latW=None, lonW=None, magMeans=None, bearing0=None, **tuning):
+	"""
+	Feeds a telemetry log (a path, or the [names, records] of readTelemetry()) through a vehicleNav made with tuning, leg by leg when
+	the log records its targets. latW, lonW are only used for logs that don't. bearing0 sets the starting bearing (WaypointTest.py
+	steers towards an average taken before the loop), None uses the bearing of the first record (the first bearing recorded, in logs
+	without targets).
+	Returns [time, head, relBear, steer, command, arrived, record] per replayed tick.
+	"""
+	if isinstance(log, str):
+		log = VehicleTelemetryModule.readTelemetry(log)
+	names, records = log
+	index = fieldIndex(names)
+	iTime, iMagX, iMagY, iGyroZ = index['time'], index['magX'], index['magY'], index['gyroZ']
+	iLat, iLon, iAcc = index['fixLat'], index['fixLon'], index['hAcc']
+	if not len(records):
+		return []
+	legs = recordsTarget(index)
+	if legs:
+		iLeg, iLatW, iLonW, iArrive = index['leg'], index['latW'], index['lonW'], index['arriveDist']
+		latW, lonW = float(records[0][iLatW]), float(records[0][iLonW])
+		tuning.setdefault('updateBearing', bool(records[0][index['updateBearing']]))
+	elif (latW == None or lonW == None):
+		raise ValueError('the log does not record its waypoint, give latW and lonW')
+	else:
+		tuning.setdefault('updateBearing', False) #Like WaypointTest.py, the only logs without targets
+	fixedArrival = 'arriveDist' in tuning
+	if (bearing0 == None and legs):
+		#The bearing of the first tick, None when the run waited for its first position like VehicleCommandModule runs
+		if not math.isnan(records[0][index['bearing']]):
+			bearing0 = float(records[0][index['bearing']])
+	elif (bearing0 == None):
+		for values in records:
+			if not math.isnan(values[index['bearing']]):
+				bearing0 = float(values[index['bearing']])
+				break
+
+	gps = replayGPS()
+	imu = replayIMU()
+	esc = replayPWM()
+	servo = replayPWM()
+	clock = VehicleSimModule.virtualClock(float(records[0][iTime]))
+	clock.install()
+	try:
+		nav = VehicleNavModule.vehicleNav(esc, servo, gps, imu, latW, lonW, magMeans=magMeans, **tuning)
+		nav.bearing = bearing0
+		target = None #(leg, latW, lonW) of the leg being replayed
+		results = []
+		i = 0
+		while (i < len(records)):
+			values = records[i]
+			if legs and (values[iLeg], values[iLatW], values[iLonW]) != target:
+				if (target != None): #Next leg, like vehicleSession.nextLeg() of VehicleCommandModule
+					nav.setWaypoint(float(values[iLatW]), float(values[iLonW]))
+					nav.bearing = None
+					nav.arrived = False
+				target = (values[iLeg], values[iLatW], values[iLonW])
+				nav.leg = int(values[iLeg])
+				if not fixedArrival:
+					nav.arriveDist = float(values[iArrive])
+			#float() so memory mapped numpy records (VehicleLogLoaderModule) feed plain floats to the controller
+			clock.now = float(values[iTime])
+			imu.magnetometer_data[0] = float(values[iMagX])
+			imu.magnetometer_data[1] = float(values[iMagY])
+			imu.gyroscope_data[2] = float(values[iGyroZ])
+			if not math.isnan(values[iAcc]):
+				gps.message = {'lat':float(values[iLat]), 'lon':float(values[iLon]), 'hAcc':float(values[iAcc])}
+			arrived = nav.tick()
+			results.append([clock.now, nav.head, nav.relBear, servo.angle, esc.speed, arrived, i])
+			i += 1
+			if arrived:
+				if not legs:
+					break
+				while (i < len(records) and (records[i][iLeg], records[i][iLatW], records[i][iLonW]) == target):
+					i += 1 #The recorded run is still on its way to the waypoint the replay reached
+	finally:
+		clock.uninstall()
+	return results
+
+def compare(names, records, results):
+	"""Differences between the recorded and replayed steering: rms and largest steer difference, ticks replayed and arrival"""
+	index = fieldIndex(names)
+	iSteer = index['steer']
+	squares = 0.0
+	largest = 0.0
+	for result in results:
+		difference = result[3] - records[result[6]][iSteer]
+		squares += difference*difference
+		largest = max(largest, abs(difference))
+	n = max(len(results), 1)
+	arrival = results[-1][0] if (results and results[-1][5]) else None
+	return {'ticks':len(results), 'rmsSteer':math.sqrt(squares/n), 'maxSteer':largest, 'arrivalTime':arrival}
+
+def parseTuning(arguments):
+	"""vehicleNav() keyword arguments of "name=value" strings, plus the latW and lonW of replay()"""
+	tuning = {}
+	for argument in arguments:
+		key, value = argument.split('=', 1)
+		tuning[key] = False if value == 'False' else (True if value == 'True' else float(value))
+	return tuning
+
+if __name__ == "__main__":
+	if (len(sys.argv) < 2):
+		sys.exit('Usage: python VehicleReplayModule.py log.bin [tuning=value ...]')
+	with open(magMeansPath, 'r') as meansFile:
+		magMeans = {'x':float(meansFile.readline()), 'y':float(meansFile.readline())}
+	tuning = parseTuning(sys.argv[2:])
+	names, records = VehicleTelemetryModule.readTelemetry(sys.argv[1])
+	results = replay((names, records), tuning.pop('latW', latW), tuning.pop('lonW', lonW), magMeans, **tuning)
+	stats = compare(names, records, results)
+	print('%d of %d ticks replayed, steer difference rms %.2f max %.2f, arrival %s' % (stats['ticks'], len(records), stats['rmsSteer'], stats['maxSteer'], stats['arrivalTime']))
@@ -0,0 +1,324 @@
+"""
+Robotritons in-use module for closed loop simulation of the vehicle.
+
+Purpose: Drive the navigation scripts against a simulated car instead of the real one, faster than real time.
+	Controller changes (steering thresholds, steer angles, targetTime) can then be evaluated in bulk before a field day.
+Requirements: The python modules math, random, time, collections, navio.hal, navio.fakes and VehicleGeoModule.
+Use: Make an object of class vehicleSim() at the starting lat/lon/heading, then call start() BEFORE creating vehiclePWM, U_blox or MPU9250 objects.
+	start() selects the fake navio.hal backend and replaces time.time() and time.sleep() with a virtual clock. From then on the
+	unmodified drivers talk to the fake PCA9685, NEO-M8N and MPU9250 registers:
+		-the servo (channel 3) and esc (channel 5) pulse widths written by vehiclePWM are decoded into wheel angle and throttle
+		-a kinematic bicycle model moves the car every "dt" seconds of virtual time
+		-the MPU9250 magnetometer, gyro and accelerometer registers and the 1Hz UBX NAV-POSLLH/NAV-STATUS frames are synthesized from the car's state
+	Virtual time only passes when the script sleeps and by "busTime" seconds for every SPI/I2C transaction, so a polling loop runs at
+	a realistic rate and a whole mission finishes in a fraction of a second. Call stop() (or use a "with" block) to restore the time module.
+
+	Example:
+		with vehicleSim(32.881773, -117.235712, timeLimit=120) as sim:
+			esc = VehiclePWMModule.vehiclePWM("esc")
+			...
+			print(sim.time(), sim.distance)
+
+	The heading is counterclockwise from NORTH like the navigation scripts, so psi = N=0<->+pi is WEST and N=0<->-pi is EAST.
+	The magnetometer follows updateMag() of the waypoint scripts: atan2(y-yMean, x-xMean) plus 11.7 degrees of declination is the heading,
+	where magBias plays the part of the calibrated magnetometerMeans.
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://thef1clan.com/2020/09/21/vehicle-dynamics-the-kinematic-bicycle-model/
+http://www.nxp.com/documents/data_sheet/PCA9685.pdf
+https://www.u-blox.com/sites/default/files/products/documents/u-blox8-M8_ReceiverDescrProtSpec_(UBX-13003221)_Public.pdf
+"""
+
+import collections
+import math
+import random
+import time
+
+import navio.hal
+import navio.fakes
+import VehicleGeoModule
+
+declination = 11.7 #Degrees, the same declination the navigation scripts add to the magnetometer heading
+
+class SimTimeLimit(Exception):
+	"""Raised from the bus when the simulated mission runs longer than timeLimit seconds"""
+	pass
+
+class virtualClock:
+	"""Stand-in for time.time() and time.sleep() where time only passes when something advances it"""
+
+	def __init__(self, start=0.0):
+		self.now = start
+		self.realTime = None
+		self.realSleep = None
+		self.realMonotonic = None
+
+	def time(self):
+		return self.now
+
+	def sleep(self, seconds):
+		if (seconds > 0):
+			self.now += seconds
+
+	def install(self):
+		"""Patches the time module so every module calling time.time()/time.sleep()/time.monotonic() uses this clock"""
+		if (self.realTime == None):
+			self.realTime = time.time
+			self.realSleep = time.sleep
+			self.realMonotonic = getattr(time, 'monotonic', None)
+			time.time = self.time
+			time.sleep = self.sleep
+			if (self.realMonotonic != None):
+				time.monotonic = self.time
+
+	def uninstall(self):
+		if (self.realTime != None):
+			time.time = self.realTime
+			time.sleep = self.realSleep
+			if (self.realMonotonic != None):
+				time.monotonic = self.realMonotonic
+			self.realTime = None
+			self.realSleep = None
+
+class vehicleSim:
+
+	def __init__(self, lat0, lon0, head0=0.0, seed=None, gpsNoise=1.0, magBias=(0.0, 0.0), servoLatency=0.05, busTime=0.0008, dt=0.005, timeLimit=None):
+		#Local tangent plane centered on the start position
+		self.lat0 = lat0
+		self.lon0 = lon0
+		self.frame = VehicleGeoModule.enuFrame(lat0, lon0)
+		self.random = random.Random(seed)
+
+		# ---- Vehicle Parameters ----
+		self.wheelBase = 0.33 #m
+		self.maxWheel = 24.0 #Degrees of front wheel angle at steer(+-35)
+		self.servoCenter = 81.0 #Servo degrees where the wheels point straight, see vehiclePWM.center()
+		self.servoSlew = 400.0 #Degrees per second the front wheels turn
+		self.servoLatency = servoLatency #Seconds between a steer() and the servo starting to move
+		self.minSpeed = 2.0 #m/s at accel(1)
+		self.maxSpeed = 12.0 #m/s at accel(100)
+		self.maxReverse = 4.0 #m/s at accel(-100)
+		self.speedTau = 0.6 #Seconds, first order time constant of the drivetrain
+		self.frequency = 45.05 #Hz, the vehiclePWM frequency used to convert the PCA9685 counts back into pulse widths
+		# ---- End Vehicle Parameters ----
+
+		# ---- Sensor Parameters ----
+		self.gpsNoise = gpsNoise #m, standard deviation of the error of every GPS fix
+		self.hAcc = 2.0 #m, horizontal accuracy reported in NAV-POSLLH
+		self.magField = 30.0 #uT, horizontal component of the earth's field
+		self.magVertical = -40.0 #uT
+		self.magBias = magBias #uT, hard iron offset of the x and y axes
+		# ---- End Sensor Parameters ----
+
+		# ---- State ----
+		self.east = 0.0 #m
+		self.north = 0.0 #m
+		self.psi = head0*(math.pi/180) #rad, counterclockwise from NORTH
+		self.speed = 0.0 #m/s
+		self.wheel = 0.0 #Degrees, positive turns LEFT
+		self.wheelCmd = 0.0
+		self.throttle = 0.0 #Target speed m/s
+		self.yawRate = 0.0 #rad/s
+		self.accel = 0.0 #m/s^2
+		self.distance = 0.0 #m driven so far
+		self.gpsError = (0.0, 0.0)
+		self.gpsEpoch = -1
+		self.pending = collections.deque() #(applyTime, wheelCmd) servo commands waiting out the latency
+		self.lastServo = None
+		# ---- End State ----
+
+		self.dt = dt
+		self.busTime = busTime
+		self.timeLimit = timeLimit
+		self.clock = virtualClock()
+		self.simTime = 0.0
+		self.board = None
+		self.steps = 0
+
+	# ---- Setup ----
+	def start(self):
+		"""Selects the fake hardware, installs the virtual clock and publishes the first sensor values"""
+		navio.hal.use("fake")
+		self.board = navio.fakes.reset()
+		self.board.clock = self.clock.time
+		self.board.hooks.append(self.sync)
+		self.clock.install()
+		self.writeSensors()
+		return self
+
+	def stop(self):
+		self.clock.uninstall()
+		if (self.board != None and self.sync in self.board.hooks):
+			self.board.hooks.remove(self.sync)
+
+	def __enter__(self):
+		return self.start()
+
+	def __exit__(self, excType, excValue, tb):
+		self.stop()
+		return False
+	# ---- End Setup ----
+
+	# ---- Coordinate Conversions ----
+	def toLocal(self, lat, lon):
+		"""Converts degrees to [east,north] meters about the start position"""
+		return self.frame.toLocal(lat, lon)
+
+	def toLatLon(self, east, north):
+		"""Converts [east,north] meters about the start position back to degrees"""
+		return self.frame.toLatLon(east, north)
+
+	def position(self):
+		"""True (noiseless) lat, lon of the vehicle"""
+		return self.toLatLon(self.east, self.north)
+
+	def distanceTo(self, lat, lon):
+		"""True distance in meters from the vehicle to lat, lon"""
+		east, north = self.toLocal(lat, lon)
+		return math.hypot(east - self.east, north - self.north)
+	# ---- End Coordinate Conversions ----
+
+	def time(self):
+		return self.clock.now
+
+	def sync(self):
+		"""Bus hook: charge the transaction to the virtual clock and bring the vehicle up to the current time"""
+		clock = self.clock
+		clock.now += self.busTime
+		if (self.timeLimit != None and clock.now > self.timeLimit):
+			raise SimTimeLimit('Simulation passed %.1f seconds' % self.timeLimit)
+		while (self.simTime + self.dt <= clock.now):
+			self.step(self.dt)
+			self.simTime += self.dt
+
+	# ---- Actuators ----
+	def pulseWidth(self, channel):
+		"""Seconds of the pulse vehiclePWM asked for on channel, 0 when the channel is resting"""
+		count = self.board.pwm.off_count(channel)
+		if (count == 0):
+			return 0.0
+		return (count + 1)/(4096.0*self.frequency) #Inverse of vehiclePWM's trunc(4096*width*frequency - 1)
+
+	def readActuators(self):
+		#Servo: width -> 0-180 servo degrees -> front wheel angle. A resting servo holds its last angle.
+		width = self.pulseWidth(3)
+		if (width > 0 and width != self.lastServo):
+			servoDeg = (width - 0.000685)/0.00199*180.0
+			wheelCmd = (servoDeg - self.servoCenter)*self.maxWheel/35.0
+			wheelCmd = max(-self.maxWheel, min(self.maxWheel, wheelCmd))
+			self.pending.append((self.simTime + self.servoLatency, wheelCmd))
+			self.lastServo = width
+		while (self.pending and self.pending[0][0] <= self.simTime):
+			self.wheelCmd = self.pending.popleft()[1]
+
+		#ESC: see vehiclePWM.forward(), stop() and reverse(). Anything between reverse and forward brakes, no pulse coasts.
+		width = self.pulseWidth(5)
+		if (width == 0):
+			self.throttle = None
+		elif (width >= 0.001715):
+			level = max(0.0, min(1.0, (width - 0.001725)/0.000415))
+			self.throttle = self.minSpeed + level*(self.maxSpeed - self.minSpeed)
+		elif (width <= 0.001600):
+			level = max(0.0, min(1.0, (0.00159 - width)/0.000290))
+			self.throttle = -self.minSpeed - level*(self.maxReverse - self.minSpeed)
+		else:
+			self.throttle = 0.0
+	# ---- End Actuators ----
+
+	def step(self, dt):
+		"""Advance the kinematic bicycle model dt seconds and refresh the sensors"""
+		self.readActuators()
+
+		#Front wheels slew towards the commanded angle
+		maxMove = self.servoSlew*dt
+		self.wheel += max(-maxMove, min(maxMove, self.wheelCmd - self.wheel))
+
+		#First order drivetrain. Coasting slowly rolls to a stop.
+		speed = self.speed
+		if (self.throttle == None):
+			target = 0.0
+			tau = 4*self.speedTau
+		else:
+			target = self.throttle
+			tau = self.speedTau
+		self.speed = speed + (target - speed)*(dt/(tau + dt))
+		self.accel = (self.speed - speed)/dt
+
+		self.yawRate = self.speed*math.tan(self.wheel*(math.pi/180))/self.wheelBase
+		self.psi = (self.psi + self.yawRate*dt + math.pi)%(2*math.pi) - math.pi
+		self.east -= self.speed*math.sin(self.psi)*dt
+		self.north += self.speed*math.cos(self.psi)*dt
+		self.distance += abs(self.speed)*dt
+		self.steps += 1
+		self.writeSensors()
+
+	def writeSensors(self):
+		"""Loads the fake MPU9250 and NEO-M8N with the vehicle's current state"""
+		mpu = self.board.mpu
+		magHead = self.psi - declination*(math.pi/180)
+		mpu.mag = [self.magField*math.cos(magHead) + self.magBias[0], self.magField*math.sin(magHead) + self.magBias[1], self.magVertical]
+		mpu.gyro = [0.0, 0.0, self.yawRate*(180/math.pi)]
+		mpu.accel = [self.accel/9.80665, self.speed*self.yawRate/9.80665, 1.0]
+
+		#Every fix gets a fresh error. The receiver publishes the position it holds at each whole second of virtual time.
+		epoch = int(self.simTime)
+		if (epoch != self.gpsEpoch):
+			self.gpsEpoch = epoch
+			self.gpsError = (self.random.gauss(0, self.gpsNoise), self.random.gauss(0, self.gpsNoise))
+		lat, lon = self.toLatLon(self.east + self.gpsError[0], self.north + self.gpsError[1])
+		self.board.ublox.set_position(lat, lon, hAcc=self.hAcc)
+
+if __name__ == "__main__":
+	#Sample mission: the continuous steering of WaypointTest.py driving to a waypoint 60m north-west of the start, facing east.
+	latW = 32.881773
+	lonW = -117.235712
+	sim = vehicleSim(32.881373, -117.235312, head0=-90, seed=1, timeLimit=300)
+	wallStart = time.time()
+	with sim:
+		import VehiclePWMModule
+		from VehicleGPSModule import U_blox
+		from navio.mpu9250_better import MPU9250
+		esc = VehiclePWMModule.vehiclePWM("esc")
+		servo = VehiclePWMModule.vehiclePWM("servo")
+		ubl = U_blox()
+		imu = MPU9250()
+		imu.initialize()
+		ubl.enable_posllh()
+
+		wpE, wpN = sim.frame.toLocal(latW, lonW)
+		magBear = None
+		targetTime = 0
+		steerAngle = 0
+		steerMax = 0
+		arrived = False
+		while not arrived:
+			pos = ubl.GPSfetch()
+			imu.read_mag()
+			head = math.atan2(imu.magnetometer_data[1], imu.magnetometer_data[0])*(180/math.pi) + declination
+			if (pos != None):
+				east, north = sim.frame.toLocal(pos['lat'], pos['lon'])
+				d, magBear = VehicleGeoModule.distanceBearing(wpE - east, wpN - north)
+				arrived = d < 3.0
+			if (magBear == None):
+				continue
+			relBear = (magBear - head)%360
+			if (relBear > 180):
+				relBear -= 360
+			lastAngle = steerAngle
+			if (abs(relBear) > 8):
+				steerMax = 35 if (relBear > 0) else -35
+				steerAngle = relBear*35/180
+			else:
+				steerAngle = 0
+			compSteer = 0 if (abs(steerAngle) - abs(lastAngle) < 0) else steerMax
+			if (time.time() < targetTime):
+				servo.steer(compSteer)
+			else:
+				servo.steer(steerAngle)
+				targetTime = time.time() + 0.5
+			esc.accel(1)
+		esc.stop()
+	print('arrived in %.1f s of virtual time, path %.1f m, true miss %.1f m, %d steps in %.2f s of wall time' % (sim.time(), sim.distance, sim.distanceTo(latW, lonW), sim.steps, time.time() - wallStart))
@@ -0,0 +1,139 @@
+"""
+Robotritons in-use module for planning the esc speed along a route.
+
+Purpose: Replace the constant vehicle_esc.accel(1) and hard stop with a speed that drops ahead of waypoints and sharp turns. The 1Hz GPS
+	means the vehicle only learns where it is up to a second late, so it overshoots waypoints at speed. The planner brakes early enough
+	for that latency, which lets the cruise speed go up without missing waypoints.
+Requirements: The python modules math, array and VehicleGeoModule. Routes are VehicleMissionModule.vehicleRoute objects.
+Use: Make an object of class speedPlanner(route, start, cruise) once per mission, start being the vehicle's local [east,north] about the
+	route origin like pathFollower(route, start=...). It sets the direction of the first leg and so the turn at the first waypoint. It precomputes a throttle table for every leg, so at runtime
+	throttle(leg, distanceToGo) is one table lookup. Pass the result to vehiclePWM.accel().
+		planner = speedPlanner(route, start=route.toLocal(lat, lon), cruise=6.0)
+		vehicle_esc.accel(planner.throttle(follower.segment, follower.length[follower.segment] - follower.along))
+
+	Every leg ends with a speed limit: 0 at the last waypoint, otherwise the speed of an arc through the turn that fits inside the
+	waypoint's arrival radius, limited by the lateral acceleration. Approaching it the planner allows v(d) where
+		v^2 + 2*brake*v*latency = vEnd^2 + 2*brake*d
+	which is the braking curve with the distance already driven during the GPS latency taken away.
+	Speeds are converted to accel() arguments with the linear calibration speedAt1 (m/s at accel(1)) and speedAt100 (m/s at accel(100)).
+	The throttle never drops below 1 before arrival, stopping stays with vehicle_esc.stop().
+
+Updates:
+- October 19, 2026. The turn at the first waypoint is measured from the start position given to the constructor, not from the
+	placeholder bearing 0 of leg 0.
+- October 19, 2026. Created the file.
+
+Resources:
+https://en.wikipedia.org/wiki/Braking_distance
+"""
+
+import array
+import math
+
+import VehicleGeoModule
+
+class speedPlanner:
+
+	def __init__(self, route, start=(0.0, 0.0), cruise=4.0, brake=2.0, lateral=3.0, latency=1.0, speedAt1=2.0, speedAt100=12.0, step=0.5):
+		self.cruise = cruise #m/s on long straight legs
+		self.brake = brake #m/s^2 the car reliably slows at by backing off the throttle
+		self.lateral = lateral #m/s^2 of cornering acceleration before the tires slide
+		self.latency = latency #Seconds between the vehicle being somewhere and the navigation knowing it (1Hz GPS)
+		self.speedAt1 = speedAt1
+		self.speedAt100 = speedAt100
+		self.step = step #m per table entry
+
+		legs = route.legs
+		#Leg 0 of a compiled route has a placeholder bearing of 0, its real bearing is from the start to the first waypoint
+		bearings = [leg.bearing for leg in legs]
+		if legs:
+			dE = legs[0].east - start[0]
+			dN = legs[0].north - start[1]
+			if (dE*dE + dN*dN > 1e-6):
+				bearings[0] = VehicleGeoModule.distanceBearing(dE, dN)[1]
+			elif (len(legs) > 1): #Started on the first waypoint, there is no turn there
+				bearings[0] = bearings[1]
+		self.endSpeed = []
+		for k in range(len(legs)):
+			if (k == len(legs) - 1):
+				self.endSpeed.append(0.0)
+			else:
+				self.endSpeed.append(self.cornerSpeed(bearings[k+1] - bearings[k], legs[k].radius))
+
+		# ---- Precomputed Profiles ----
+		#tables[k][i] is the throttle with i*step meters left on leg k. Past the end of a table the leg runs at cruise.
+		self.tables = []
+		cruiseThrottle = self.toThrottle(cruise)
+		for k in range(len(legs)):
+			table = array.array('b')
+			i = 0
+			while True:
+				throttle = self.toThrottle(self.allowedSpeed(i*step, self.endSpeed[k]))
+				table.append(throttle)
+				if (throttle >= cruiseThrottle):
+					break
+				i += 1
+			self.tables.append(table)
+		# ---- End Precomputed Profiles ----
+
+	def cornerSpeed(self, turnDeg, radius):
+		"""Speed of the arc that turns turnDeg degrees inside an arrival radius, limited by lateral acceleration"""
+		turn = abs((turnDeg + 180)%360 - 180)*(math.pi/180)
+		if (turn < 1e-3):
+			return self.cruise
+		arc = radius/math.tan(turn/2) if (turn < math.pi - 1e-3) else 0.0 #Radius of the arc tangent to both legs
+		return min(self.cruise, math.sqrt(self.lateral*arc))
+
+	def allowedSpeed(self, distance, endSpeed):
+		"""Fastest speed from which the vehicle still slows to endSpeed in "distance" meters despite the latency"""
+		aL = self.brake*self.latency
+		v = -aL + math.sqrt(aL*aL + endSpeed*endSpeed + 2*self.brake*max(distance, 0.0))
+		return min(self.cruise, max(v, 0.0))
+
+	def toThrottle(self, speed):
+		"""accel() argument for a speed in m/s, 1 at or below speedAt1"""
+		throttle = int(math.ceil((speed - self.speedAt1)/(self.speedAt100 - self.speedAt1)*100))
+		return max(1, min(100, throttle))
+
+	def throttle(self, leg, distanceToGo):
+		"""accel() argument with distanceToGo meters left on leg"""
+		table = self.tables[leg]
+		i = int(distanceToGo/self.step)
+		if (i >= len(table)):
+			return table[-1]
+		if (i < 0):
+			return table[0]
+		return table[i]
+
+if __name__ == "__main__":
+	#Single waypoint missions at accel(1) and with the planner at 6m/s cruise, from 60m away.
+	import time
+	import VehicleSimModule
+	import VehicleMissionModule
+	import VehicleNavModule
+	latW = 32.881773
+	lonW = -117.235712
+	for cruise in (None, 6.0):
+		sim = VehicleSimModule.vehicleSim(32.881373, -117.235312, head0=45, seed=3, timeLimit=200)
+		with sim:
+			import VehiclePWMModule
+			from VehicleGPSModule import U_blox
+			from navio.mpu9250_better import MPU9250
+			VehiclePWMModule.vehiclePWM.PreviousSpeed = 0
+			esc = VehiclePWMModule.vehiclePWM("esc")
+			servo = VehiclePWMModule.vehiclePWM("servo")
+			ubl = U_blox()
+			imu = MPU9250()
+			imu.initialize()
+			planner = None
+			if (cruise != None):
+				route = VehicleMissionModule.compileRoute([{'lat':latW, 'lon':lonW, 'radius':3.0, 'name':''}])
+				planner = speedPlanner(route, cruise=cruise)
+			nav = VehicleNavModule.vehicleNav(esc, servo, ubl, imu, latW, lonW, speedPlanner=planner)
+			start = sim.time()
+			nav.run()
+			arrival = sim.time() - start
+			for k in range(300): #Let the car roll out after stopping
+				time.sleep(0.01)
+				ubl.GPSfetch()
+		print('cruise %-4s arrived in %.1f s, stopped %.1f m from the waypoint' % (cruise, arrival, sim.distanceTo(latW, lonW)))
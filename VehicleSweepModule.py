@@ -0,0 +1,151 @@
+"""
+Robotritons in-use module for sweeping controller constants over recorded runs.
+
+Purpose: Tune the navigation constants as a batch job instead of field trips. Every combination of a grid of vehicleNav() keyword arguments
+	is replayed (VehicleReplayModule) over every recorded run on all CPU cores, and the combinations are ranked.
+Requirements: The python modules itertools, math, multiprocessing, sys, VehicleReplayModule and VehicleLogLoaderModule (numpy).
+Use: Describe the recorded runs and the grid, then call sweep():
+		runs = [{'path':'waypointData/waypointTest.bin', 'latW':32.881373, 'lonW':-117.235912, 'magMeans':{'x':-7.1, 'y':40.2}}]
+		grid = {'threshold':[4, 8, 12], 'steerMax':[20, 35], 'holdTime':[0.25, 0.5], 'arriveDist':[0.003, 0.005]}
+		for result in sweep(runs, grid)[:5]:
+			print(result['tuning'], result['arrivals'], result['arrivalTime'], result['reversalsPerSecond'])
+	From the shell, with the waypoint and magnetometerMeans of WaypointTest.py and defaultGrid:
+		python VehicleSweepModule.py waypointData/run1.bin waypointData/run2.bin ...
+
+	Every worker process maps the telemetry logs read only with VehicleLogLoaderModule.loadLog() once, in the pool initializer,
+	so the runs are shared through the page cache instead of being pickled to each process with every task.
+
+	The replay is open loop (see VehicleReplayModule), so the metrics describe the controller's reaction to the recorded data:
+		steerRms            rms steer angle, effort
+		reversalsPerSecond  left<->right steering changes per second, chatter
+		arrivals            runs where the controller declared the waypoint reached
+		arrivalTime         mean seconds from the start of a run to the declared arrival, over the runs that arrived
+	sweep() ranks the combinations by rank(): most arrivals first, then the shortest mean arrivalTime, then the fewest
+	reversalsPerSecond and the lowest steerRms as tie-breakers, so a tuning that never reaches the waypoint never ranks above one that
+	does. sweep(key=metric) sorts by that one metric instead, lower first.
+
+	The constants of the request map to vehicleNav(): dead-band 8 degrees is threshold, steer magnitude 35 is steerMax, targetTime 0.5s is
+	holdTime and the 0.005km arrival radius is arriveDist. vehicleNav steers proportionally, so it has no 45 degree band.
+
+Updates:
+- October 19, 2026. Ranked by arrivals and arrival time before chatter instead of chatter alone.
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/multiprocessing.html#module-multiprocessing.pool
+https://docs.scipy.org/doc/numpy/reference/generated/numpy.memmap.html
+"""
+
+import itertools
+import math
+import multiprocessing
+import sys
+
+import VehicleLogLoaderModule
+import VehicleReplayModule
+
+defaultGrid = {
+	'threshold':[4, 8, 12], #Degrees, dead-band of the relative bearing
+	'steerMax':[20, 35], #Steer angle held while the wheels need to turn further
+	'holdTime':[0.25, 0.5, 1.0], #Seconds, targetTime of WaypointTest.py
+	'arriveDist':[0.003, 0.005, 0.008], #Kilometers
+}
+
+def combinations(grid):
+	"""Every combination of a {name:[values]} grid as a list of {name:value} dictionaries"""
+	names = sorted(grid)
+	return [dict(zip(names, values)) for values in itertools.product(*[grid[name] for name in names])]
+
+def runMetrics(results):
+	"""Metrics of one replay() result list"""
+	if not results:
+		return {'steerRms':0.0, 'reversals':0, 'seconds':0.0, 'arrived':False, 'arrivalTime':None}
+	squares = 0.0
+	reversals = 0
+	lastSign = 0
+	for result in results:
+		steer = result[3]
+		squares += steer*steer
+		sign = (steer > 0) - (steer < 0)
+		if (sign != 0):
+			if (lastSign != 0 and sign != lastSign):
+				reversals += 1
+			lastSign = sign
+	seconds = results[-1][0] - results[0][0]
+	arrived = bool(results[-1][5])
+	return {'steerRms':math.sqrt(squares/len(results)), 'reversals':reversals, 'seconds':seconds, 'arrived':arrived,
+		'arrivalTime':seconds if arrived else None}
+
+# ---- Worker Processes ----
+#Set once per worker by initWorker(): [(run, names, records)] where records is the memory mapped telemetry channel
+workerRuns = None
+
+def initWorker(runs):
+	global workerRuns
+	workerRuns = []
+	for run in runs:
+		records = VehicleLogLoaderModule.loadLog(run['path'])['telemetry']
+		workerRuns.append((run, list(records.dtype.names), records))
+
+def evaluateTuning(task):
+	"""Replays every run with one tuning. Runs inside the pool's worker processes so it must stay a module level function"""
+	number, tuning = task
+	metrics = []
+	for run, names, records in workerRuns:
+		results = VehicleReplayModule.replay((names, records), run.get('latW'), run.get('lonW'), run.get('magMeans'), **dict(run.get('tuning', {}), **tuning))
+		metrics.append(runMetrics(results))
+	seconds = sum(m['seconds'] for m in metrics)
+	arrived = [m['arrivalTime'] for m in metrics if m['arrived']]
+	return {
+		'number':number,
+		'tuning':tuning,
+		'runs':len(metrics),
+		'steerRms':sum(m['steerRms'] for m in metrics)/max(len(metrics), 1),
+		'reversalsPerSecond':sum(m['reversals'] for m in metrics)/max(seconds, 1e-9),
+		'arrivals':len(arrived),
+		'arrivalTime':sum(arrived)/len(arrived) if arrived else None,
+	}
+# ---- End Worker Processes ----
+
+def rank(result):
+	"""Sort key of the default ordering: most arrivals, shortest mean arrivalTime, then fewest reversalsPerSecond and lowest steerRms"""
+	return (-result['arrivals'], result['arrivalTime'] == None, result['arrivalTime'], result['reversalsPerSecond'], result['steerRms'],
+		result['number'])
+
+def sweep(runs, grid, key=None, processes=None):
+	"""
+	Replays every run with every combination of grid and returns one result dictionary per combination, best first by rank(),
+	or by the metric key (lower first) when it is given.
+	runs are dictionaries with 'path', 'latW', 'lonW' (for logs that don't record their waypoint), optional 'magMeans' and optional
+	fixed 'tuning' applied under the grid.
+	"""
+	for run in runs:
+		VehicleLogLoaderModule.loadLog(run['path']) #Fail here, not in a worker, on a missing or foreign log
+	tasks = list(enumerate(combinations(grid)))
+	pool = multiprocessing.Pool(processes, initializer=initWorker, initargs=(runs,))
+	try:
+		results = list(pool.imap_unordered(evaluateTuning, tasks))
+	finally:
+		pool.close()
+		pool.join()
+	if (key == None):
+		results.sort(key=rank)
+	else:
+		results.sort(key=lambda r: (r[key] == None, r[key], r['number']))
+	return results
+
+if __name__ == "__main__":
+	import time
+	if (len(sys.argv) < 2):
+		sys.exit('Usage: python VehicleSweepModule.py run.bin [run.bin ...]')
+	#Waypoint and calibration of WaypointTest.py
+	with open('waypointData/magnetometerMeans.txt', 'r') as meansFile:
+		magMeans = {'x':float(meansFile.readline()), 'y':float(meansFile.readline())}
+	runs = [{'path':path, 'latW':32.881373, 'lonW':-117.235912, 'magMeans':magMeans} for path in sys.argv[1:]]
+	wallStart = time.time()
+	results = sweep(runs, defaultGrid)
+	print('%d combinations over %d runs on %d cores in %.1f s' % (len(results), len(runs), multiprocessing.cpu_count(), time.time() - wallStart))
+	for result in results[:10]:
+		tuning = ' '.join('%s=%g' % (name, result['tuning'][name]) for name in sorted(result['tuning']))
+		arrival = '%5.1f s' % result['arrivalTime'] if result['arrivalTime'] != None else '   --  '
+		print('%-58s reversals/s %5.2f  steer rms %5.1f  arrived %d/%d %s' % (tuning, result['reversalsPerSecond'], result['steerRms'], result['arrivals'], result['runs'], arrival))
@@ -0,0 +1,181 @@
+"""
+Robotritons in-use module for logging control loop telemetry.
+
+Purpose: Record one fixed-layout binary record per control loop instead of pushing every sample through logging at DEBUG.
+	A record is packed with a precompiled struct.Struct into a preallocated buffer, and the buffer goes to the file in large blocks,
+	so the loop never formats strings, takes handler locks or writes a file per sample. The logging module stays for events and warnings.
+Requirements: The python modules struct, os and sys.
+Use: Make an object of class telemetryLogger(path, fields) where fields is a list of (name, struct code) pairs, for example
+		telemetry = telemetryLogger('waypointData/waypointBasic.bin', [('time','d'), ('head','f'), ('bearRel','f'), ('timeout','H')])
+	then call telemetry.log(time.time(), head, bearRel, timeout) once per loop with the values in field order, and close() at the end
+	(or use a "with" block). Codes are struct format characters: b B h H i I q Q f d ?. Use 'd' for time and latitude/longitude.
+	Read a log back with readTelemetry(path), stream it in constant memory with names, records = iterTelemetry(path),
+	or convert it for humans with toCSV(path) or from the shell:
+		python VehicleTelemetryModule.py waypointData/waypointBasic.bin [waypointData/waypointBasic.csv]
+
+	File layout: header struct '<4sHHI' (magic 'AVCT', version, record size, schema length), the schema text
+	"name:code,name:code,...", then the records back to back, little endian.
+
+Updates:
+- October 19, 2026. iterTelemetry() returns a recordStream that closes its file on close(), also before iterating.
+- October 19, 2026. iterTelemetry() streams long logs block by block.
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/struct.html#struct.Struct.pack_into
+"""
+
+import os
+import struct
+import sys
+
+telemetryMagic = b'AVCT'
+telemetryVersion = 1
+telemetryHeader = struct.Struct('<4sHHI')
+telemetryCodes = 'bBhHiIqQfd?'
+
+class telemetryLogger:
+
+	def __init__(self, path, fields, blockRecords=2048):
+		for name, code in fields:
+			if (code not in telemetryCodes or len(code) != 1):
+				raise ValueError('telemetry field %s: struct code must be one of %s, not %r' % (name, telemetryCodes, code))
+			if (',' in name or ':' in name):
+				raise ValueError('telemetry field %r: names cannot hold "," or ":"' % name)
+		self.path = path
+		self.names = [name for name, code in fields]
+		self.record = struct.Struct('<' + ''.join(code for name, code in fields))
+		self.size = self.record.size
+		self.buffer = bytearray(blockRecords*self.size) #Preallocated, reused for every block
+		self.view = memoryview(self.buffer)
+		self.offset = 0
+		self.records = 0
+		self.blocks = 0
+
+		schema = ','.join('%s:%s' % field for field in fields).encode('ascii')
+		self.file = open(path, 'wb')
+		self.file.write(telemetryHeader.pack(telemetryMagic, telemetryVersion, self.size, len(schema)))
+		self.file.write(schema)
+
+	def log(self, *values):
+		"""Appends one record. Values in field order"""
+		self.record.pack_into(self.buffer, self.offset, *values)
+		self.offset += self.size
+		self.records += 1
+		if (self.offset == len(self.buffer)):
+			self.file.write(self.buffer)
+			self.offset = 0
+			self.blocks += 1
+
+	def flush(self):
+		"""Writes the partly filled block and flushes the file"""
+		if (self.offset):
+			self.file.write(self.view[:self.offset])
+			self.offset = 0
+			self.blocks += 1
+		self.file.flush()
+
+	def close(self):
+		if not self.file.closed:
+			self.flush()
+			self.file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, excType, excValue, tb):
+		self.close()
+		return False
+
+def readSchema(data, path='telemetry'):
+	"""Returns [fields, record Struct, offset of the first record] from the bytes of a telemetry file"""
+	if (len(data) < telemetryHeader.size):
+		raise ValueError('%s: too short to be a telemetry log' % path)
+	magic, version, size, schemaLength = telemetryHeader.unpack_from(data, 0)
+	if (magic != telemetryMagic):
+		raise ValueError('%s: not a telemetry log' % path)
+	if (version != telemetryVersion):
+		raise ValueError('%s: telemetry version %d, expected %d' % (path, version, telemetryVersion))
+	start = telemetryHeader.size + schemaLength
+	schema = data[telemetryHeader.size:start].decode('ascii')
+	fields = [tuple(field.split(':')) for field in schema.split(',')]
+	record = struct.Struct('<' + ''.join(code for name, code in fields))
+	if (record.size != size):
+		raise ValueError('%s: schema describes %d byte records, header says %d' % (path, record.size, size))
+	return [fields, record, start]
+
+def readTelemetry(path):
+	"""Returns [names, records] of a telemetry log where records is a list of tuples. A truncated last record is dropped"""
+	with open(path, 'rb') as telemetryFile:
+		data = telemetryFile.read()
+	fields, record, start = readSchema(data, path)
+	end = start + (len(data) - start)//record.size*record.size
+	return [[name for name, code in fields], [record.unpack_from(data, offset) for offset in range(start, end, record.size)]]
+
+def iterTelemetry(path, blockRecords=4096):
+	"""
+	Returns [names, records] where records is a recordStream of tuples reading "blockRecords" records at a time, in constant memory.
+	records owns the open file, call records.close() when not reading it to the end.
+	"""
+	telemetryFile = open(path, 'rb')
+	try:
+		head = telemetryFile.read(telemetryHeader.size)
+		if (len(head) == telemetryHeader.size):
+			head += telemetryFile.read(telemetryHeader.unpack(head)[3])
+		fields, record, start = readSchema(head, path)
+	except:
+		telemetryFile.close()
+		raise
+	return [[name for name, code in fields], recordStream(telemetryFile, record, blockRecords)]
+
+class recordStream:
+	"""Iterator behind iterTelemetry(). Closes the file when exhausted or on close(), even before the first record. A truncated last record is dropped"""
+
+	def __init__(self, telemetryFile, record, blockRecords):
+		self.file = telemetryFile
+		self.records = self.__read(record, blockRecords)
+
+	def __read(self, record, blockRecords):
+		try:
+			while True:
+				block = self.file.read(blockRecords*record.size)
+				for offset in range(0, len(block) - record.size + 1, record.size):
+					yield record.unpack_from(block, offset)
+				if (len(block) < blockRecords*record.size):
+					break
+		finally:
+			self.file.close()
+
+	def __iter__(self):
+		return self
+
+	def __next__(self):
+		return next(self.records)
+	next = __next__ #python 2
+
+	def close(self):
+		self.records.close()
+		self.file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, excType, excValue, tb):
+		self.close()
+		return False
+
+def toCSV(path, csvPath=None):
+	"""Writes a telemetry log as CSV with a header row. Returns the CSV path"""
+	if (csvPath == None):
+		csvPath = os.path.splitext(path)[0] + '.csv'
+	names, records = readTelemetry(path)
+	with open(csvPath, 'w') as csvFile:
+		csvFile.write(','.join(names) + '\n')
+		for values in records:
+			csvFile.write(','.join(repr(value) for value in values) + '\n')
+	return csvPath
+
+if __name__ == "__main__":
+	if (len(sys.argv) < 2):
+		sys.exit('Usage: python VehicleTelemetryModule.py log.bin [log.csv]')
+	print(toCSV(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None))
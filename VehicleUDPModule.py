@@ -0,0 +1,141 @@
+"""
+Robotritons in-use module for streaming live telemetry to a ground station over UDP.
+
+Purpose: See what the car thinks during a run (position, heading, relative bearing, steer, throttle, loop time) on a laptop instead of
+	through console warnings over ssh. Packets are small fixed-layout binary structs sent from a non-blocking socket at a limited rate,
+	so the control loop never waits on the network and a lost or absent ground station costs nothing.
+Requirements: The python modules socket, struct, time and errno.
+Use: On the vehicle make an object of class udpTelemetry(host, port, rate) and call send(...) (or sendNav(nav, loopTime)) every loop.
+	Calls between packets return at once, so it is safe to call it at the full loop rate.
+		udp = udpTelemetry('255.255.255.255', 14660, rate=10) #Broadcast, any laptop on the vehicle's network can listen
+		udp.sendNav(nav, time.time() - loopTime)
+	On the ground station run GroundStation.py, or make an object of class udpReceiver(port) and call receive().
+	Both ends work on one machine with host '127.0.0.1', see the example at the bottom of this file.
+
+	Packet: struct '<2sBIdddfffff', magic 'AV', version, sequence number, vehicle time, lat, lon (degrees), heading, relative bearing,
+	steer angle, throttle (esc.accel() argument) and loop time in seconds. NaN marks values not known yet. Little endian, 51 bytes (packet.size).
+	The receiver counts sequence gaps as lost packets.
+
+Updates:
+- October 19, 2026. Created the file.
+
+Resources:
+https://docs.python.org/2.7/library/socket.html#socket.socket.setblocking
+https://docs.python.org/2.7/library/struct.html
+"""
+
+import errno
+import socket
+import struct
+import time
+
+packetMagic = b'AV'
+packetVersion = 1
+packet = struct.Struct('<2sBIdddfffff')
+packetFields = ('seq', 'time', 'lat', 'lon', 'head', 'relBear', 'steer', 'throttle', 'loopTime')
+defaultPort = 14660
+nan = float('nan')
+
+def decode(data):
+	"""Returns the dictionary of packetFields in a packet, or None when data isn't a telemetry packet"""
+	if (len(data) != packet.size):
+		return None
+	values = packet.unpack(data)
+	if (values[0] != packetMagic or values[1] != packetVersion):
+		return None
+	return dict(zip(packetFields, values[2:]))
+
+class udpTelemetry:
+
+	def __init__(self, host='127.0.0.1', port=defaultPort, rate=10.0):
+		self.address = (host, port)
+		self.period = 1.0/rate #Seconds between packets
+		self.nextTime = 0.0
+		self.seq = 0
+		self.sent = 0
+		self.dropped = 0 #Packets the socket refused (no route, buffer full)
+		self.buffer = bytearray(packet.size)
+		self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		if host.endswith('.255'):
+			self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+		self.sock.setblocking(False)
+
+	def send(self, lat, lon, head, relBear, steer, throttle, loopTime):
+		"""Sends a packet when the last one is at least 1/rate seconds old. Returns True when one was sent"""
+		now = time.time()
+		if (now < self.nextTime):
+			return False
+		self.nextTime = now + self.period
+		packet.pack_into(self.buffer, 0, packetMagic, packetVersion, self.seq, now, lat, lon, head, relBear, steer, throttle, loopTime)
+		self.seq = (self.seq + 1) & 0xFFFFFFFF
+		try:
+			self.sock.sendto(self.buffer, self.address)
+		except socket.error as e:
+			if (e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS, errno.ENETUNREACH, errno.EHOSTUNREACH, errno.ECONNREFUSED)):
+				raise
+			self.dropped += 1
+			return False
+		self.sent += 1
+		return True
+
+	def sendNav(self, nav, loopTime):
+		"""send() the state of a VehicleNavModule.vehicleNav after its tick()"""
+		if (self.nextTime > time.time()): #Skip building the arguments between packets
+			return False
+		if (nav.pos == None):
+			lat, lon = nan, nan
+		else:
+			lat, lon = nav.pos[0], nav.pos[1]
+		return self.send(lat, lon, nav.head, nav.relBear, nav.steer, nav.command, loopTime)
+
+	def close(self):
+		self.sock.close()
+
+class udpReceiver:
+
+	def __init__(self, port=defaultPort, host=''):
+		self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+		self.sock.bind((host, port))
+		self.received = 0
+		self.lost = 0
+		self.invalid = 0
+		self.lastSeq = None
+		self.sender = None
+
+	def receive(self, timeout=1.0):
+		"""Returns the next packet's dictionary, or None after timeout seconds without one"""
+		self.sock.settimeout(timeout)
+		while True:
+			try:
+				data, self.sender = self.sock.recvfrom(1024)
+			except socket.timeout:
+				return None
+			state = decode(data)
+			if (state == None):
+				self.invalid += 1
+				continue
+			if (self.lastSeq != None):
+				gap = (state['seq'] - self.lastSeq - 1) & 0xFFFFFFFF
+				if (gap < 1000): #A bigger jump is a restarted vehicle, not loss
+					self.lost += gap
+			self.lastSeq = state['seq']
+			self.received += 1
+			return state
+
+	def close(self):
+		self.sock.close()
+
+if __name__ == "__main__":
+	#Loopback check: 50 packets at 100Hz from a sender to a receiver on this machine
+	receiver = udpReceiver(defaultPort, '127.0.0.1')
+	sender = udpTelemetry('127.0.0.1', defaultPort, rate=100)
+	k = 0
+	while (sender.sent < 50):
+		if sender.send(32.881373, -117.235912 + k*1e-7, 12.5, -3.0, 10.0, 1, 0.002):
+			state = receiver.receive(1.0)
+			k += 1
+		time.sleep(0.001)
+	print('sent %d, received %d, lost %d, last %s' % (sender.sent, receiver.received, receiver.lost, state))
+	sender.close()
+	receiver.close()
@@ -39,7 +39,6 @@ https://github.com/ArduPilot/ardupilot/pull/2504 #Someone else did it their own
 import sys
 import time
 import math
-import spidev
 import navio.util
 import VehiclePWMModule
 from VehicleGPSModule import *
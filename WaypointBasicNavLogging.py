@@ -12,6 +12,14 @@ Use: Set a waypoint and the vehicle on the ground. In the code make sure to inst
 	and the magnetometer using imu=MPU9250()
 
 Updates:
+- October 19, 2026. The log file is written by a VehicleLogWriterModule thread so a slow SD card can't stall the control loop.
+	Lines that don't fit the queue are dropped and counted, the counters are logged on exit.
+
+- October 19, 2026. The control loop writes one binary record per loop to 'waypointData/waypointBasic.bin' through VehicleTelemetryModule
+	instead of an INFO line per loop in 'waypointData/waypointBasic.csv'. Convert it with: python VehicleTelemetryModule.py waypointData/waypointBasic.bin
+
+- October 19, 2026. The waypoint is read from the route file 'waypointData/mission.csv' through VehicleMissionModule.
+
 - September 10, 2016. Wrote structure for a single waypoint navigation. Shortened a few comments to improve readability. Included logging to
 	console and file 'waypointData/waypointBasic.csv'. Added new exception handling.
 
@@ -51,9 +59,11 @@ import traceback
 import sys
 import time
 import math
-import spidev
 import navio.util
 import VehiclePWMModule
+import VehicleMissionModule
+import VehicleTelemetryModule
+import VehicleLogWriterModule
 from VehicleGPSModule import *
 from navio.mpu9250_better import MPU9250
 
@@ -64,9 +74,14 @@ navio.util.check_apm()
 #2) Handlers send the log records to particular desitnations.
 #3) Formatters specify the layout of the final output
 
-#All logging defaults to the root logger. Configure the default destination with root logger's built-in handler
-logging.basicConfig(level=logging.DEBUG,format='%(levelname)-8s,%(message)s',filename='waypointData/waypointBasic.csv',filemode='w')
+#All logging defaults to the root logger.
 log_root = logging.getLogger('')#Assign an easy name to the root logger
+log_root.setLevel(logging.DEBUG)
+#The file handler only queues formatted lines, a writer thread does the file I/O. Replaces basicConfig(filename=...) which wrote on this thread.
+logWriter = VehicleLogWriterModule.logWriter('waypointData/waypointBasic.csv')
+handler_file = VehicleLogWriterModule.queueHandler(logWriter)
+handler_file.setFormatter(logging.Formatter('%(levelname)-8s,%(message)s'))
+log_root.addHandler(handler_file)
 #Create a separate handler output to the console stream. By default it's messages will propagate to the root ancestor.
 handler_console = logging.StreamHandler()
 handler_console.setLevel(logging.WARNING) #Change debug level to control console output <----------
@@ -81,27 +96,14 @@ log_root.addHandler(handler_console)
 
 #Example in text logging call
 #log_root.info('This is some data %f' % variable)
+#Per loop data goes to the binary telemetry log instead, see "Telemetry" before the control loop
 # ----- End Loggin Setup -----
 
 # ---- Waypoint ----
-#EBU1 Loading Dock parkinglot south exit
-#lat = 32.882171
-#lon = -117.235711
-
-#Engineer Ln top of the "T"
-#lat = 32.882281
-#lon = -117.235354
-
-#Engineer Ln south end
-#lat = 32.881772
-#lon = -117.234741
-
-#EBU 1 Loading Dock street south end
-#lat = 32.881373
-#lon =-117.235912
-#EBU 1 Back Patio
-latW = 32.871894
-lonW = -117.2350076
+#The route lives in 'waypointData/mission.csv'. Edit that file (the other known waypoints are commented in it) instead of this code.
+route = VehicleMissionModule.loadRoute('waypointData/mission.csv')
+latW = route[0].lat
+lonW = route[0].lon
 phiW = latW*(math.pi/180)
 lamW = lonW*(math.pi/180)
 rE = 6371.008 #Earth's mean volumetric radius
@@ -255,6 +257,12 @@ bearWP = 90
 toSpeed = 0 #Stop speed
 toAngle = 0
 
+# ---- Telemetry ----
+#One fixed layout record per loop. A text log line every loop was the slowest part of the loop.
+telemetry = VehicleTelemetryModule.telemetryLogger('waypointData/waypointBasic.bin',
+	[('time','d'), ('xRaw','f'), ('yRaw','f'), ('headDegSign','f'), ('bearWP','f'), ('bearRel','f'), ('timeout','i')])
+# ---- End Telemetry ----
+
 try:
 	log_root.warning('Begin try:while(True):')
 	while(True):
@@ -339,7 +347,7 @@ try:
 			bearRel=bearBasic-360 #Subtracting by 360 adds sign
 		else:
 			bearRel=bearBasic
-		log_root.info('bearRel: %f' %bearRel)
+		telemetry.log(time.time(), xRaw, yRaw, headDegSign, bearWP, bearRel, timeout)
 		# ---------------------------------------------------
 		# ---- End Read Magnetometer To Control Steering ----
 		# ---------------------------------------------------
@@ -399,4 +407,8 @@ finally:
 	vehicle_esc.stop()
 	vehicle_esc.rest()
 	vehicle_servo.rest()
+	telemetry.close()
+	log_root.warning('Telemetry: %d records' % telemetry.records)
+	log_root.warning('Log writer: %(written)d written, %(dropped)d dropped, %(late)d late, max latency %(maxLatency).3f s' % logWriter.stats())
+	logWriter.close()
 	sys.exit()
@@ -12,6 +12,21 @@ Use: Set a waypoint and the vehicle on the ground. In the code make sure to inst
 	and the magnetometer using imu=MPU9250()
 
 Updates:
+- October 19, 2026. Broadcasts live telemetry over UDP at 10Hz through VehicleUDPModule, watch it with GroundStation.py.
+
+- October 19, 2026. The navigation loop runs on VehicleNavModule.vehicleNav (updateBearing=False, steering towards the averaged initial bearing
+	as before) and every tick is logged with its navFields, so a run can be fed back through other tuning with VehicleReplayModule.
+	Fixed the "init targetTime = 0" syntax error.
+
+- October 19, 2026. The log file is written by a VehicleLogWriterModule thread so a slow SD card can't stall the control loop.
+	Lines that don't fit the queue are dropped and counted, the counters are logged on exit.
+
+- October 19, 2026. The control loop writes one binary record per loop to 'waypointData/waypointTest.bin' through VehicleTelemetryModule
+	instead of DEBUG/INFO lines per loop and per fix in 'waypointData/waypointBasic.csv'.
+	Convert it with: python VehicleTelemetryModule.py waypointData/waypointTest.bin
+
+- October 19, 2026. Calibrate gyro and accelerometer offsets at startup, cached in 'waypointData/imuOffsets.txt'.
+
 - September 10, 2016. Wrote structure for a single waypoint navigation. Shortened a few comments to improve readability. Included logging to
 	console and file 'waypointData/waypointBasic.csv'. Added new exception handling.
 
@@ -51,9 +66,12 @@ import traceback
 import sys
 import time
 import math
-import spidev
 import navio.util
 import VehiclePWMModule
+import VehicleNavModule
+import VehicleTelemetryModule
+import VehicleLogWriterModule
+import VehicleUDPModule
 from VehicleGPSModule import *
 from navio.mpu9250_better import MPU9250
 
@@ -65,9 +83,14 @@ navio.util.check_apm()
 #2) Handlers send the log records to particular desitnations.
 #3) Formatters specify the layout of the final output
 
-#All logging defaults to the root logger. Configure the default destination with root logger's built-in handler
-logging.basicConfig(level=logging.DEBUG,format='%(levelname)-8s,%(message)s',filename='waypointData/waypointBasic.csv',filemode='w')
+#All logging defaults to the root logger.
 log_root = logging.getLogger('')#Assign an easy name to the root logger
+log_root.setLevel(logging.DEBUG)
+#The file handler only queues formatted lines, a writer thread does the file I/O. Replaces basicConfig(filename=...) which wrote on this thread.
+logWriter = VehicleLogWriterModule.logWriter('waypointData/waypointBasic.csv')
+handler_file = VehicleLogWriterModule.queueHandler(logWriter)
+handler_file.setFormatter(logging.Formatter('%(levelname)-8s,%(message)s'))
+log_root.addHandler(handler_file)
 #Create a separate handler output to the console stream. By default it's messages will propagate to the root ancestor.
 handler_console = logging.StreamHandler()
 handler_console.setLevel(logging.WARNING) #Change debug level to control console output <----------
@@ -82,6 +105,7 @@ log_root.addHandler(handler_console)
 
 #Example in text logging call
 #log_root.info('This is some data %f' % variable)
+#Per loop data goes to the binary telemetry log instead, see "Telemetry" before the control loop
 # ----- End Logging Setup -----
 # -----------------------------
 
@@ -107,9 +131,6 @@ lonW =-117.235912
 
 #latW = 32.871894
 #lonW = -117.2350076
-phiW = latW*(math.pi/180)
-lamW = lonW*(math.pi/180)
-rE = 6371.008 #Earth's mean volumetric radius
 # ---- End Waypoint ----
 # ----------------------
 
@@ -177,44 +198,9 @@ def GPSNavInit():
 	time.sleep(0.5)
 	vehicle_servo.center()
 
-#magBearWPsign = 0
 def GPSNavUpdate(): #MagneticBearing and location update
-	pos = ubl.GPSfetch()
-	if (pos != None):
-		#After the GPS initialization it will take about 7000 loops of pos=ubl.GPSfetch so about 7 valid GPS (pos !=None) before data comes in consistantly
-		log_root.warning('lat,lon')
-		log_root.debug('%f,%f' %(pos['lat'],pos['lon']))
-		if (pos['hAcc'] <= 10):#If GPS accurate (10 is ok)
-			#Prepare coordinate variables in order to calculate magnetic bearing to waypoint
-			lat = pos['lat']
-			lon = pos['lon']
-			phi = lat*(math.pi/180)
-			lam = lon*(math.pi/180)
-			
-			#Calculate the Approximate Distance from waypoint using an Equirectangular map model
-			'''
-			The original formula from online calculates clockwise so 0<->+180 is EAST and 0<->-180 is WEST
-			x = (lamW-lam)*math.cos((phi+phiW)/2)
-			y = (phiW-phi)
-			'''
-			#My own formula calculates counterclockwise so 0<->+180 is WEST and 0<->-180 is EAST
-			x = (lam-lamW)*math.cos((phi+phiW)/2)
-			y = (phiW-phi)
-			d = rE*math.sqrt((x*x)+(y*y)) #Only use is for debugging
-			
-			#Calculate the Forward/Magnetic Bearing from previous Equirectangular map model.
-			#Forward/Magnetic bearing is the angle from north to the waypoint with vehicle location as center.
-			#Ex: waypoint to left and we are on right, so magnetic bearing is 90
-			#Ex: waypoint to bottom right and we are on left, so magnetic bearing is 250
-			magBearWPSign = math.atan2(x,y)*(180/math.pi) #N=0<->+180 is WEST and N=0<->-180 is EAST
-			##magBearWP = bearWPsign%360 #removes the sign so counter clockwise 0<->360
-			log_root.info('magnetic bearing signed to wp,%f' %magBearWPSign)
-			#bearWP is changing by no more than 1.8 degrees even after the vehicle has moved 5 meters
-			return [lat,lon,magBearWPSign,d] #magBearWP is later used to calculate RelativeBearing, current or target.
-		else: #GPS not accurate. After multiple tests, i've not yet gotten a "bad accuracy" signal
-			log_root.warning('Bad accuracy!')
-			#Timeout is not reset so vehicle will either: continue moving for a few more loops then stop <-or-> continue moving when horizontal accuraccy is good
-	return None
+	#Returns [lat,lon,magBearWPSign,d] of a new accurate position or None. The bearing math lives in VehicleNavModule.vehicleNav.bearingTo()
+	return nav.gpsUpdate()
 	# --- End GPS Methods ---
 	# -----------------------
 	
@@ -285,30 +271,9 @@ def calibrateMag(auto=False):
 	#calMeans #Returns the x,y means from manual or file calibration
 	return {'x':xMean,'y':yMean}
 
-magMeans = {'x':0,'y':0}
 def updateMag():#current heading update
-		#Note: The magnetometer data is stored as a list ordered [x,y,z]
-		#Note: x+ is directed towards the front of the RPI2/Navio+ and y+ is directed towards the right of the RPI2/Navio+
-		#Note: all calculations assume x is the verticle axis and y is horizontal. Upsidedown vehicle reverses E<->W
-		imu.read_mag()
-		xRaw = imu.magnetometer_data[0]
-		yRaw = imu.magnetometer_data[1]
-		
-		#Translate current reading so that it lies on a circle centered on the origin
-		yCtrd = yRaw-magMeans['y']#Current readings minus the mean
-		xCtrd = xRaw-magMeans['x']
-		
-		#Calculate vehicle's current heading counterclockwise N=0<->+180(WEST) and N=0<->-180(EAST). Heading is angle between the vehicle and NORTH.
-		headNoDecRadSign = math.atan2(yCtrd,xCtrd) #atan2 in python takes (y, x). This is opposite to excel
-		headNoDecDegSign = headNoDecRadSign*(180/math.pi)
-		##log_root.info('headDegSign: %f' %headDegSign)
-		headDegSign = headNoDecDegSign + 11.7 #Adjust for declination (SD=11.7, boulder=8.2, avg = 10)
-		
-		#Convert the heading to range from 0<->360, WEST=90, EAST=270
-		#headRad = headRadSign%math.pi #Good for debugging, but unecessary to calculate realative bearing
-		##headDeg = headDegSign%360 #Good for debugging, but unecessary to calculate realative bearing
-		log_root.debug('headDegSign,%f' %headDegSign)
-		return headDegSign
+	#Returns the heading counterclockwise N=0<->+180(WEST) and N=0<->-180(EAST) with declination, see VehicleNavModule.vehicleNav.magUpdate()
+	return nav.magUpdate()
 	# --- End IMU Methods ---
 	# -----------------------
 # ---- End Define Methods ----
@@ -324,6 +289,9 @@ try:
 	#Initialize IMU & GPS
 	vehicle_servo.rest()
 	imu.initialize()
+	#Remove gyro and accelerometer bias in the MPU9250 offset registers. Delete the cache file to recalibrate while standing still.
+	imuOffsets = imu.calib_offsets(cache_file='waypointData/imuOffsets.txt')
+	log_root.warning('imu offsets gyro %s acc %s' % (imuOffsets['gyro'],imuOffsets['acc']))
 	GPSNavInit()
 	log_root.warning('End initialize IMU & GPS')
 # ---- End Initialize IMU & GPS ----
@@ -354,9 +322,18 @@ except:
 #Know next location
 #calculate next waypoint heading
 #Set course to move towards next waypoint
-timeout = 0
-toSpeed = 0 #Stop speed
-toAngle = 0
+# ---- Navigation ----
+#The controller of the old loop, see VehicleNavModule. Steers towards the averaged initial bearing like before.
+nav = VehicleNavModule.vehicleNav(vehicle_esc, vehicle_servo, ubl, imu, latW, lonW, magMeans=magMeans, updateBearing=False)
+# ---- End Navigation ----
+
+# ---- Telemetry ----
+#One fixed layout record per loop with the raw inputs and outputs of the tick, see VehicleNavModule.navFields.
+#Replay a run offline with: python VehicleReplayModule.py waypointData/waypointTest.bin
+telemetry = VehicleTelemetryModule.telemetryLogger('waypointData/waypointTest.bin', VehicleNavModule.navFields)
+#Live state for GroundStation.py, broadcast on the vehicle's network. Non-blocking, a missing ground station costs nothing.
+udp = VehicleUDPModule.udpTelemetry('255.255.255.255', VehicleUDPModule.defaultPort, rate=10)
+# ---- End Telemetry ----
 
 try:
 	log_root.warning('Begin try')
@@ -373,7 +350,6 @@ try:
 	#Create an average to calculate inital waypoint bearing
 	x = 0
 	sumPos = [0,0,0,0]
-	sumHead = 0
 	while (True):
 		onePos = GPSNavUpdate()
 		oneHead = updateMag()
@@ -382,7 +358,6 @@ try:
 			sumPos[1] = sumPos[1] + onePos[1]
 			sumPos[2] = sumPos[2] + onePos[2]
 			sumPos[3] = sumPos[3] + onePos[3]
-			sumHead = sumHead + sumHead
 			x = x + 1
 		if x == 5:
 			break
@@ -392,112 +367,18 @@ try:
 	initPos[1] = sumPos[1]/x
 	initPos[2] = sumPos[2]/x
 	initPos[3] = sumPos[3]/x
-	#Initial read Magnetometer to receive an updated headingDegreesSigned
-	initHead = sumHead/x
+	nav.bearing = initPos[2] #updateBearing=False keeps steering towards this bearing
 	log_root.warning('Begin update while(True)')
-	
-	init targetTime = 0
-	steerAngle = 0
+
+	#Each tick reads the GPS and magnetometer, steers towards the waypoint, and drives until the waypoint or a GPS timeout
 	while(True):
-		#Constantly read GPS to receive an updated [lat,lon,magneticBearingSigned]
-		curPos = GPSNavUpdate()
-		#Constantly read Magnetometer to receive an updated headingDegreesSigned
-		curHead = updateMag()
-		#MagneticBearing and HeadingDegreesSigned are both necessary to calculate relative bearing
-		
-		#	Note:Relative bearing is the angle between vehicle's heading and the measured magneticBearing to the waypoint
-		#Calculate InitialCurrentRelativeBearing as the angle between the current heading and the initial magneticBearing
-		circleAlign = (initPos[2] - curHead)%360 #This just rotates the cirlce so that its 0<->360 aligns with the heading at "0". Aka the waypoint is around the perspective of the vehicle.
-		if (circleAlign > 180): #Checking then subtracting by 360 gives negative sign to anything clockwise of our heading
-			initRelBearSign = circleAlign - 360 #Subtracting by 
-		else:
-			initRelBearSign = circleAlign
-		log_root.info('initRelBearSign, %f' %initRelBearSign)
-		
-		# ---- Continuous Steering ----
-		
-		lastAngle = steerAngle
-
-		if (abs(initRelBearSign) > 8):
-			if (initRelBearSign > 0): #If waypoint is counterclockwise then turn LEFT
-				steerMax = 35
-			else: #waypoint is clockwise turn RIGHT
-				steerMax = -35
-			steerAngle = initRelBearSign*35/180
-		else:
-			steerAngle = 0
-
-		deltaSteer = abs(steerAngle) - abs(lastAngle)
-		if (deltaSteer < 0): #Then lastAngle is bigger and we want to steer smaller
-			compSteer = 0
-		else:
-			compSteer = steerMax
-		
-		if (time.time() < targetTime):
-			vehicle_servo.steer(compSteer)
-			#angleLast = compSteer
-		else:
-			vehicle_servo.steer(steerAngle)
-			targetTime = time.time()+0.5
-			
-		#vehicle_servo.steer(initRelBearSign*35/180)#steer(+-35) is largest value and initRelBearSign is signed
-		'''
-		if (abs(relBear)>8): #If not bearing in correct direction. Gets rid of noise.
-			if (relBear >0): #If waypoint is counterclockwise of heading, turn LEFT
-				vehicle_servo.steer(35)
-			else: #If waypoint is clockwise of heading, turn RIGHT
-				vehicle_servo.steer(-35)
-		else:#If bearing in correct direction, CENTERED
-			vehicle_servo.center()
-			#time.sleep(0.05)
-		'''
-		# ---- End Continuous Steering ----
-		
-		# ---- Waypoint Approach And Speed ----
-		#lat smallest precision = 0.000008 (accurate and consistent within 8 ft)
-		#lon smallest precision = 0.00002 (accurate and consistent within 8 ft)
-		#lat/lon combined smallest precision = 0.00002,0.00002 (reliable geofence of 10ftx10ft square)
-		#May need to adjust timeout period as precision threshold changes.
-		if (curPos != None):
-			if (curPos[3] <= .005):
-				log_root.warning('Waypoint!')
-				vehicle_esc.stop()
-				vehicle_esc.rest()
-				raise KeyboardInterrupt
-			else: #Not arrived at destination...
-				vehicle_esc.accel(1)
-			timeout = 0 #Reset GPS timeout since GPS received a usable message
-		elif (timeout < 150): #Otherwise check if GPS hasn't timed out, then GO
-			vehicle_esc.accel(1)
-		else: #But when GPS times out, STOP
-			vehicle_esc.stop()
-			vehicle_esc.rest()
-		timeout = timeout + 1 #Iterate timeout
-		'''
-			if (abs(curPos[0]-latW) <= 0.00007): #0.00002
-				latCur = True
-			else:
-				latCur = False
-			if (abs(curPos[1]-lonW) <= 0.00007): #0.00002
-				lonCur = True
-			else:
-				lonCur = False
-			if ( latCur==True and lonCur==True): #If we've reached the geofenced waypoint
-				log_root.warning('Waypoint!')
-				vehicle_esc.stop()
-				vehicle_esc.rest()
-				raise KeyboardInterrupt
-			else: #Not arrived at destination...
-				vehicle_esc.accel(1)
-			timeout = 0 #Reset GPS timeout since GPS received a usable message
-		elif (timeout < 150): #Otherwise check if GPS hasn't timed out, then GO
-			vehicle_esc.accel(1)
-		else: #But when GPS times out, STOP
-			vehicle_esc.stop()
-			vehicle_esc.rest()
-		timeout = timeout + 1 #Iterate timeout
-		'''
-		# ---- End Waypoint Approach And Speed ----
+		loopTime = time.time()
+		arrived = nav.tick()
+		telemetry.log(*nav.record(loopTime))
+		udp.sendNav(nav, time.time() - loopTime)
+		if arrived:
+			log_root.warning('Waypoint!')
+			raise KeyboardInterrupt
 except KeyboardInterrupt:
 	log_root.warning('Abort@while(True): KeyboardInterrupt')
 except TypeError:
@@ -508,4 +389,9 @@ finally:
 	vehicle_esc.stop()
 	vehicle_esc.rest()
 	vehicle_servo.rest()
+	telemetry.close()
+	log_root.warning('Telemetry: %d records, %d UDP packets sent, %d dropped' % (telemetry.records, udp.sent, udp.dropped))
+	udp.close()
+	log_root.warning('Log writer: %(written)d written, %(dropped)d dropped, %(late)d late, max latency %(maxLatency).3f s' % logWriter.stats())
+	logWriter.close()
 	sys.exit()
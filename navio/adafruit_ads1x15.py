@@ -1,7 +1,6 @@
 #!/usr/bin/python
 
 import time
-import smbus
 from adafruit_i2c import Adafruit_I2C
 
 # ===========================================================================
@@ -14,7 +13,7 @@ from adafruit_i2c import Adafruit_I2C
 # should be
 #              __ADS1015_REG_CONFIG_DR_920SPS    = 0x0060
 #
-# NOT IMPLEMENTED: Conversion ready pin, page 15 datasheet.
+# Conversion ready pin, page 15 datasheet, is used by the streaming mode (startStream).
 # ===========================================================================
 
 class ADS1x15:
@@ -126,6 +125,17 @@ class ADS1x15:
     512:__ADS1015_REG_CONFIG_PGA_0_512V,
     256:__ADS1015_REG_CONFIG_PGA_0_256V
   }
+  # Dictionary with the input multiplexer settings, keyed by channel or (chP, chN)
+  muxADS1x15 = {
+    0:__ADS1015_REG_CONFIG_MUX_SINGLE_0,
+    1:__ADS1015_REG_CONFIG_MUX_SINGLE_1,
+    2:__ADS1015_REG_CONFIG_MUX_SINGLE_2,
+    3:__ADS1015_REG_CONFIG_MUX_SINGLE_3,
+    (0, 1):__ADS1015_REG_CONFIG_MUX_DIFF_0_1,
+    (0, 3):__ADS1015_REG_CONFIG_MUX_DIFF_0_3,
+    (1, 3):__ADS1015_REG_CONFIG_MUX_DIFF_1_3,
+    (2, 3):__ADS1015_REG_CONFIG_MUX_DIFF_2_3
+  }
 
 
   # Constructor
@@ -151,6 +161,15 @@ class ADS1x15:
     # any function that accepts a pga value must update this.
     self.pga = 6144
 
+    # Last config word written by writeConfig(), used by ADS1x15Scanner to skip rewrites
+    self.lastConfig = None
+
+    # Streaming mode state, see startStream()
+    self.streamThread = None
+    self.streamPin = None
+    self.streamCount = 0
+    self.streamSize = 1
+
 
   def readADCSingleEnded(self, channel=0, pga=6144, sps=250):
     "Gets a single-ended ADC reading from the specified channel in mV. \
@@ -521,6 +540,196 @@ class ADS1x15:
 	  return ( (result[0] << 8) | (result[1]) )*self.pga/32768.0
 
 
+  # ===========================================================================
+  # Streaming mode
+  #
+  # The ADC is left in continuous conversion and a background thread copies
+  # every conversion into a preallocated ring buffer together with its
+  # time.time() timestamp. With rdyPin (a navio.gpio pin number wired to
+  # ALERT/RDY) the comparator is put in conversion-ready mode (Hi_thresh MSB=1,
+  # Lo_thresh MSB=0, datasheet page 15) and the thread wakes on the falling
+  # edge of every conversion. Without it the thread reads once per 1/sps.
+  # ===========================================================================
+
+  def startStream(self, channel=0, pga=6144, sps=860, bufferSize=4096, rdyPin=None):
+    "Starts streaming conversions from a single-ended channel (0-3) or a \
+    differential (chP, chN) tuple into a ring buffer of bufferSize samples. \
+    Use readStream() or streamSamples() to collect the samples and \
+    stopStream() to stop converting."
+    import array
+    import threading
+
+    if (self.streamThread != None):
+      self.stopStream()
+
+    # Continuous mode. The comparator only drives ALERT/RDY when a pin is used
+    config = self.__ADS1015_REG_CONFIG_CLAT_NONLAT  | \
+             self.__ADS1015_REG_CONFIG_CPOL_ACTVLOW | \
+             self.__ADS1015_REG_CONFIG_CMODE_TRAD   | \
+             self.__ADS1015_REG_CONFIG_MODE_CONTIN
+    if (rdyPin != None):
+      config |= self.__ADS1015_REG_CONFIG_CQUE_1CONV
+    else:
+      config |= self.__ADS1015_REG_CONFIG_CQUE_NONE
+
+    if (self.ic == self.__IC_ADS1015):
+      if (sps not in self.spsADS1015):
+        sps = 1600
+      config |= self.spsADS1015[sps]
+    else:
+      if (sps not in self.spsADS1115):
+        sps = 250
+      config |= self.spsADS1115[sps]
+
+    if (pga not in self.pgaADS1x15):
+      pga = 6144
+    config |= self.pgaADS1x15[pga]
+    self.pga = pga
+
+    mux = self.muxADS1x15.get(channel)
+    if (mux == None):
+      if (self.debug):
+        print "ADS1x15: Invalid channel specified: %s" % (channel,)
+      return -1
+    config |= mux | self.__ADS1015_REG_CONFIG_OS_SINGLE
+
+    # Conversion-ready mode of the ALERT/RDY pin
+    if (rdyPin != None):
+      self.i2c.writeList(self.__ADS1015_REG_POINTER_HITHRESH, [0x80, 0x00])
+      self.i2c.writeList(self.__ADS1015_REG_POINTER_LOWTHRESH, [0x00, 0x00])
+      import navio.gpio
+      self.streamPin = navio.gpio.Pin(rdyPin)
+      self.streamPin.set_edge("falling")
+
+    self.streamSize = bufferSize
+    self.streamTimes = array.array('d', [0.0]) * bufferSize
+    self.streamValues = array.array('d', [0.0]) * bufferSize
+    self.streamCount = 0 # Total samples written. The newest is at (streamCount-1) % streamSize
+    self.streamPeriod = 1.0/sps
+    self.streamRun = True
+
+    self.i2c.writeList(self.__ADS1015_REG_POINTER_CONFIG, [(config >> 8) & 0xFF, config & 0xFF])
+    self.streamThread = threading.Thread(target=self.__streamLoop)
+    self.streamThread.daemon = True
+    self.streamThread.start()
+    return sps
+
+  def __streamLoop(self):
+    period = self.streamPeriod
+    pin = self.streamPin
+    nextTime = time.time() + period
+    while (self.streamRun):
+      if (pin != None):
+        if (not pin.wait_edge(10*period)):
+          continue # No conversion finished, the loop re-checks streamRun
+        stamp = time.time()
+      else:
+        delay = nextTime - time.time()
+        if (delay > 0):
+          time.sleep(delay)
+        stamp = time.time()
+        nextTime = max(nextTime + period, stamp)
+      result = self.i2c.readList(self.__ADS1015_REG_POINTER_CONVERT, 2)
+      index = self.streamCount % self.streamSize
+      self.streamTimes[index] = stamp
+      self.streamValues[index] = self.toMillivolts(result, self.pga)
+      self.streamCount += 1 # Published last so readers never see a half written sample
+
+  def stopStream(self):
+    "Stops the streaming thread and the ADC's continuous conversions"
+    self.streamRun = False
+    if (self.streamThread != None):
+      self.streamThread.join()
+      self.streamThread = None
+    if (self.streamPin != None):
+      self.streamPin.set_edge("none")
+      self.streamPin = None
+      # Default thresholds, page 18 datasheet
+      self.i2c.writeList(self.__ADS1015_REG_POINTER_LOWTHRESH, [0x80, 0x00])
+      self.i2c.writeList(self.__ADS1015_REG_POINTER_HITHRESH, [0x7F, 0xFF])
+    return self.stopContinuousConversion()
+
+  def readStream(self, since=0):
+    "Returns (count, samples) where samples is the list of (time, mV) written \
+    after the sample count 'since' and count is the value to pass next time. \
+    Samples already overwritten in the ring buffer are skipped."
+    count = self.streamCount
+    first = max(since, count - self.streamSize)
+    samples = []
+    for n in range(first, count):
+      index = n % self.streamSize
+      samples.append((self.streamTimes[index], self.streamValues[index]))
+    return count, samples
+
+  def streamSamples(self, idle=0.001):
+    "Generator yielding every streamed (time, mV) sample as it arrives"
+    count = self.streamCount
+    while (self.streamThread != None):
+      count, samples = self.readStream(count)
+      for sample in samples:
+        yield sample
+      if (not samples):
+        time.sleep(idle)
+
+  def buildConfig(self, channel=0, pga=6144, sps=250, continuous=False):
+    "Returns the config register word (with the start bit set) for a \
+    single-ended channel (0-3) or a differential (chP, chN) tuple, or -1 \
+    for an invalid channel. Build it once and reuse it with writeConfig()."
+    mux = self.muxADS1x15.get(channel)
+    if (mux == None):
+      return -1
+    config = self.__ADS1015_REG_CONFIG_CQUE_NONE    | \
+             self.__ADS1015_REG_CONFIG_CLAT_NONLAT  | \
+             self.__ADS1015_REG_CONFIG_CPOL_ACTVLOW | \
+             self.__ADS1015_REG_CONFIG_CMODE_TRAD   | \
+             self.__ADS1015_REG_CONFIG_OS_SINGLE    | \
+             mux
+    if (continuous):
+      config |= self.__ADS1015_REG_CONFIG_MODE_CONTIN
+    else:
+      config |= self.__ADS1015_REG_CONFIG_MODE_SINGLE
+    if (self.ic == self.__IC_ADS1015):
+      config |= self.spsADS1015.get(sps, self.__ADS1015_REG_CONFIG_DR_1600SPS)
+    else:
+      config |= self.spsADS1115.get(sps, self.__ADS1115_REG_CONFIG_DR_250SPS)
+    config |= self.pgaADS1x15.get(pga, self.__ADS1015_REG_CONFIG_PGA_6_144V)
+    return config
+
+  def configSps(self, config):
+    "Returns the samples per second programmed in a config word built by \
+    buildConfig(), after its fallback for an invalid sps"
+    table = self.spsADS1015 if (self.ic == self.__IC_ADS1015) else self.spsADS1115
+    for sps, bits in table.items():
+      if (bits == (config & self.__ADS1015_REG_CONFIG_DR_MASK)):
+        return sps
+
+  def writeConfig(self, config):
+    "Writes a config word built by buildConfig() and remembers it as lastConfig"
+    self.i2c.writeList(self.__ADS1015_REG_POINTER_CONFIG, [(config >> 8) & 0xFF, config & 0xFF])
+    self.lastConfig = config
+
+  def conversionReady(self):
+    "Reads the OS bit of the config register. True when no conversion is in progress"
+    result = self.i2c.readList(self.__ADS1015_REG_POINTER_CONFIG, 2)
+    return (result[0] & 0x80) != 0
+
+  def readConversion(self):
+    "Returns the raw two bytes of the conversion register"
+    return self.i2c.readList(self.__ADS1015_REG_POINTER_CONVERT, 2)
+
+  def toMillivolts(self, result, pga):
+    "Converts the raw conversion register bytes to mV for the given pga"
+    # The register is two's complement, 0x8000 is -32768 (not -32767)
+    val = ((result[0] & 0xFF) << 8) | (result[1] & 0xFF)
+    if val > 0x7FFF:
+      val -= 0x10000
+    if (self.ic == self.__IC_ADS1015):
+      # The 12-bit ADS1015 result is left aligned, shift right 4 bits keeping the sign and convert to mV
+      return (val >> 4)*pga/2048.0
+    # Return a mV value for the ADS1115
+    return val*pga/32768.0
+
+
   def startSingleEndedComparator(self, channel, thresholdHigh, thresholdLow, \
                                  pga=6144, sps=250, \
                                  activeLow=True, traditionalMode=True, latching=False, \
@@ -719,3 +928,88 @@ class ADS1x15:
     # we can read the converted values using getLastConversionResult
     bytes = [(config >> 8) & 0xFF, config & 0xFF]
     self.i2c.writeList(self.__ADS1015_REG_POINTER_CONFIG, bytes)
+
+
+# ===========================================================================
+# ADS1x15Scanner Class
+#
+# Round-robins single-shot conversions over a list of channel specs. Config
+# words are built once, and every conversion is finished by polling the OS
+# bit instead of sleeping 1/sps. When the scan has a single spec the ADC is
+# put in continuous mode and the cached config is never rewritten, so every
+# value costs one I2C read. Latest values and their time.time() stamps land
+# in the per-spec arrays "values" and "times", and "counts" tallies them.
+#
+#   scanner = ADS1x15Scanner(adc, [{'channel':0, 'pga':4096, 'sps':860},
+#                                  {'channel':(2, 3), 'pga':512, 'sps':860}])
+#   scanner.scan()          # Blocking pass over every spec
+#   scanner.step()          # Non-blocking, call from the control loop
+# ===========================================================================
+
+class ADS1x15Scanner:
+
+  def __init__(self, adc, specs, timeout=0.05):
+    import array
+    self.adc = adc
+    self.specs = specs
+    self.timeout = timeout # s, give up on a conversion whose OS bit never sets
+    self.continuous = (len(specs) == 1)
+    self.configs = []
+    self.pgas = []
+    for spec in specs:
+      config = adc.buildConfig(spec.get('channel', 0), spec.get('pga', 6144), spec.get('sps', 250), self.continuous)
+      if (config == -1):
+        raise ValueError("ADS1x15Scanner: Invalid channel specified: %s" % (spec.get('channel'),))
+      self.configs.append(config)
+      self.pgas.append(spec.get('pga', 6144) if spec.get('pga', 6144) in adc.pgaADS1x15 else 6144)
+    self.values = array.array('d', [0.0]) * len(specs)
+    self.times = array.array('d', [0.0]) * len(specs)
+    self.counts = array.array('L', [0]) * len(specs)
+    self.index = 0 # Spec of the conversion in progress
+    self.started = 0.0 # time.time() the conversion in progress was started, 0 when idle
+    self.period = 1.0/adc.configSps(self.configs[0]) # Continuous mode sample period, at the rate the device was actually given
+    self.timeouts = 0
+
+  def __start(self):
+    config = self.configs[self.index]
+    if ((not self.continuous) or (self.adc.lastConfig != config)):
+      self.adc.writeConfig(config)
+    self.started = time.time()
+
+  def __finish(self):
+    i = self.index
+    self.values[i] = self.adc.toMillivolts(self.adc.readConversion(), self.pgas[i])
+    self.times[i] = time.time()
+    self.counts[i] += 1
+    self.index = (i + 1) % len(self.configs)
+    return i
+
+  def step(self):
+    "Advances the scan without blocking. Returns the index of the spec that \
+    received a new value, or -1 when the conversion is still in progress."
+    if (self.started == 0.0):
+      self.__start()
+      return -1
+    if (self.continuous):
+      # There is no OS bit in continuous mode, a new value is ready every 1/sps
+      now = time.time()
+      if (now - self.started < self.period):
+        return -1
+      self.started = now
+      return self.__finish()
+    if (not self.adc.conversionReady()):
+      if (time.time() - self.started > self.timeout):
+        self.timeouts += 1
+        self.started = 0.0 # Restart the conversion next step
+      return -1
+    i = self.__finish()
+    self.__start() # The next spec converts while the caller uses this value
+    return i
+
+  def scan(self):
+    "Blocks until every spec has a new value"
+    n = 0
+    while (n < len(self.configs)):
+      if (self.step() != -1):
+        n += 1
+    return self.values
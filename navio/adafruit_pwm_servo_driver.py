@@ -32,11 +32,13 @@ class PWM :
   __INVRT              = 0x10
   __OUTDRV             = 0x04
 
-  general_call_i2c = Adafruit_I2C(0x00)
+  general_call_i2c = None
 
   @classmethod
   def softwareReset(cls):
     "Sends a software reset (SWRST) command to all the servo drivers on the bus"
+    if cls.general_call_i2c is None:
+      cls.general_call_i2c = Adafruit_I2C(0x00) # Opened on first use so importing doesn't need the bus
     cls.general_call_i2c.writeRaw8(0x06)        # SWRST
 
   def __init__(self, address=0x40, debug=False):
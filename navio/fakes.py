@@ -0,0 +1,503 @@
+"""
+In-memory register models of the Navio+ devices, used by the fake backend of navio.hal.
+
+Each fake answers the same bus transactions as the real chip, closely enough for the drivers in
+this repository: MPU9250 (with the AK8963 behind its I2C master) and NEO-M8N on SPI, PCA9685,
+MS5611 and ADS1x15 on I2C, and sysfs style GPIO pins. Sensor values are set in physical units
+on the fakes and encoded into registers when a driver reads them, and actuator registers written
+by the drivers can be decoded back (see FakePCA9685.pulse_width).
+
+    import navio.hal
+    navio.hal.use("fake")
+    board = navio.fakes.board()
+    board.mpu.mag = [20.0, 5.0, -40.0]            # uT
+    board.ublox.set_position(32.8813, -117.2359)  # published once per board.clock() second
+
+The board clock defaults to time.time and can be replaced (board.clock = sim.time) to run the
+devices on a virtual clock. Functions in board.hooks are called before every bus transaction,
+which lets a simulator advance between driver calls.
+"""
+
+import collections
+import struct
+import threading
+import time
+
+# -----------------------------------------------------------------------------------------------
+#                                          BOARD
+# -----------------------------------------------------------------------------------------------
+
+class FakeBoard():
+
+    def __init__(self):
+        self.clock = time.time
+        self.hooks = []
+        self.transfers = 0
+        self.mpu = FakeMPU9250()
+        self.ublox = FakeNEOM8N(self)
+        self.pwm = FakePCA9685()
+        self.baro = FakeMS5611()
+        self.adc = FakeADS1x15()
+        self.general_call = FakeI2CDevice()
+        self.gpio = FakeGPIO()
+        self.spi_devices = {(0, 0): self.ublox, (0, 1): self.mpu}
+        self.i2c_devices = {0x00: self.general_call, 0x40: self.pwm, 0x48: self.adc, 0x77: self.baro}
+
+    def SpiDev(self):
+        return FakeSpiDev(self)
+
+    def SMBus(self, bus_number):
+        return FakeSMBus(self, bus_number)
+
+    def transfer(self):
+        """Called by the fake buses before every transaction"""
+        self.transfers += 1
+        for hook in self.hooks:
+            hook()
+
+_board = None
+
+def board():
+    """Returns the fake board shared by every fake bus, creating it on first use"""
+    global _board
+    if _board is None:
+        _board = FakeBoard()
+    return _board
+
+def reset():
+    """Replaces the shared fake board with a new one in its power-on state"""
+    global _board
+    _board = FakeBoard()
+    return _board
+
+# -----------------------------------------------------------------------------------------------
+#                                          BUSES
+# -----------------------------------------------------------------------------------------------
+
+class FakeSpiDev():
+    """spidev.SpiDev look-alike routing transfers to the fake on (bus, device)"""
+
+    def __init__(self, board):
+        self.board = board
+        self.device = None
+        self.max_speed_hz = 0
+        self.mode = 0
+
+    def open(self, bus, device):
+        self.device = self.board.spi_devices.get((bus, device))
+        if self.device is None:
+            raise IOError(2, "No such fake SPI device %d.%d" % (bus, device))
+
+    def close(self):
+        self.device = None
+
+    def xfer2(self, tx):
+        if self.device is None:
+            raise IOError(9, "Fake SPI device is not open")
+        self.board.transfer()
+        return self.device.xfer(list(tx))
+
+    xfer = xfer2
+
+class FakeSMBus():
+    """smbus.SMBus look-alike routing transactions to the fake at each address"""
+
+    def __init__(self, board, bus_number):
+        self.board = board
+        self.bus_number = bus_number
+
+    def __device(self, address):
+        self.board.transfer()
+        device = self.board.i2c_devices.get(address)
+        if device is None:
+            raise IOError(121, "Remote I/O error, no fake I2C device at 0x%02X" % address)
+        return device
+
+    def write_byte(self, address, value):
+        self.__device(address).command(value)
+
+    def read_byte(self, address):
+        return self.__device(address).read_block(None, 1)[0]
+
+    def write_byte_data(self, address, register, value):
+        self.__device(address).write_block(register, [value])
+
+    def read_byte_data(self, address, register):
+        return self.__device(address).read_block(register, 1)[0]
+
+    def write_word_data(self, address, register, value):
+        self.__device(address).write_block(register, [value & 0xFF, (value >> 8) & 0xFF])
+
+    def read_word_data(self, address, register):
+        data = self.__device(address).read_block(register, 2)
+        return data[0] | (data[1] << 8)
+
+    def write_i2c_block_data(self, address, register, values):
+        self.__device(address).write_block(register, list(values))
+
+    def read_i2c_block_data(self, address, register, length = 32):
+        return self.__device(address).read_block(register, length)
+
+    def close(self):
+        pass
+
+class FakeI2CDevice():
+    """A plain register file. Subclasses override the hooks they need"""
+
+    def __init__(self, size = 256):
+        self.regs = bytearray(size)
+
+    def command(self, value):
+        pass
+
+    def write_block(self, register, values):
+        for i, value in enumerate(values):
+            self.regs[(register + i) % len(self.regs)] = value & 0xFF
+
+    def read_block(self, register, length):
+        register = register or 0
+        return [self.regs[(register + i) % len(self.regs)] for i in range(length)]
+
+class FakeGPIO():
+    """In-memory stand-in for navio.hal.SysfsGPIO. trigger(pin) raises an edge for wait_edge()"""
+
+    def __init__(self):
+        self.pins = {}
+        self.events = {}
+
+    def export(self, pin):
+        if pin not in self.pins:
+            self.pins[pin] = {"direction": "in", "value": 0, "edge": "none"}
+            self.events[pin] = threading.Event()
+
+    def get_direction(self, pin):
+        return self.pins[pin]["direction"]
+
+    def set_direction(self, pin, direction):
+        self.pins[pin]["direction"] = direction
+        if direction == "out":
+            self.pins[pin]["value"] = 0
+
+    def write(self, pin, value):
+        self.pins[pin]["value"] = int(value)
+
+    def read(self, pin):
+        return self.pins[pin]["value"]
+
+    def set_edge(self, pin, edge):
+        self.pins[pin]["edge"] = edge
+        self.events[pin].clear()
+
+    def trigger(self, pin):
+        self.export(pin)
+        if self.pins[pin]["edge"] != "none":
+            self.events[pin].set()
+
+    def wait_edge(self, pin, timeout):
+        event = self.events[pin]
+        if event.wait(timeout):
+            event.clear()
+            return True
+        return False
+
+    def close(self, pin):
+        pass
+
+# -----------------------------------------------------------------------------------------------
+#                                     MPU9250 + AK8963 (SPI)
+# -----------------------------------------------------------------------------------------------
+
+class FakeMPU9250():
+    """
+    Register model of the MPU9250 with the AK8963 magnetometer behind its I2C master.
+    Set accel (g), gyro (dps), mag (uT) and temperature (degC). Reads are encoded at the
+    full scale selected in GYRO_CONFIG/ACCEL_CONFIG, with the user offset registers applied.
+    """
+
+    READ_FLAG = 0x80
+    WHOAMI = 0x75
+    GYRO_CONFIG = 0x1B
+    ACCEL_CONFIG = 0x1C
+    ACCEL_XOUT_H = 0x3B
+    EXT_SENS_DATA_00 = 0x49
+    I2C_SLV0_ADDR = 0x25
+    I2C_SLV0_REG = 0x26
+    I2C_SLV0_CTRL = 0x27
+    I2C_SLV0_DO = 0x63
+    XG_OFFS_USRH = 0x13
+    XA_OFFSET_H = (0x77, 0x7A, 0x7D)
+    AK8963_I2C_ADDR = 0x0C
+
+    def __init__(self):
+        self.regs = bytearray(128)
+        self.regs[self.WHOAMI] = 0x71
+        self.ak = bytearray(0x13)
+        self.ak[0x00] = 0x48 # WIA
+        self.ak[0x10:0x13] = bytearray([128, 128, 128]) # ASA, sensitivity adjustment of 1.0
+        self.accel = [0.0, 0.0, 1.0]
+        self.gyro = [0.0, 0.0, 0.0]
+        self.mag = [0.0, 0.0, 0.0]
+        self.temperature = 25.0
+
+    def xfer(self, tx):
+        register = tx[0] & 0x7F
+        if tx[0] & self.READ_FLAG:
+            self.encode()
+            return [0] + [self.regs[(register + i) & 0x7F] for i in range(len(tx) - 1)]
+        for i, value in enumerate(tx[1:]):
+            self.write(register + i, value)
+        return [0] * len(tx)
+
+    def write(self, register, value):
+        self.regs[register & 0x7F] = value & 0xFF
+        if register == self.I2C_SLV0_CTRL and (value & 0x80):
+            self.i2c_master(value & 0x0F)
+
+    def i2c_master(self, length):
+        """Runs the slave 0 transaction configured in I2C_SLV0_ADDR/REG/DO"""
+        address = self.regs[self.I2C_SLV0_ADDR]
+        if (address & 0x7F) != self.AK8963_I2C_ADDR:
+            return
+        start = self.regs[self.I2C_SLV0_REG]
+        if address & self.READ_FLAG:
+            self.encode_mag()
+            for i in range(length):
+                self.regs[self.EXT_SENS_DATA_00 + i] = self.ak[(start + i) % len(self.ak)]
+        elif start < len(self.ak) and start < 0x10:
+            self.ak[start] = self.regs[self.I2C_SLV0_DO]
+
+    def encode(self):
+        gyro_lsb = 131.0 / (1 << ((self.regs[self.GYRO_CONFIG] >> 3) & 3)) # LSB/dps
+        accel_lsb = 16384.0 / (1 << ((self.regs[self.ACCEL_CONFIG] >> 3) & 3)) # LSB/g
+        words = [0] * 7
+        for i in range(3):
+            offset = struct.unpack(">h", bytes(self.regs[self.XA_OFFSET_H[i]:self.XA_OFFSET_H[i] + 2]))[0] & ~1
+            words[i] = (self.accel[i] + offset / 2048.0) * accel_lsb
+            offset = struct.unpack(">h", bytes(self.regs[self.XG_OFFS_USRH + 2*i:self.XG_OFFS_USRH + 2*i + 2]))[0]
+            words[4 + i] = (self.gyro[i] + offset / 32.8) * gyro_lsb
+        words[3] = (self.temperature - 36.53) * 340.0
+        raw = struct.pack(">7h", *[clamp16(word) for word in words])
+        self.regs[self.ACCEL_XOUT_H:self.ACCEL_XOUT_H + 14] = bytearray(raw)
+
+    def encode_mag(self):
+        raw = struct.pack("<3h", *[clamp16(value / 0.15) for value in self.mag])
+        self.ak[0x02] = 0x01 # ST1 data ready
+        self.ak[0x03:0x09] = bytearray(raw)
+        self.ak[0x09] = 0x10 # ST2 16 bit output
+
+# -----------------------------------------------------------------------------------------------
+#                                     NEO-M8N (SPI)
+# -----------------------------------------------------------------------------------------------
+
+def ubx_frame(msg_class, msg_id, payload):
+    """Returns the bytes of a UBX frame: sync chars, class, id, length, payload and Fletcher checksum"""
+    body = bytearray([msg_class, msg_id, len(payload) & 0xFF, (len(payload) >> 8) & 0xFF]) + bytearray(payload)
+    chk_a = 0
+    chk_b = 0
+    for byte in body:
+        chk_a = (chk_a + byte) % 256
+        chk_b = (chk_b + chk_a) % 256
+    return bytearray([0xB5, 0x62]) + body + bytearray([chk_a, chk_b])
+
+def nav_posllh(itow, lat, lon, height = 0.0, hAcc = 2.0, vAcc = 3.0):
+    """NAV-POSLLH frame from degrees and meters"""
+    payload = struct.pack("<IiiiiII", int(itow) & 0xFFFFFFFF, int(round(lon * 1e7)), int(round(lat * 1e7)),
+        int(round(height * 1000)), int(round(height * 1000)), int(hAcc * 1000), int(vAcc * 1000))
+    return ubx_frame(0x01, 0x02, payload)
+
+def nav_status(itow, fix = 3):
+    """NAV-STATUS frame with gpsFix "fix" and the gpsFixOk flag set when there is a fix"""
+    flags = 0xDD if fix in (2, 3, 4) else 0x00
+    payload = struct.pack("<IBBBBII", int(itow) & 0xFFFFFFFF, fix, flags, 0, 0, 0, int(itow) & 0xFFFFFFFF)
+    return ubx_frame(0x01, 0x03, payload)
+
+class FakeNEOM8N():
+    """
+    Ublox receiver on SPI. CFG-MSG frames sent by the driver enable or disable NAV-POSLLH and
+    NAV-STATUS, which are then published once per second of board.clock(). Every transferred
+    byte clocks one byte of the transmit buffer out, or 0xFF when it is empty.
+    """
+
+    TX_BUFFER = 4096 # Bytes held before new messages are dropped
+
+    def __init__(self, board):
+        self.board = board
+        self.out = collections.deque()
+        self.parser = bytearray()
+        self.enabled = {(0x01, 0x02): True, (0x01, 0x03): False} # Port default after power on
+        self.rate = 1.0 # Hz
+        self.next_epoch = None
+        self.lat = 0.0
+        self.lon = 0.0
+        self.height = 0.0
+        self.hAcc = 2.0
+        self.fix = 3
+        self.dropped = 0
+
+    def set_position(self, lat, lon, height = 0.0, hAcc = 2.0):
+        self.lat = lat
+        self.lon = lon
+        self.height = height
+        self.hAcc = hAcc
+
+    def xfer(self, tx):
+        self.receive(tx)
+        now = self.board.clock()
+        if self.next_epoch is None:
+            self.next_epoch = now
+        while now >= self.next_epoch:
+            self.publish(int(self.next_epoch * 1000))
+            self.next_epoch += 1.0 / self.rate
+        out = self.out
+        return [out.popleft() if out else 0xFF for byte in tx]
+
+    def publish(self, itow):
+        if self.enabled.get((0x01, 0x03)):
+            self.queue(nav_status(itow, self.fix))
+        if self.enabled.get((0x01, 0x02)) and self.fix in (2, 3, 4):
+            self.queue(nav_posllh(itow, self.lat, self.lon, self.height, self.hAcc))
+
+    def queue(self, frame):
+        if len(self.out) + len(frame) > self.TX_BUFFER:
+            self.dropped += 1
+            return
+        self.out.extend(frame)
+
+    def receive(self, tx):
+        """Parses CFG-MSG frames out of the bytes sent by the driver"""
+        for byte in tx:
+            self.parser.append(byte & 0xFF)
+        while True:
+            start = self.parser.find(b"\xb5\x62")
+            if start < 0:
+                del self.parser[:-1]
+                return
+            del self.parser[:start]
+            if len(self.parser) < 6:
+                return
+            length = self.parser[4] | (self.parser[5] << 8)
+            if len(self.parser) < 8 + length:
+                return
+            frame = self.parser[:8 + length]
+            del self.parser[:8 + length]
+            if frame[2] == 0x06 and frame[3] == 0x01 and length in (3, 8):
+                payload = frame[6:6 + length]
+                rate = payload[2] if length == 3 else payload[6] # Per port rates, SPI is port 4
+                self.enabled[(payload[0], payload[1])] = rate > 0
+
+# -----------------------------------------------------------------------------------------------
+#                                     PCA9685 (I2C)
+# -----------------------------------------------------------------------------------------------
+
+class FakePCA9685(FakeI2CDevice):
+    """PWM generator. Decode what the drivers wrote with off_count, frequency and pulse_width"""
+
+    MODE1 = 0x00
+    PRESCALE = 0xFE
+    LED0_OFF_L = 0x08
+
+    def __init__(self):
+        FakeI2CDevice.__init__(self)
+        self.regs[self.MODE1] = 0x11
+        self.regs[self.PRESCALE] = 0x1E
+
+    def write_block(self, register, values):
+        FakeI2CDevice.write_block(self, register, values)
+        if register == 0xFA or register == 0xFC: # ALL_LED registers mirror into every channel
+            for ch in range(16):
+                self.regs[0x06 + 4*ch + (register - 0xFA)] = self.regs[register]
+        if register == 0xFB or register == 0xFD:
+            for ch in range(16):
+                self.regs[0x06 + 4*ch + (register - 0xFA)] = self.regs[register]
+
+    def off_count(self, channel):
+        base = self.LED0_OFF_L + 4*channel
+        return self.regs[base] | ((self.regs[base + 1] & 0x1F) << 8)
+
+    def frequency(self):
+        return 25000000.0 / (4096.0 * (self.regs[self.PRESCALE] + 1))
+
+    def pulse_width(self, channel):
+        """Seconds the channel output is high every period, 0 when the channel is off"""
+        off = self.off_count(channel)
+        if off == 0:
+            return 0.0
+        return off / (4096.0 * self.frequency())
+
+# -----------------------------------------------------------------------------------------------
+#                                     MS5611 (I2C)
+# -----------------------------------------------------------------------------------------------
+
+class FakeMS5611(FakeI2CDevice):
+    """Barometer answering with the datasheet example PROM and raw values (1000.09 mbar, 20.07 degC)"""
+
+    def __init__(self):
+        FakeI2CDevice.__init__(self)
+        self.prom = [0, 40127, 36924, 23317, 23282, 33464, 28312, 0]
+        self.D1 = 9085466
+        self.D2 = 8569150
+        self.adc = 0
+
+    def command(self, value):
+        if 0x40 <= value <= 0x48:
+            self.adc = self.D1
+        elif 0x50 <= value <= 0x58:
+            self.adc = self.D2
+        elif value == 0x1E:
+            self.adc = 0
+
+    def read_block(self, register, length):
+        if register is None or register == 0x00:
+            data = [(self.adc >> 16) & 0xFF, (self.adc >> 8) & 0xFF, self.adc & 0xFF]
+            self.adc = 0 # The ADC result reads 0 until the next conversion
+        elif 0xA0 <= register <= 0xAE:
+            word = self.prom[(register - 0xA0) >> 1]
+            data = [(word >> 8) & 0xFF, word & 0xFF]
+        else:
+            data = []
+        return (data + [0] * length)[:length]
+
+# -----------------------------------------------------------------------------------------------
+#                                     ADS1115 (I2C)
+# -----------------------------------------------------------------------------------------------
+
+class FakeADS1x15(FakeI2CDevice):
+    """16 bit ADS1115. Set the input voltages (mV) of AIN0-3; conversions complete immediately"""
+
+    PGA = {0: 6144, 1: 4096, 2: 2048, 3: 1024, 4: 512, 5: 256, 6: 256, 7: 256}
+    MUX = {0: (0, 1), 1: (0, 3), 2: (1, 3), 3: (2, 3), 4: (0, None), 5: (1, None), 6: (2, None), 7: (3, None)}
+
+    def __init__(self):
+        FakeI2CDevice.__init__(self, 4)
+        self.words = [0x0000, 0x8583, 0x8000, 0x7FFF] # Conversion, config, Lo_thresh, Hi_thresh
+        self.voltages = [0.0, 0.0, 0.0, 0.0]
+        self.rdy_pin = None # GPIO triggered after every conversion when wired to ALERT/RDY
+        self.gpio = None
+
+    def write_block(self, register, values):
+        register &= 0x03
+        self.words[register] = ((values[0] << 8) | values[1]) & 0xFFFF
+        if register == 1 and (self.words[1] & 0x8000):
+            self.convert()
+            if self.words[1] & 0x0100:
+                self.words[1] |= 0x8000 # Single-shot conversion done, OS reads 1
+        elif register == 1:
+            self.words[1] |= 0x8000
+
+    def read_block(self, register, length):
+        register = (register or 0) & 0x03
+        if register == 0 and not (self.words[1] & 0x0100):
+            self.convert() # Continuous mode, every read sees the latest input
+        word = self.words[register]
+        return ([(word >> 8) & 0xFF, word & 0xFF] + [0] * length)[:length]
+
+    def convert(self):
+        config = self.words[1]
+        positive, negative = self.MUX[(config >> 12) & 0x07]
+        millivolts = self.voltages[positive] - (self.voltages[negative] if negative is not None else 0.0)
+        self.words[0] = clamp16(millivolts * 32768.0 / self.PGA[(config >> 9) & 0x07]) & 0xFFFF
+        if self.rdy_pin is not None and self.gpio is not None and (config & 0x0003) != 0x0003:
+            self.gpio.trigger(self.rdy_pin)
+
+def clamp16(value):
+    return int(max(-32768, min(32767, round(value))))
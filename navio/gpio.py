@@ -1,39 +1,40 @@
-import os
+import navio.hal
 
 class Pin():
     """Minimal wrapper for Pins. To be deprecated soon"""
 
-    def __get_direction(self):
-        with open("/sys/class/gpio/gpio%d/direction" % self.pin, "r") as direction_file:
-            direction = direction_file.read()
-            return direction
-
-    def __set_direction(self, direction):
-        with open("/sys/class/gpio/gpio%d/direction" % self.pin, "w") as direction_file:
-            direction_file.write(direction)
-
     def __init__(self, pin):
         self.pin = pin
-        try:
-            with open("/sys/class/gpio/export", "a") as sysfs_export:
-                sysfs_export.write("%s" % pin)
-        except IOError:
-        #already exported. nothing to do
-            pass
-
-        self.direction = self.__get_direction()
+        self.backend = navio.hal.gpio()
+        self.backend.export(pin)
+        self.direction = self.backend.get_direction(pin)
 
     def write(self, value):
         if self.direction != "out":
-            self.__set_direction("out")
+            self.backend.set_direction(self.pin, "out")
+            self.direction = "out"
+
+        self.backend.write(self.pin, value)
 
-        with open("/sys/class/gpio/gpio%d/value" % self.pin, "w") as value_file:
-            value_file.write(str(value))
-            
     def read(self):
-        with open("/sys/class/gpio/gpio%d/value" % self.pin, "r") as value_file:
-            return int(value_file.read())
-            
+        return self.backend.read(self.pin)
+
+    def set_edge(self, edge):
+        """Makes the pin an input that reports "none", "rising", "falling" or "both" edges to wait_edge()"""
+        if self.direction != "in":
+            self.backend.set_direction(self.pin, "in")
+            self.direction = "in"
+        self.backend.set_edge(self.pin, edge)
+        if edge == "none":
+            self.close()
+
+    def wait_edge(self, timeout):
+        """Blocks until the configured edge or until timeout seconds pass. Returns True on an edge"""
+        return self.backend.wait_edge(self.pin, timeout)
+
+    def close(self):
+        self.backend.close(self.pin)
+
 
 if __name__ == "__main__":
     pin = Pin(27)
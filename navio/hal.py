@@ -0,0 +1,112 @@
+"""
+Hardware abstraction layer for the navio drivers.
+
+The drivers reach the Navio+ through three buses: SPI (spidev), I2C (smbus) and sysfs GPIO.
+They get those buses from here instead of importing spidev and smbus directly, so the backend
+can be swapped for the in-memory register models in navio.fakes. Under the fake backend every
+driver and navigation script runs off the Raspberry Pi, deterministically and at full speed,
+for profiling, simulation and CI benchmarks.
+
+Select the backend before instantiating drivers, either with the environment variable
+NAVIO_HAL=fake or by calling navio.hal.use("fake"). The default backend is "real".
+The fake devices are reachable through navio.fakes.board() to set or inspect their state.
+"""
+
+import os
+import select
+
+BACKENDS = ("real", "fake")
+
+backend = os.environ.get("NAVIO_HAL", "real")
+if backend not in BACKENDS:
+    raise ValueError("NAVIO_HAL must be one of %s, not %r" % (BACKENDS, backend))
+
+def use(name):
+    """Selects the "real" or "fake" backend for drivers instantiated from now on"""
+    global backend
+    if name not in BACKENDS:
+        raise ValueError("navio.hal backend must be one of %s, not %r" % (BACKENDS, name))
+    backend = name
+
+def is_fake():
+    return backend == "fake"
+
+def SpiDev():
+    """Returns an unopened SPI device with the spidev.SpiDev interface (open, xfer2, close)"""
+    if backend == "fake":
+        import navio.fakes
+        return navio.fakes.board().SpiDev()
+    import spidev
+    return spidev.SpiDev()
+
+def SMBus(bus_number):
+    """Returns an I2C bus with the smbus.SMBus interface"""
+    if backend == "fake":
+        import navio.fakes
+        return navio.fakes.board().SMBus(bus_number)
+    import smbus
+    return smbus.SMBus(bus_number)
+
+def gpio():
+    """Returns the GPIO backend used by navio.gpio.Pin"""
+    if backend == "fake":
+        import navio.fakes
+        return navio.fakes.board().gpio
+    return sysfs_gpio
+
+class SysfsGPIO():
+    """GPIO through the linux sysfs interface in /sys/class/gpio"""
+
+    def __init__(self):
+        self.value_fds = {}
+        self.pollers = {}
+
+    def export(self, pin):
+        try:
+            with open("/sys/class/gpio/export", "a") as sysfs_export:
+                sysfs_export.write("%s" % pin)
+        except IOError:
+        #already exported. nothing to do
+            pass
+
+    def get_direction(self, pin):
+        with open("/sys/class/gpio/gpio%d/direction" % pin, "r") as direction_file:
+            return direction_file.read().strip()
+
+    def set_direction(self, pin, direction):
+        with open("/sys/class/gpio/gpio%d/direction" % pin, "w") as direction_file:
+            direction_file.write(direction)
+
+    def write(self, pin, value):
+        with open("/sys/class/gpio/gpio%d/value" % pin, "w") as value_file:
+            value_file.write(str(value))
+
+    def read(self, pin):
+        with open("/sys/class/gpio/gpio%d/value" % pin, "r") as value_file:
+            return int(value_file.read())
+
+    def set_edge(self, pin, edge):
+        with open("/sys/class/gpio/gpio%d/edge" % pin, "w") as edge_file:
+            edge_file.write(edge)
+
+    def wait_edge(self, pin, timeout):
+        if pin not in self.value_fds:
+            fd = os.open("/sys/class/gpio/gpio%d/value" % pin, os.O_RDONLY)
+            poller = select.poll()
+            poller.register(fd, select.POLLPRI | select.POLLERR)
+            os.read(fd, 8) # Clear the state pending since export
+            self.value_fds[pin] = fd
+            self.pollers[pin] = poller
+        fd = self.value_fds[pin]
+        events = self.pollers[pin].poll(timeout * 1000.0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.read(fd, 8) # Reading the value acknowledges the edge
+        return len(events) > 0
+
+    def close(self, pin):
+        if pin in self.value_fds:
+            fd = self.value_fds.pop(pin)
+            self.pollers.pop(pin).unregister(fd)
+            os.close(fd)
+
+sysfs_gpio = SysfsGPIO()
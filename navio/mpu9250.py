@@ -26,7 +26,7 @@ ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
-import spidev
+import navio.hal
 import time
 import struct
 import array
@@ -233,7 +233,7 @@ class MPU9250:
     __Magnetometer_Sensitivity_Scale_Factor = (0.15)
 
     def __init__(self, spi_bus_number = 0, spi_dev_number = 1):
-        self.bus = spidev.SpiDev()
+        self.bus = navio.hal.SpiDev()
         self.spi_bus_number = spi_bus_number
         self.spi_dev_number = spi_dev_number
         self.gyro_divider = 0.0
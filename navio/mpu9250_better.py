@@ -26,8 +26,9 @@ ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
-import spidev
+import navio.hal
 import time
+import os
 import struct
 import array
 
@@ -233,7 +234,7 @@ class MPU9250:
     __Magnetometer_Sensitivity_Scale_Factor = (0.15)
 
     def __init__(self, spi_bus_number = 0, spi_dev_number = 1):
-        self.bus = spidev.SpiDev()
+        self.bus = navio.hal.SpiDev()
         self.spi_bus_number = spi_bus_number
         self.spi_dev_number = spi_dev_number
         self.gyro_divider = 0.0
@@ -490,6 +491,101 @@ class MPU9250:
 
         self.set_acc_scale(temp_scale)
 
+# -----------------------------------------------------------------------------------------------
+#                                 GYROSCOPE & ACCELEROMETER OFFSET CALIBRATION
+# usage: call this function at startup, after initialization, with the vehicle standing still and
+# level. It bursts "seconds" of raw samples, computes the bias of every axis and writes it into the
+# MPU9250 offset registers so the correction happens in silicon. The z axis is expected to read +1g.
+# With a cache_file the register values are saved there, and while use_cache is True a later call
+# writes the cached values without sampling (warm start). Delete the file to force a new calibration.
+# returns a dictionary with the gyro and accel offset register values and the bias statistics
+# -----------------------------------------------------------------------------------------------
+
+    def calib_offsets(self, seconds = 3.0, cache_file = None, use_cache = True):
+        if (cache_file and use_cache and os.path.exists(cache_file)):
+            offsets = self.load_offsets(cache_file)
+            self.write_offsets(offsets['gyro'], offsets['acc'])
+            return offsets
+
+        import numpy as np
+
+        # Measure with the user gyro offsets cleared, but keep the factory accel trim as the base
+        self.write_gyro_offsets([0, 0, 0])
+        acc_trim = self.read_acc_offsets()
+
+        # Burst raw accel(3), temp(1), gyro(3) words into one preallocated buffer
+        samples = max(int(seconds * 500), 1) # Default sample rate is 1kHz/(1 + sample_rate_div) = 500Hz
+        raw = bytearray(samples * 14)
+        for i in range(0, samples):
+            raw[i*14:i*14 + 14] = bytearray(self.ReadRegs(self.__MPUREG_ACCEL_XOUT_H, 14))
+            time.sleep(0.002)
+
+        # Bias statistics for every axis at once
+        data = np.frombuffer(bytes(raw), dtype = ">i2").reshape(samples, 7).astype(np.float64)
+        mean = data.mean(axis = 0)
+        std = data.std(axis = 0)
+        gyro_dps = mean[4:7] / self.gyro_divider
+        acc_g = mean[0:3] / self.acc_divider
+        acc_g[2] -= 1.0 # Gravity is not an offset
+
+        # Gyro offset registers count 32.8 LSB/dps (the +-1000dps sensitivity) and are added to the output.
+        gyro_regs = [int(round(-g * 32.8)) for g in gyro_dps]
+        # Accel offset registers count 0.98mg (2048 LSB/g) in bits 15:1, bit 0 is the factory temperature compensation flag.
+        acc_regs = []
+        for i in range(0, 3):
+            value = (acc_trim[i] & ~1) - (int(round(acc_g[i] * 2048)) & ~1)
+            acc_regs.append(value | (acc_trim[i] & 1))
+
+        self.write_offsets(gyro_regs, acc_regs)
+
+        offsets = {'gyro':gyro_regs, 'acc':acc_regs,
+            'gyroStd':(std[4:7] / self.gyro_divider).tolist(), 'accStd':(std[0:3] / self.acc_divider).tolist(),
+            'gyroBias':gyro_dps.tolist(), 'accBias':acc_g.tolist()}
+        if (cache_file):
+            self.save_offsets(cache_file, offsets)
+        return offsets
+
+# -----------------------------------------------------------------------------------------------
+
+    def write_offsets(self, gyro_regs, acc_regs):
+        self.write_gyro_offsets(gyro_regs)
+        self.write_acc_offsets(acc_regs)
+
+    def write_gyro_offsets(self, gyro_regs):
+        regs = [self.__MPUREG_XG_OFFS_USRH, self.__MPUREG_YG_OFFS_USRH, self.__MPUREG_ZG_OFFS_USRH]
+        for i in range(0, 3):
+            value = max(-32768, min(32767, gyro_regs[i])) & 0xFFFF
+            self.WriteReg(regs[i], (value >> 8) & 0xFF)
+            self.WriteReg(regs[i] + 1, value & 0xFF)
+
+    def write_acc_offsets(self, acc_regs):
+        regs = [self.__MPUREG_XA_OFFSET_H, self.__MPUREG_YA_OFFSET_H, self.__MPUREG_ZA_OFFSET_H]
+        for i in range(0, 3):
+            value = max(-32768, min(32767, acc_regs[i])) & 0xFFFF
+            self.WriteReg(regs[i], (value >> 8) & 0xFF)
+            self.WriteReg(regs[i] + 1, value & 0xFF)
+
+    def read_acc_offsets(self):
+        regs = [self.__MPUREG_XA_OFFSET_H, self.__MPUREG_YA_OFFSET_H, self.__MPUREG_ZA_OFFSET_H]
+        offsets = [0, 0, 0]
+        for i in range(0, 3):
+            response = self.ReadRegs(regs[i], 2)
+            offsets[i] = int(self.byte_to_float(response[0:2]))
+        return offsets
+
+# -----------------------------------------------------------------------------------------------
+# Offset cache file: one register value per line ordered gyro x,y,z then accel x,y,z
+
+    def save_offsets(self, cache_file, offsets):
+        with open(cache_file, 'w') as offsets_file:
+            for value in offsets['gyro'] + offsets['acc']:
+                offsets_file.write('%d\n' % value)
+
+    def load_offsets(self, cache_file):
+        with open(cache_file, 'r') as offsets_file:
+            values = [int(line) for line in offsets_file if line.strip()]
+        return {'gyro':values[0:3], 'acc':values[3:6]}
+
 # -----------------------------------------------------------------------------------------------
 
     def AK8963_whoami(self):
@@ -28,7 +28,7 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import time
 
-from smbus import SMBus
+import navio.hal
 
 class MS5611:
 
@@ -60,8 +60,22 @@ class MS5611:
 	__MS5611_RA_D2_OSR_2048   = 0x56
 	__MS5611_RA_D2_OSR_4096   = 0x58
 
+	# Conversion commands and maximum conversion times (s) for every oversampling ratio, datasheet page 3
+	__MS5611_OSR = {
+		256:  (__MS5611_RA_D1_OSR_256,  __MS5611_RA_D2_OSR_256,  0.00060),
+		512:  (__MS5611_RA_D1_OSR_512,  __MS5611_RA_D2_OSR_512,  0.00117),
+		1024: (__MS5611_RA_D1_OSR_1024, __MS5611_RA_D2_OSR_1024, 0.00228),
+		2048: (__MS5611_RA_D1_OSR_2048, __MS5611_RA_D2_OSR_2048, 0.00454),
+		4096: (__MS5611_RA_D1_OSR_4096, __MS5611_RA_D2_OSR_4096, 0.00904)
+	}
+
+	# Non-blocking conversion states
+	IDLE        = 0
+	CONVERT_D1  = 1 # Pressure conversion in progress
+	CONVERT_D2  = 2 # Temperature conversion in progress
+
 	def __init__(self, I2C_bus_number = 1, address = 0x77):
-		self.bus = SMBus(I2C_bus_number)
+		self.bus = navio.hal.SMBus(I2C_bus_number)
 		self.address = address
 		self.C1 = 0
 		self.C2 = 0
@@ -74,6 +88,17 @@ class MS5611:
 		self.TEMP = 0.0 # Calculated temperature
 		self.PRES = 0.0 # Calculated Pressure
 
+		# Non-blocking driver mode, see start_conversion() and poll()
+		self.setOSR(4096)
+		self.state = self.IDLE
+		self.ready_time = 0.0 # time.time() when the conversion in progress is done
+		self.pressure_count = 0 # Pressure conversions since the last temperature conversion
+		self.have_temperature = False
+		self.samples = 0 # Compensated pressure/temperature pairs since initialize()
+		self.sample_time = 0.0 # time.time() of the latest compensated sample
+		self.sampler = None
+		self.sampler_run = False
+
 	def initialize(self):
 		## The MS6511 Sensor stores 6 values in the EPROM memory that we need in order to calculate the actual temperature and pressure
 		## These values are calculated/stored at the factory when the sensor is calibrated.
@@ -90,16 +115,23 @@ class MS5611:
 		#time.sleep(0.05)
 		C6 = self.bus.read_i2c_block_data(self.address, self.__MS5611_RA_C6) #Temperature coefficient of the temperature
 
-		## Again here we are converting the 2 8bit packages into a single decimal
-		self.C1 = C1[0] * 256.0 + C1[1]
-		self.C2 = C2[0] * 256.0 + C2[1]
-		self.C3 = C3[0] * 256.0 + C3[1]
-		self.C4 = C4[0] * 256.0 + C4[1]
-		self.C5 = C5[0] * 256.0 + C5[1]
-		self.C6 = C6[0] * 256.0 + C6[1]
+		## Again here we are converting the 2 8bit packages into a single integer
+		self.C1 = (C1[0] << 8) | C1[1]
+		self.C2 = (C2[0] << 8) | C2[1]
+		self.C3 = (C3[0] << 8) | C3[1]
+		self.C4 = (C4[0] << 8) | C4[1]
+		self.C5 = (C5[0] << 8) | C5[1]
+		self.C6 = (C6[0] << 8) | C6[1]
+		self.precompute()
 
 		self.update()
 
+	def precompute(self):
+		## The PROM-derived terms of the first order compensation never change, so scale them once here
+		self.TREF = self.C5 << 8  # Reference temperature, C5 * 2^8
+		self.OFF_T1 = self.C2 << 16 # Pressure offset at reference temperature, C2 * 2^16
+		self.SENS_T1 = self.C1 << 15 # Pressure sensitivity at reference temperature, C1 * 2^15
+
 	def refreshPressure(self, OSR = __MS5611_RA_D1_OSR_4096):
 		self.bus.write_byte(self.address, OSR)
 
@@ -108,39 +140,63 @@ class MS5611:
 
 	def readPressure(self):
 		D1 = self.bus.read_i2c_block_data(self.address, self.__MS5611_RA_ADC)
-		self.D1 = D1[0] * 65536 + D1[1] * 256.0 + D1[2]
+		self.D1 = (D1[0] << 16) | (D1[1] << 8) | D1[2]
 
 	def readTemperature(self):
 		D2 = self.bus.read_i2c_block_data(self.address, self.__MS5611_RA_ADC)
-		self.D2 = D2[0] * 65536 + D2[1] * 256.0 + D2[2]
+		self.D2 = (D2[0] << 16) | (D2[1] << 8) | D2[2]
 
 	def calculatePressureAndTemperature(self):
-		dT = self.D2 - self.C5 * 2**8
-		self.TEMP = 2000 + dT * self.C6 / 2**23
-
-		OFF = self.C2 * 2**16 + (self.C4 * dT) / 2**7
-		SENS = self.C1 * 2**15 + (self.C3 * dT) / 2**8
-
-		if (self.TEMP >= 2000):
-			T2 = 0
-			OFF2 = 0
-			SENS2 = 0
-		elif (self.TEMP < 2000):
-			T2 = dT * dT / 2**31
-			OFF2 = 5 * ((self.TEMP - 2000) ** 2) / 2
-			SENS2 = OFF2 / 2
-		elif (self.TEMP < -1500):
-			OFF2 = OFF2 + 7 * ((self.TEMP + 1500) ** 2)
-			SENS2 = SENS2 + 11 * (self.TEMP + 1500) ** 2 / 2
-
-		self.TEMP = self.TEMP - T2
-		OFF = OFF - OFF2
-		SENS = SENS - SENS2
+		## Integer pipeline from the datasheet (page 7 and 8). Divisions by 2^N are right shifts.
+		dT = self.D2 - self.TREF
+		TEMP = 2000 + ((dT * self.C6) >> 23)
+
+		OFF = self.OFF_T1 + ((self.C4 * dT) >> 7)
+		SENS = self.SENS_T1 + ((self.C3 * dT) >> 8)
+
+		## Second order temperature compensation
+		if (TEMP < 2000):
+			T2 = (dT * dT) >> 31
+			TLOW = (TEMP - 2000) * (TEMP - 2000)
+			OFF2 = (5 * TLOW) >> 1
+			SENS2 = (5 * TLOW) >> 2
+			if (TEMP < -1500):
+				TVLOW = (TEMP + 1500) * (TEMP + 1500)
+				OFF2 = OFF2 + 7 * TVLOW
+				SENS2 = SENS2 + ((11 * TVLOW) >> 1)
+			TEMP = TEMP - T2
+			OFF = OFF - OFF2
+			SENS = SENS - SENS2
+
+		P = (((self.D1 * SENS) >> 21) - OFF) >> 15
+
+		self.TEMP = TEMP / 100.0 # Temperature updated
+		self.PRES = P / 100.0 # Pressure updated
+
+	def calculateBatch(self, D1, D2):
+		"Converts arrays of logged raw D1/D2 readings to (pressure mbar, temperature degC) arrays with the same integer pipeline"
+		import numpy as np
 
-		self.PRES = (self.D1 * SENS / 2**21 - OFF) / 2**15
+		D1 = np.asarray(D1, dtype = np.int64)
+		D2 = np.asarray(D2, dtype = np.int64)
+		dT = D2 - self.TREF
+		TEMP = 2000 + ((dT * self.C6) >> 23)
+		OFF = self.OFF_T1 + ((self.C4 * dT) >> 7)
+		SENS = self.SENS_T1 + ((self.C3 * dT) >> 8)
 
-		self.TEMP = self.TEMP / 100 # Temperature updated
-		self.PRES = self.PRES / 100 # Pressure updated
+		low = TEMP < 2000
+		verylow = TEMP < -1500
+		TLOW = (TEMP - 2000) * (TEMP - 2000)
+		TVLOW = (TEMP + 1500) * (TEMP + 1500)
+		T2 = np.where(low, (dT * dT) >> 31, 0)
+		OFF2 = np.where(low, (5 * TLOW) >> 1, 0) + np.where(verylow, 7 * TVLOW, 0)
+		SENS2 = np.where(low, (5 * TLOW) >> 2, 0) + np.where(verylow, (11 * TVLOW) >> 1, 0)
+
+		TEMP = TEMP - T2
+		OFF = OFF - OFF2
+		SENS = SENS - SENS2
+		P = (((D1 * SENS) >> 21) - OFF) >> 15
+		return P / 100.0, TEMP / 100.0
 
 	def returnPressure(self):
 		return self.PRES
@@ -149,12 +205,88 @@ class MS5611:
 		return self.TEMP
 
 	def update(self):
-		self.refreshPressure()
-		time.sleep(0.01) # Waiting for pressure data ready
+		self.refreshPressure(self.D1_command)
+		time.sleep(self.conversion_time) # Waiting for pressure data ready
 		self.readPressure()
 
-		self.refreshTemperature()
-		time.sleep(0.01) # Waiting for temperature data ready
+		self.refreshTemperature(self.D2_command)
+		time.sleep(self.conversion_time) # Waiting for temperature data ready
 		self.readTemperature()
 
 		self.calculatePressureAndTemperature()
+
+	# ---- Non-Blocking Driver Mode ----
+	# The sensor converts one value at a time and a conversion takes up to 9ms (OSR 4096).
+	# Instead of sleeping, start_conversion() sends the command and poll() collects the result once
+	# the conversion time has passed, then immediately starts the next one. Temperature changes slowly,
+	# so only one in every temperature_decimation conversions is a temperature (D2) conversion.
+	# Call poll() from the control loop, or start_sampler() to poll from a background thread.
+
+	def setOSR(self, osr = 4096, temperature_decimation = 10):
+		"Selects the oversampling ratio (256, 512, 1024, 2048 or 4096) and how many pressures are converted per temperature"
+		if (osr not in self.__MS5611_OSR):
+			raise ValueError("MS5611: Invalid OSR %s" % osr)
+		self.osr = osr
+		self.D1_command, self.D2_command, self.conversion_time = self.__MS5611_OSR[osr]
+		self.temperature_decimation = max(int(temperature_decimation), 1)
+
+	def start_conversion(self, temperature = False):
+		"Starts a pressure (D1) or temperature (D2) conversion and returns without waiting for it"
+		if (temperature):
+			self.bus.write_byte(self.address, self.D2_command)
+			self.state = self.CONVERT_D2
+		else:
+			self.bus.write_byte(self.address, self.D1_command)
+			self.state = self.CONVERT_D1
+		self.ready_time = time.time() + self.conversion_time
+
+	def poll(self):
+		"Advances the conversion state machine without blocking. Returns True when a new pressure/temperature pair was calculated"
+		new_sample = False
+		if (self.state != self.IDLE):
+			if (time.time() < self.ready_time):
+				return False # Conversion still in progress
+			if (self.state == self.CONVERT_D1):
+				self.readPressure()
+				self.pressure_count += 1
+				if (self.have_temperature):
+					self.calculatePressureAndTemperature()
+					self.samples += 1
+					self.sample_time = time.time()
+					new_sample = True
+			else:
+				self.readTemperature()
+				self.pressure_count = 0
+				self.have_temperature = True
+		# Interleave: D2, then temperature_decimation x D1, then D2 again
+		self.start_conversion(temperature = (not self.have_temperature) or (self.pressure_count >= self.temperature_decimation))
+		return new_sample
+
+	def time_to_ready(self):
+		"Returns the seconds until the conversion in progress is done (0 when poll() would read it now)"
+		if (self.state == self.IDLE):
+			return 0.0
+		return max(self.ready_time - time.time(), 0.0)
+
+	def start_sampler(self):
+		"Polls the sensor from a background thread. Read returnPressure()/returnTemperature() and samples from any thread"
+		if (self.sampler != None):
+			return
+		import threading
+		self.sampler_run = True
+		self.sampler = threading.Thread(target = self.__sampler_loop)
+		self.sampler.daemon = True
+		self.sampler.start()
+
+	def stop_sampler(self):
+		self.sampler_run = False
+		if (self.sampler != None):
+			self.sampler.join()
+			self.sampler = None
+		self.state = self.IDLE
+
+	def __sampler_loop(self):
+		while (self.sampler_run):
+			self.poll()
+			time.sleep(self.time_to_ready())
+	# ---- End Non-Blocking Driver Mode ----
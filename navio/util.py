@@ -1,7 +1,56 @@
-import subprocess as sub
+"""
+Startup checks shared by the navio drivers.
+
+check_apm() exits when APM (ArduPilot) is running, since both would drive the same hardware.
+APM is recognized by its "sched-timer" thread. The thread names are read from /proc/*/task/*/comm
+once per process and remembered, so drivers can call check_apm() from their constructors at no cost.
+
+Set the environment variable NAVIO_APM=absent to skip the scan (simulation, profiling) or
+NAVIO_APM=running to pretend APM is running. The fake navio.hal backend never scans.
+"""
+
+import os
 import sys
+import navio.hal
+
+APM_THREAD = "sched-timer"
+APM_OVERRIDES = ("absent", "running")
+
+_apm_running = None # Result of the /proc scan, None until the first check
+
+def _scan_threads(name, proc="/proc"):
+    """True when any thread's name contains name"""
+    for pid in os.listdir(proc):
+        if not pid.isdigit():
+            continue
+        task = os.path.join(proc, pid, "task")
+        try:
+            tids = os.listdir(task)
+        except OSError:
+            continue # The process exited while scanning
+        for tid in tids:
+            try:
+                with open(os.path.join(task, tid, "comm"), "r") as comm:
+                    if name in comm.read():
+                        return True
+            except (IOError, OSError):
+                continue
+    return False
+
+def apm_running():
+    """True when APM is running. The /proc scan happens once per process"""
+    global _apm_running
+    if navio.hal.is_fake():
+        return False # Nothing can be running on fake hardware
+    override = os.environ.get("NAVIO_APM")
+    if override is not None:
+        if override not in APM_OVERRIDES:
+            raise ValueError("NAVIO_APM must be one of %s, not %r" % (APM_OVERRIDES, override))
+        return override == "running"
+    if _apm_running is None:
+        _apm_running = _scan_threads(APM_THREAD)
+    return _apm_running
 
 def check_apm():
-    ret = sub.call(["ps -AT | grep -c sched-timer > /dev/null"], shell = True)
-    if ret <= 0:
+    if apm_running():
         sys.exit("APM is running. Can't launch the example")
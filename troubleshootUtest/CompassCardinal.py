@@ -32,7 +32,6 @@ https://github.com/ArduPilot/ardupilot/pull/2493 #Emlid developers have fixed th
 https://github.com/ArduPilot/ardupilot/pull/2504 #Someone else did it their own way for C++
 """
 
-import spidev
 import time
 import math
 import navio.util
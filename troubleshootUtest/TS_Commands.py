@@ -0,0 +1,75 @@
+"""
+Robotritons troubleshooting checks for the command channel.
+
+Purpose: Make sure malformed or out of range commands are rejected by VehicleCommandModule without changing the session or ending the
+	vehicle process, and that valid field adjustments (like a negative declination) are accepted.
+Requirements: No hardware. The python modules json, os, sys, VehicleCommandModule and VehicleReplayModule (its stand-in esc, servo, GPS and IMU).
+Use: python troubleshootUtest/TS_Commands.py
+	Prints every check and exits with an error at the first one that fails.
+
+Updates:
+- October 19, 2026. Created the file.
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import VehicleCommandModule
+import VehicleReplayModule
+
+def check(name, condition):
+	print('%-50s %s' % (name, 'ok' if condition else 'FAILED'))
+	if not condition:
+		sys.exit('TS_Commands: %s failed' % name)
+
+def makeSession():
+	return VehicleCommandModule.vehicleSession(VehicleReplayModule.replayPWM(), VehicleReplayModule.replayPWM(),
+		VehicleReplayModule.replayGPS(), VehicleReplayModule.replayIMU(), magMeans={'x':0,'y':0})
+
+mission = {'cmd':'mission', 'waypoints':[{'lat':32.8818, 'lon':-117.2358}, {'lat':32.8821, 'lon':-117.2357, 'radius':3, 'name':'b'}]}
+
+# ---- Wrong-typed JSON commands ----
+session = makeSession()
+for text in ('{"cmd":"set","params":[1]}', '{"cmd":"set","params":"holdTime=1"}', '{"cmd":"set","params":null}',
+		'{"cmd":"set","params":{"holdTime":[1]}}', '{"cmd":"set","params":{"holdTime":{}}}',
+		'{"cmd":"mission","waypoints":[1]}', '{"cmd":"mission","waypoints":"ab"}', '{"cmd":"mission","waypoints":{"lat":1}}',
+		'{"cmd":"mission","waypoints":[{"lat":"x","lon":1}]}', '{"cmd":"mission","path":5}'):
+	ok, message = session.apply(VehicleCommandModule.parseCommand(text.encode('utf-8')))
+	check('rejected %s' % text, not ok)
+check('session unchanged', session.route == None and session.tuning == {'updateBearing':True})
+
+# ---- Ranges ----
+check('set declination=-2', session.apply(VehicleCommandModule.parseText('set declination=-2'))[0] and session.tuning['declination'] == -2.0)
+check('set declination=200 rejected', not session.apply(VehicleCommandModule.parseText('set declination=200'))[0])
+for name in ('threshold', 'steerMax', 'holdTime', 'speed', 'gpsTimeout', 'minAcc'):
+	check('set %s=-1 rejected' % name, not session.apply(VehicleCommandModule.parseText('set %s=-1' % name))[0])
+check('half a set changes nothing', not session.apply(VehicleCommandModule.parseText('set holdTime=0.2 speed=-1'))[0] and 'holdTime' not in session.tuning)
+
+# ---- A run still works after the rejected commands ----
+check('mission', session.apply(mission)[0] and len(session.route) == 2)
+check('start', session.apply({'cmd':'start'})[0] and session.state == 'running' and session.nav.declination == -2.0)
+check('stop', session.apply({'cmd':'stop'})[0] and session.state == 'idle')
+
+# ---- Through the socket, the server answers the next command after a bad one ----
+server = VehicleCommandModule.commandServer(0, '127.0.0.1')
+port = server.sock.getsockname()[1]
+client = VehicleCommandModule.socket.socket(VehicleCommandModule.socket.AF_INET, VehicleCommandModule.socket.SOCK_DGRAM)
+client.settimeout(1.0)
+answers = []
+for command in ({'cmd':'set', 'params':[1], 'id':1}, {'cmd':'status', 'id':2}):
+	client.sendto(json.dumps(command).encode('utf-8'), ('127.0.0.1', port))
+	for waiting in range(100):
+		pending = server.poll()
+		if pending:
+			break
+		VehicleCommandModule.time.sleep(0.01)
+	for pending_command in pending:
+		ok, message = session.apply(pending_command)
+		server.reply(pending_command, ok, message, session.status())
+	answers.append(json.loads(client.recv(VehicleCommandModule.maxDatagram).decode('utf-8')))
+check('bad datagram answered', answers[0]['id'] == 1 and not answers[0]['ok'])
+check('next command answered', answers[1]['id'] == 2 and answers[1]['ok'])
+client.close()
+server.close()
+print('TS_Commands: all checks passed')